@@ -1,36 +1,56 @@
-import audioop
+"""
+Telephony <-> model audio conversion built on asr.audio_dsp.
+
+The stream classes keep resampler state across chunks and reuse their
+buffers; create one per call and direction. The module-level functions are
+one-shot conveniences for whole buffers and raise on malformed input instead
+of returning empty audio.
+"""
 import numpy as np
-from scipy.signal import resample
+
+from asr.audio_dsp import PolyphaseResampler, ulaw_decode, ulaw_encode
+
+
+class UlawToPcm16k:
+    """μ-law 8kHz (carrier) -> PCM16 16kHz (Gemini), streaming."""
+
+    def __init__(self, max_chunk=1600):
+        self._resampler = PolyphaseResampler(8000, 16000, max_chunk=max_chunk)
+        self._pcm8k = np.empty(max_chunk, dtype=np.int16)
+        self._pcm16k = np.empty(self._resampler.max_output(max_chunk), dtype=np.int16)
+
+    def process(self, ulaw_bytes):
+        n = len(ulaw_bytes)
+        if n > len(self._pcm8k):
+            self._pcm8k = np.empty(n, dtype=np.int16)
+            self._pcm16k = np.empty(self._resampler.max_output(n), dtype=np.int16)
+        pcm8k = ulaw_decode(ulaw_bytes, out=self._pcm8k[:n])
+        n_out = self._resampler.process_into(pcm8k, self._pcm16k)
+        return self._pcm16k[:n_out].tobytes()
+
+
+class Pcm24kToUlaw8k:
+    """PCM16 24kHz (Gemini) -> μ-law 8kHz (carrier), streaming."""
+
+    def __init__(self, max_chunk=9600):
+        self._resampler = PolyphaseResampler(24000, 8000, max_chunk=max_chunk)
+        self._pcm8k = np.empty(self._resampler.max_output(max_chunk), dtype=np.int16)
+        self._ulaw = np.empty(len(self._pcm8k), dtype=np.uint8)
+
+    def process(self, pcm24k_bytes):
+        n_in = len(pcm24k_bytes) // 2
+        if self._resampler.max_output(n_in) > len(self._pcm8k):
+            self._pcm8k = np.empty(self._resampler.max_output(n_in), dtype=np.int16)
+            self._ulaw = np.empty(len(self._pcm8k), dtype=np.uint8)
+        n_out = self._resampler.process_into(pcm24k_bytes, self._pcm8k)
+        return ulaw_encode(self._pcm8k[:n_out], out=self._ulaw[:n_out]).tobytes()
+
 
 def ulaw8k_to_pcm16k(ulaw_bytes):
     """Convert μ-law 8kHz audio to PCM 16kHz for Gemini"""
-    try:
-        # μ-law (8kHz) to PCM (8kHz)
-        pcm_8k = audioop.ulaw2lin(ulaw_bytes, 2)
-        pcm_np = np.frombuffer(pcm_8k, dtype=np.int16)
-        # Resample to 16kHz (double the sample rate)
-        pcm_16k = resample(pcm_np, len(pcm_np) * 2)
-        # Ensure proper data type and range
-        pcm_16k = np.clip(pcm_16k, -32767, 32767).astype(np.int16)
-        return pcm_16k.tobytes()
-    except Exception as e:
-        print(f"❌ Error in ulaw8k_to_pcm16k: {e}")
-        return b""
+    return UlawToPcm16k(max_chunk=max(1, len(ulaw_bytes))).process(ulaw_bytes)
+
 
 def pcm24k_to_ulaw8k(pcm24k_bytes):
     """Convert PCM 24kHz audio from Gemini to μ-law 8kHz for Twilio"""
-    try:
-        # PCM 24kHz to numpy array
-        pcm24k_np = np.frombuffer(pcm24k_bytes, dtype=np.int16)
-        # Resample to 8kHz (divide by 3)
-        pcm8k_np = resample(pcm24k_np, len(pcm24k_np) // 3)
-        # Ensure proper data type and range
-        pcm8k_np = np.clip(pcm8k_np, -32767, 32767).astype(np.int16)
-        # Convert to bytes
-        pcm8k_bytes = pcm8k_np.tobytes()
-        # PCM (8kHz) to μ-law
-        ulaw_bytes = audioop.lin2ulaw(pcm8k_bytes, 2)
-        return ulaw_bytes
-    except Exception as e:
-        print(f"❌ Error in pcm24k_to_ulaw8k: {e}")
-        return b"" 
\ No newline at end of file
+    return Pcm24kToUlaw8k(max_chunk=max(1, len(pcm24k_bytes) // 2)).process(pcm24k_bytes)
@@ -0,0 +1,251 @@
+"""
+Vectorized NumPy DSP for telephony audio (16-bit mono PCM, G.711).
+
+Everything here is table- or filter-driven and works on caller-provided,
+preallocated NumPy buffers, so the per-frame path does not allocate:
+
+    - G.711 μ-law / A-law encode and decode via precomputed lookup arrays
+    - stateful polyphase FIR resampling (zero-copy for integer ratios)
+    - gain and two-source mix with saturation
+
+Codec tables are bit-exact with the classic CCITT reference implementation
+(the one `audioop` uses).
+"""
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# --- G.711 lookup tables ---
+
+def _segment(values, seg_end):
+    return np.searchsorted(np.asarray(seg_end), values, side="left")
+
+
+def _build_ulaw_tables():
+    pcm = np.arange(-32768, 32768, dtype=np.int32)
+    val = pcm >> 2
+    mask = np.where(val < 0, 0x7F, 0xFF)
+    val = np.minimum(np.abs(val), 8159) + (0x84 >> 2)
+    seg = _segment(val, [0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+    code = np.where(seg >= 8, 0x7F, (seg << 4) | ((val >> (seg + 1)) & 0xF))
+    encode = (code ^ mask).astype(np.uint8)
+
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    t = (((u & 0x0F) << 3) + 0x84) << ((u & 0x70) >> 4)
+    decode = np.where(u & 0x80, 0x84 - t, t - 0x84).astype(np.int16)
+    return encode, decode
+
+
+def _build_alaw_tables():
+    pcm = np.arange(-32768, 32768, dtype=np.int32)
+    val = pcm >> 3
+    mask = np.where(val >= 0, 0xD5, 0x55)
+    val = np.where(val >= 0, val, -val - 1)
+    seg = _segment(val, [0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF])
+    shift = np.where(seg < 2, 1, seg)
+    code = np.where(seg >= 8, 0x7F, (seg << 4) | ((val >> shift) & 0xF))
+    encode = (code ^ mask).astype(np.uint8)
+
+    a = np.arange(256, dtype=np.int32) ^ 0x55
+    seg = (a & 0x70) >> 4
+    t = ((a & 0x0F) << 4) + np.where(seg == 0, 8, 0x108)
+    t = np.where(seg > 1, t << np.maximum(seg - 1, 0), t)
+    decode = np.where(a & 0x80, t, -t).astype(np.int16)
+    return encode, decode
+
+
+# Encode tables are indexed by the int16 sample reinterpreted as uint16.
+_ULAW_ENCODE, ULAW_DECODE = _build_ulaw_tables()
+_ALAW_ENCODE, ALAW_DECODE = _build_alaw_tables()
+ULAW_ENCODE = np.roll(_ULAW_ENCODE, -32768)
+ALAW_ENCODE = np.roll(_ALAW_ENCODE, -32768)
+del _ULAW_ENCODE, _ALAW_ENCODE
+
+
+def as_int16(data):
+    """View bytes/bytearray/memoryview (or an int16 array) as an int16 array without copying."""
+    if isinstance(data, np.ndarray):
+        return data
+    return np.frombuffer(data, dtype=np.int16)
+
+
+def as_uint8(data):
+    if isinstance(data, np.ndarray):
+        return data
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def ulaw_decode(codes, out=None):
+    """μ-law bytes -> int16 samples (written into `out` when given)."""
+    return ULAW_DECODE.take(as_uint8(codes), out=out)
+
+
+def ulaw_encode(pcm, out=None):
+    """int16 samples -> μ-law codes (uint8, written into `out` when given)."""
+    return ULAW_ENCODE.take(as_int16(pcm).view(np.uint16), out=out)
+
+
+def alaw_decode(codes, out=None):
+    return ALAW_DECODE.take(as_uint8(codes), out=out)
+
+
+def alaw_encode(pcm, out=None):
+    return ALAW_ENCODE.take(as_int16(pcm).view(np.uint16), out=out)
+
+
+# --- Gain and mixing ---
+
+# float32 scalars keep ufuncs on the float32 loop without per-call promotion
+_INT16_MIN = np.float32(-32768)
+_INT16_MAX = np.float32(32767)
+
+
+def _store_int16(samples, out):
+    """Round, saturate and store float samples into an int16 buffer in place."""
+    np.rint(samples, out=samples)
+    np.maximum(samples, _INT16_MIN, out=samples)
+    np.minimum(samples, _INT16_MAX, out=samples)
+    np.copyto(out, samples, casting="unsafe")
+    return out
+
+
+class FrameMixer:
+    """Gain and two-source mix for fixed-size frames using a reusable scratch buffer."""
+
+    def __init__(self, frame_samples):
+        self._alloc(frame_samples)
+
+    def _alloc(self, frame_samples):
+        self.frame_samples = frame_samples
+        self._scratch = np.zeros(frame_samples, dtype=np.float32)
+        self._tmp = np.zeros(frame_samples, dtype=np.float32)
+
+    def gain(self, pcm, gain, out):
+        """out = saturate(pcm * gain). `pcm` and `out` may be the same array."""
+        x = as_int16(pcm)
+        n = len(x)
+        if n > self.frame_samples:
+            self._alloc(n)
+        scratch = self._scratch[:n]
+        np.multiply(x, np.float32(gain), out=scratch)
+        return _store_int16(scratch, out[:n])
+
+    def add(self, a, b, out):
+        """out = saturate(a + b) for equal-length frames (e.g. speech + a pre-scaled bed)."""
+        a, b = as_int16(a), as_int16(b)
+        n = len(a)
+        if n > self.frame_samples:
+            self._alloc(n)
+        scratch = self._scratch[:n]
+        np.add(a, b, out=scratch)
+        return _store_int16(scratch, out[:n])
+
+    def mix(self, a, b, out, gain_a=1.0, gain_b=1.0):
+        """out = saturate(a * gain_a + b * gain_b); the shorter input is zero-padded."""
+        a, b = as_int16(a), as_int16(b)
+        n = max(len(a), len(b))
+        if n > self.frame_samples:
+            self._alloc(n)
+        scratch = self._scratch[:n]
+        tmp = self._tmp[:len(b)]
+        if len(a) < n:
+            scratch[len(a):] = 0
+        np.multiply(a, np.float32(gain_a), out=scratch[:len(a)])
+        np.multiply(b, np.float32(gain_b), out=tmp)
+        np.add(scratch[:len(b)], tmp, out=scratch[:len(b)])
+        return _store_int16(scratch, out[:n])
+
+
+# --- Polyphase resampling ---
+
+def design_lowpass(up, down, taps_per_phase=16):
+    """Hann-windowed sinc prototype at the upsampled rate, shaped (phases, taps).
+
+    Each phase row is stored reversed so a forward input window can be dotted
+    against it directly; the filter has a DC gain of 1 per phase.
+    """
+    k = taps_per_phase * max(1, -(-down // up))
+    n = k * up
+    cutoff = 0.5 / max(up, down) * 0.92
+    t = np.arange(n) - (n - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.hanning(n)
+    h *= up / h.sum()
+    return h.reshape(k, up).T[:, ::-1].astype(np.float32)
+
+
+class PolyphaseResampler:
+    """Stateful rational-ratio polyphase resampler for int16 streams.
+
+    `process_into(pcm, out)` writes resampled samples into a preallocated int16
+    array and returns how many were written. Integer up/down ratios (the
+    8k->16k and 24k->8k call paths) run entirely on preallocated buffers;
+    other ratios gather their windows per chunk. Chunks larger than
+    `max_chunk` samples grow the internal buffers once.
+    """
+
+    def __init__(self, in_rate, out_rate, taps_per_phase=16, max_chunk=4800):
+        g = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self._phases = design_lowpass(self.up, self.down, taps_per_phase)
+        self._k = self._phases.shape[1]
+        self._phases_t = np.ascontiguousarray(self._phases.T)
+        self._alloc(max_chunk)
+        self.reset()
+
+    def _alloc(self, max_chunk):
+        self.max_chunk = max_chunk
+        hist = self._buf[:self._k - 1].copy() if hasattr(self, "_buf") else None
+        self._buf = np.zeros(self._k - 1 + max_chunk, dtype=np.float32)
+        self._y = np.zeros(self.max_output(max_chunk), dtype=np.float32)
+        if hist is not None:
+            self._buf[:self._k - 1] = hist
+
+    def reset(self):
+        self._buf[:self._k - 1] = 0
+        self._n_in = 0
+        self._n_out = 0
+
+    def max_output(self, n_in):
+        """Upper bound on samples produced by a chunk of `n_in` input samples."""
+        return -(-n_in * self.up // self.down) + 1
+
+    def process(self, pcm_bytes: bytes) -> bytes:
+        x = as_int16(pcm_bytes)
+        out = np.empty(self.max_output(len(x)), dtype=np.int16)
+        return out[:self.process_into(x, out)].tobytes()
+
+    def process_into(self, pcm, out) -> int:
+        x = as_int16(pcm)
+        n = len(x)
+        if n == 0:
+            return 0
+        if n > self.max_chunk:
+            self._alloc(n)
+        k, up, down = self._k, self.up, self.down
+        buf = self._buf
+        buf[k - 1:k - 1 + n] = x
+        windows = sliding_window_view(buf[:k - 1 + n], k)
+
+        total = self._n_in + n
+        n_out = -(-total * up // down) - self._n_out
+        y = self._y[:n_out]
+        if down == 1:
+            # Every input sample yields `up` outputs, one per phase
+            np.matmul(windows, self._phases_t, out=y.reshape(n, up))
+        elif up == 1:
+            first = self._n_out * down - self._n_in
+            np.matmul(windows[first::down][:n_out], self._phases[0], out=y)
+        else:
+            t = np.arange(self._n_out, self._n_out + n_out) * down
+            np.einsum("ij,ij->i", windows[t // up - self._n_in], self._phases[t % up], out=y)
+
+        buf[:k - 1] = buf[n:n + k - 1]
+        self._n_in = total
+        self._n_out += n_out
+        _store_int16(y, out[:n_out])
+        return n_out
@@ -0,0 +1,230 @@
+"""
+Cross-stream micro-batching for Whisper inference.
+
+With many concurrent calls, each stream's decode is a small window run on
+its own, one after another. `BatchScheduler` gathers the windows that are
+pending across streams and hands them to one batched inference. It waits up
+to `max_wait_ms` after the first window arrives, or until `max_batch`
+windows are queued, then routes each result back to its caller. One
+scheduler thread runs one batch at a time. Windows that arrive while a batch
+is running are taken as soon as it finishes, so the added latency is bounded
+by `max_wait_ms` plus the batch in flight.
+
+`BatchedWhisper` gives a faster-whisper model that interface: its
+`transcribe()` blocks the calling worker thread on the scheduler. Windows
+that share a language are run through one encoder pass and one CTranslate2
+`generate` over the whole batch, following faster-whisper's
+`BatchedInferencePipeline`. A stream's first window, before its language is
+known, is transcribed on its own.
+"""
+import collections
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+
+MODEL_RATE = 16000
+MAX_WINDOW_S = 30  # Whisper's input window
+CONTEXT_TOKENS = 32  # prompt tokens of committed text passed to each batched decode
+# faster-whisper's transcribe() defaults
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+NO_SPEECH_THRESHOLD = 0.6
+LOG_PROB_THRESHOLD = -1.0
+
+
+class BatchScheduler:
+    """Collects items from any thread and runs them through `run_batch(items) -> results` in batches."""
+
+    def __init__(self, run_batch, max_batch=8, max_wait_ms=10.0, name="asr-batch", clock=time.perf_counter):
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait_ms = max_wait_ms
+        self._clock = clock
+        self._pending = collections.deque()  # (item, future, queued_at)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self.busy_s = 0.0
+        self._started = clock()
+        self._sizes = collections.Counter()
+        self._waits_ms = collections.deque(maxlen=4096)
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchScheduler is closed")
+            self._pending.append((item, future, self._clock()))
+            self._cond.notify()
+        return future
+
+    def __call__(self, item):
+        """Submit and wait: for callers already on a worker thread."""
+        return self.submit(item).result()
+
+    def _take(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            deadline = self._pending[0][2] + self.max_wait_ms / 1000
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            n = min(self.max_batch, len(self._pending))
+            return [self._pending.popleft() for _ in range(n)]
+
+    def _loop(self):
+        while (batch := self._take()) is not None:
+            started = self._clock()
+            for _, _, queued_at in batch:
+                self._waits_ms.append((started - queued_at) * 1000)
+            try:
+                results = self.run_batch([item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            self.busy_s += self._clock() - started
+            self.batches += 1
+            self.items += len(batch)
+            self._sizes[len(batch)] += 1
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+
+    def stats(self) -> dict:
+        waits = np.fromiter(self._waits_ms, dtype=np.float64) if self._waits_ms else np.zeros(1)
+        elapsed = self._clock() - self._started
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_sizes": dict(sorted(self._sizes.items())),
+            "wait_p50_ms": round(float(np.percentile(waits, 50)), 2),
+            "wait_p95_ms": round(float(np.percentile(waits, 95)), 2),
+            "items_per_s": round(self.items / elapsed, 2) if elapsed > 0 else 0.0,
+            "busy_pct": round(100 * self.busy_s / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+class BatchedWhisper:
+    """Stands in for a faster-whisper model; `transcribe` goes through a shared BatchScheduler."""
+
+    def __init__(self, model, max_batch=8, max_wait_ms=10.0):
+        self.model = model
+        self.scheduler = BatchScheduler(self._run_batch, max_batch, max_wait_ms)
+
+    def transcribe(self, audio, language=None, initial_prompt=None, beam_size=1, **kwargs):
+        if language is None:
+            return self.model.transcribe(audio, language=language, initial_prompt=initial_prompt,
+                                         beam_size=beam_size, **kwargs)
+        words = self.scheduler((audio, language, initial_prompt or "", beam_size))
+        return iter([SimpleNamespace(words=words)]), SimpleNamespace(language=language)
+
+    def _run_batch(self, items):
+        results = [None] * len(items)
+        groups = collections.defaultdict(list)
+        for i, (_, language, _, beam_size) in enumerate(items):
+            groups[(language, beam_size)].append(i)
+        for (language, beam_size), indices in groups.items():
+            words = transcribe_batch(self.model, [items[i][0] for i in indices],
+                                     [items[i][2] for i in indices], language, beam_size)
+            for i, w in zip(indices, words):
+                results[i] = w
+        return results
+
+    def close(self):
+        self.scheduler.close()
+
+
+def transcribe_batch(model, audios, prompts, language, beam_size=1):
+    """Words for each 16kHz float32 window, from batched encode + generate on a faster-whisper model."""
+    from faster_whisper.tokenizer import Tokenizer
+
+    tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language)
+    audios = [a[:MAX_WINDOW_S * MODEL_RATE] for a in audios]
+    contexts = [tokenizer.encode(" " + p.strip())[-CONTEXT_TOKENS:] if p.strip() else [] for p in prompts]
+    # CTranslate2 needs one prompt length per batch: streams with a full context run together,
+    # fresh streams (shorter context) in a second batch cut to their shortest
+    words = [None] * len(audios)
+    full = [i for i, c in enumerate(contexts) if len(c) == CONTEXT_TOKENS]
+    short = [i for i, c in enumerate(contexts) if len(c) < CONTEXT_TOKENS]
+    for indices in (full, short):
+        if not indices:
+            continue
+        keep = min(len(contexts[i]) for i in indices)
+        batch = _generate_words(model, tokenizer, [audios[i] for i in indices],
+                                [contexts[i][len(contexts[i]) - keep:] for i in indices], beam_size)
+        for i, w in zip(indices, batch):
+            words[i] = w
+    return words
+
+
+def _generate_words(model, tokenizer, audios, contexts, beam_size):
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.transcribe import Word
+
+    features = np.stack([pad_or_trim(model.feature_extractor(a)[..., :-1]) for a in audios])
+    prompts = [model.get_prompt(tokenizer, c, without_timestamps=False) for c in contexts]
+    encoder_output = model.encode(features)
+    results = model.model.generate(
+        encoder_output, prompts, beam_size=beam_size, max_length=model.max_length,
+        suppress_blank=True, suppress_tokens=[-1], return_scores=True, return_no_speech_prob=True,
+    )
+    segments, sizes = [], []
+    for audio, result in zip(audios, results):
+        duration = len(audio) / MODEL_RATE
+        size = int(np.ceil(duration) * model.frames_per_second)
+        sizes.append(size)
+        if _is_silence(result):
+            segments.append([])
+            continue
+        subsegments, _, _ = model._split_segments_by_timestamps(
+            tokenizer=tokenizer, tokens=result.sequences_ids[0], time_offset=0.0,
+            segment_size=size, segment_duration=duration, seek=0,
+        )
+        segments.append([dict(s, text=tokenizer.decode(s["tokens"])) for s in subsegments])
+    # add_word_timestamps reads segment[0] of every window, so align only the windows with text
+    keep = [i for i, stream in enumerate(segments) if stream]
+    if keep:
+        model.add_word_timestamps(
+            [segments[i] for i in keep], tokenizer, _encoder_rows(model, encoder_output, features, keep),
+            [sizes[i] for i in keep], PREPEND_PUNCTUATIONS, APPEND_PUNCTUATIONS, 0.0,
+        )
+    return [[Word(**w) for s in stream for w in s.get("words", ())] for stream in segments]
+
+
+def _encoder_rows(model, encoder_output, features, keep):
+    """The encoder output for batch rows `keep` only."""
+    if len(keep) == len(features):
+        return encoder_output
+    if encoder_output.device == "cpu":
+        import ctranslate2
+
+        return ctranslate2.StorageView.from_array(np.ascontiguousarray(np.asarray(encoder_output)[keep]))
+    # A GPU StorageView cannot be sliced in place; re-encoding the kept rows is the rare path
+    return model.encode(features[keep])
+
+
+def _is_silence(result):
+    """transcribe()'s silence filter: likely no speech and a low-confidence decode, so hallucinated words."""
+    length = len(result.sequences_ids[0])
+    avg_logprob = result.scores[0] * length / (length + 1)
+    return result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob <= LOG_PROB_THRESHOLD
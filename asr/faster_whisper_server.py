@@ -1,10 +1,16 @@
 # Entrypoint for faster-whisper-server
-# TODO: Implement SSE streaming endpoint /v1/audio/stream for 8kHz PCM audio
+# Adds POST /v1/audio/stream: chunked 8kHz PCM16/μ-law in, partial/final transcripts out as SSE (asr/streaming.py)
+# ASR_BATCH_MAX > 1 batches concurrent streams' decodes into one inference (asr/batching.py), waiting at most
+# ASR_BATCH_WAIT_MS for a batch to fill; scheduler stats are served at GET /v1/audio/stream/stats
+# Preload models are loaded in parallel (ASR_PRELOAD_WORKERS, 0 = all at once) and warmed with synthetic audio
+# at each of ASR_WARMUP_SECONDS (asr/warmup.py); GET /ready returns 503 until that is done
 
 def main():
-    # Preload model(s) before starting the server
+    # Start serving at once, preloading and warming model(s) in the background behind /ready
+    import contextlib
     import os
     import logging
+    import threading
     from faster_whisper_server.dependencies import get_config, get_model_manager
 
     logging.basicConfig(level=logging.INFO)
@@ -13,16 +19,55 @@ def main():
     config = get_config()
     model_manager = get_model_manager()
     preload_models = config.preload_models or [config.whisper.model]
-    logger.info(f"Preloading models: {preload_models}")
-    for model_name in preload_models:
-        logger.info(f"Loading model: {model_name}")
-        model_manager.load_model(model_name)
-    logger.info("All models loaded. Starting server...")
 
     import uvicorn
     from faster_whisper_server.main import create_app
+    from asr.batching import BatchedWhisper
+    from asr.streaming import create_stream_router, model_context
+    from asr.warmup import ModelWarmup
+
+    batch_max = int(os.getenv("ASR_BATCH_MAX", "1"))
+    batch_wait_ms = float(os.getenv("ASR_BATCH_WAIT_MS", "10"))
+    batched = {}
+    # Warmup threads and request handlers race here; one lock per model so different models still load in parallel
+    batched_locks = {}
+    locks_lock = threading.Lock()
+    # Model manager handles stay entered for as long as their BatchedWhisper, so a model is never unloaded under it
+    held = contextlib.ExitStack()
+
+    def load_stream_model(name):
+        if batch_max <= 1:
+            return model_manager.load_model(name)
+        with locks_lock:
+            lock = batched_locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in batched:
+                model = held.enter_context(model_context(model_manager.load_model(name)))
+                batched[name] = BatchedWhisper(model, batch_max, batch_wait_ms)
+                held.callback(batched[name].close)
+                logger.info(f"Batching stream decodes for {name}: up to {batch_max} per batch, {batch_wait_ms}ms max wait")
+        return batched[name]
+
+    def stream_stats():
+        return {name: model.scheduler.stats() for name, model in list(batched.items())}
+
+    warmup_seconds = [float(s) for s in os.getenv("ASR_WARMUP_SECONDS", "1,5,15").split(",") if s.strip()]
+    warmup = ModelWarmup(
+        load_stream_model,
+        preload_models,
+        lengths_s=warmup_seconds,
+        workers=int(os.getenv("ASR_PRELOAD_WORKERS", "0")),
+        concurrency=max(1, batch_max),
+        logger=logger,
+    )
+
     app = create_app()
-    uvicorn.run(app, host=config.host, port=config.port)
+    app.include_router(create_stream_router(load_stream_model, config.whisper.model, logger, stream_stats))
+    app.include_router(warmup.router())
+    warmup.start()
+    logger.info("Starting server; /ready returns 503 until all models are loaded and warm")
+    with held:
+        uvicorn.run(app, host=config.host, port=config.port)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,267 @@
+"""
+Incremental transcription of a live telephony stream, for the SSE endpoint.
+
+`StreamingTranscriber` takes 8kHz PCM16 or μ-law chunks as they arrive and
+upsamples them once, through one stateful resampler, into a 16kHz buffer.
+Every `step_s` of new audio it re-decodes only the uncommitted tail of that
+buffer, bounded by `window_s`. Words that two consecutive decodes agree on
+are committed. They are then dropped from the audio and passed to the next
+decode as its prompt, along with the language detected on the first decode,
+so committed audio is never decoded again.
+
+Each decode yields a `partial` event: the committed text since the last final,
+plus the current guess. When the committed text ends a sentence, or the
+window fills up, it becomes a `final` event. `finish()` flushes the rest at
+end of stream.
+"""
+import contextlib
+import json
+import time
+
+import numpy as np
+
+from asr.audio_dsp import PolyphaseResampler, as_int16, ulaw_decode
+
+ENCODINGS = ("pcm16", "ulaw")
+SAMPLE_RATES = (8000, 16000)
+MODEL_RATE = 16000
+_SENTENCE_END = (".", "?", "!", "।")
+_PROMPT_CHARS = 200
+
+
+def model_context(handle):
+    """`handle` as a context manager: model managers may return the model itself or a holder of it."""
+    return handle if hasattr(handle, "__enter__") else contextlib.nullcontext(handle)
+
+
+def check_format(encoding, sample_rate):
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+    if sample_rate not in SAMPLE_RATES or (encoding == "ulaw" and sample_rate != 8000):
+        raise ValueError(f"Unsupported sample rate {sample_rate} for {encoding}")
+
+
+def _norm(word):
+    return word.strip().strip(".,?!;:\"'").lower()
+
+
+class StreamingTranscriber:
+    """One stream's transcription state; `decode`/`finish` block and belong on a worker thread."""
+
+    def __init__(self, model, encoding="pcm16", sample_rate=8000, language=None,
+                 step_s=1.0, window_s=15.0, beam_size=1, clock=time.perf_counter):
+        check_format(encoding, sample_rate)
+        self.model = model
+        self.encoding = encoding
+        self.language = language
+        self.step_s = step_s
+        self.window_s = window_s
+        self.beam_size = beam_size
+        self._clock = clock
+        self._resampler = PolyphaseResampler(sample_rate, MODEL_RATE) if sample_rate != MODEL_RATE else None
+        self._odd = b""  # PCM16 byte split across chunks
+        self._audio = np.zeros(0, dtype=np.float32)  # uncommitted 16kHz audio
+        self._offset_s = 0.0  # stream time of _audio[0]
+        self._pending = 0  # samples received since the last decode
+        self._committed = []  # (word, start, end) since the last final
+        self._guess = []  # words the last decode proposed past the commit point
+        self._context = ""
+        self._last_partial = None
+        self.decodes = 0
+        self.decoded_s = 0.0
+        self.decode_s = 0.0
+
+    @property
+    def audio_s(self) -> float:
+        """Stream position received so far, in seconds."""
+        return self._offset_s + len(self._audio) / MODEL_RATE
+
+    def feed(self, chunk):
+        """Append one chunk of input audio."""
+        if self.encoding == "ulaw":
+            pcm = ulaw_decode(chunk)
+        else:
+            if self._odd:
+                chunk = self._odd + chunk
+            self._odd = chunk[len(chunk) & ~1:]
+            pcm = as_int16(chunk[:len(chunk) & ~1])
+        if self._resampler is not None:
+            out = np.empty(self._resampler.max_output(len(pcm)), dtype=np.int16)
+            pcm = out[:self._resampler.process_into(pcm, out)]
+        self._audio = np.concatenate((self._audio, pcm.astype(np.float32) / 32768))
+        self._pending += len(pcm)
+
+    def ready(self) -> bool:
+        """Enough new audio has arrived for another decode."""
+        return self._pending >= self.step_s * MODEL_RATE
+
+    def decode(self):
+        """Re-decode the uncommitted tail; returns the events it produced."""
+        events = []
+        words = self._transcribe()
+        agree = 0
+        while agree < min(len(words), len(self._guess)) and _norm(words[agree][0]) == _norm(self._guess[agree][0]):
+            agree += 1
+        self._commit(words[:agree])
+        self._guess = words[agree:]
+        events.append(self._partial())
+        if self._committed and self._committed[-1][0].rstrip().endswith(_SENTENCE_END):
+            events.append(self._final())
+        elif len(self._audio) >= self.window_s * MODEL_RATE:
+            # No sentence end within the window: take the current guess as final
+            self._commit(self._guess)
+            self._guess = []
+            if not self._committed:
+                self._trim(self.audio_s)
+            events.append(self._final())
+        return [e for e in events if e is not None]
+
+    def finish(self):
+        """End of stream: decode what is left and return the last events."""
+        if len(self._audio):
+            self._guess = self._transcribe()
+        self._commit(self._guess)
+        self._guess = []
+        final = self._final()
+        return [final] if final is not None else []
+
+    def _transcribe(self):
+        started = self._clock()
+        segments, info = self.model.transcribe(
+            self._audio,
+            language=self.language,
+            beam_size=self.beam_size,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=self._context or None,
+        )
+        commit_end = self._committed[-1][2] if self._committed else self._offset_s
+        words = [(w.word, self._offset_s + w.start, self._offset_s + w.end)
+                 for segment in segments for w in (segment.words or ())]
+        # A word cut by the last trim can come back; keep only what lies past the commit point
+        words = [w for w in words if w[2] > commit_end + 0.01]
+        if self.language is None and getattr(info, "language", None):
+            self.language = info.language  # skip detection on every later decode
+        self.decodes += 1
+        self.decoded_s += len(self._audio) / MODEL_RATE
+        self.decode_s += self._clock() - started
+        self._pending = 0
+        return words
+
+    def _commit(self, words):
+        if not words:
+            return
+        self._committed.extend(words)
+        self._context = (self._context + "".join(w[0] for w in words))[-_PROMPT_CHARS:]
+        self._trim(words[-1][2])
+
+    def _trim(self, until_s):
+        drop = min(len(self._audio), max(0, int((until_s - self._offset_s) * MODEL_RATE)))
+        self._audio = self._audio[drop:]
+        self._offset_s += drop / MODEL_RATE
+
+    def _event(self, kind, words):
+        return {
+            "type": kind,
+            "text": "".join(w[0] for w in words).strip(),
+            "start": round(words[0][1], 3),
+            "end": round(words[-1][2], 3),
+            "audio_s": round(self.audio_s, 3),
+        }
+
+    def _partial(self):
+        words = self._committed + self._guess
+        if not words:
+            return None
+        event = self._event("partial", words)
+        if event["text"] == self._last_partial:
+            return None
+        self._last_partial = event["text"]
+        return event
+
+    def _final(self):
+        if not self._committed:
+            return None
+        event = self._event("final", self._committed)
+        self._committed = []
+        self._last_partial = None
+        return event
+
+    def stats(self) -> dict:
+        audio_s = self.audio_s
+        return {
+            "audio_s": round(audio_s, 2),
+            "decodes": self.decodes,
+            "decoded_s": round(self.decoded_s, 2),
+            "decode_s": round(self.decode_s, 3),
+            "rtf": round(self.decode_s / audio_s, 3) if audio_s else None,
+        }
+
+
+def format_sse(event) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def create_stream_router(load_model, default_model, logger=None, stats=None):
+    """APIRouter with POST /v1/audio/stream: a chunked audio body in, SSE transcripts out.
+
+    `load_model(name)` may return the model itself or a context manager that
+    holds it for the duration of the stream. `stats()`, if given, is served
+    at GET /v1/audio/stream/stats.
+    """
+    from fastapi import APIRouter, HTTPException, Request
+    from fastapi.responses import StreamingResponse
+    from starlette.concurrency import run_in_threadpool
+    from starlette.requests import ClientDisconnect
+
+    class DuplexStreamingResponse(StreamingResponse):
+        """Streams while the request body is still being read.
+
+        StreamingResponse would otherwise also read `receive()` to watch for a
+        disconnect, and take the body chunks `request.stream()` is waiting on.
+        A disconnect still ends the stream, as ClientDisconnect from `request.stream()`.
+        """
+
+        async def __call__(self, scope, receive, send):
+            await self.stream_response(send)
+
+    router = APIRouter()
+
+    @router.post("/v1/audio/stream")
+    async def stream(request: Request, encoding: str = "pcm16", sample_rate: int = 8000,
+                     language: str | None = None, model: str | None = None, step_s: float = 1.0):
+        try:
+            check_format(encoding, sample_rate)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # A cold model takes seconds to load; keep that off the event loop
+        handle = await run_in_threadpool(load_model, model or default_model)
+
+        async def events():
+            with model_context(handle) as whisper:
+                transcriber = StreamingTranscriber(whisper, encoding, sample_rate, language, step_s=max(0.2, step_s))
+                try:
+                    async for chunk in request.stream():
+                        if not chunk:
+                            continue
+                        transcriber.feed(chunk)
+                        if transcriber.ready():
+                            for event in await run_in_threadpool(transcriber.decode):
+                                yield format_sse(event)
+                except ClientDisconnect:
+                    if logger is not None:
+                        logger.info(f"Stream client disconnected after {transcriber.audio_s:.1f}s of audio")
+                    return
+                for event in await run_in_threadpool(transcriber.finish):
+                    yield format_sse(event)
+            if logger is not None:
+                logger.info(f"Stream transcription stats: {transcriber.stats()}")
+
+        return DuplexStreamingResponse(events(), media_type="text/event-stream")
+
+    if stats is not None:
+        @router.get("/v1/audio/stream/stats")
+        async def stream_stats():
+            return stats()
+
+    return router
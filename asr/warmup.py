@@ -0,0 +1,119 @@
+"""
+Model preload, warmup and readiness for the ASR service.
+
+Loading a model leaves the first real request to pay for kernel selection,
+JIT/graph warmup and allocator growth, and the server used to accept
+traffic before any of that was done. `ModelWarmup` loads the preload
+models in parallel. It then runs synthetic transcriptions on each one at
+every length in `lengths_s`; the first pass also exercises language
+detection. With `concurrency` > 1, each length is run that many times at
+once, so batched decoding warms up at its full batch size.
+
+`ready` becomes True only when every model has loaded and warmed.
+`router()` serves GET /ready with 503 until then (and for good if a model
+fails), plus per-model load and warmup timings.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from asr.streaming import MODEL_RATE, model_context
+
+
+def synthetic_audio(seconds, seed=0):
+    """Low-level noise with a few tone bursts: enough for the decoder to run, quick to transcribe."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * MODEL_RATE)
+    audio = rng.standard_normal(n).astype(np.float32) * 0.005
+    t = np.arange(n, dtype=np.float32) / MODEL_RATE
+    audio += 0.1 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0.6)
+    return audio
+
+
+class ModelWarmup:
+    """Loads and warms `models` via `load_model(name)`; tracks readiness and timings."""
+
+    def __init__(self, load_model, models, lengths_s=(1, 5, 15), workers=0, concurrency=1,
+                 language="en", logger=None, clock=time.perf_counter):
+        self.load_model = load_model
+        self.models = list(dict.fromkeys(models))
+        self.lengths_s = list(lengths_s)
+        self.workers = workers or len(self.models) or 1
+        self.concurrency = max(1, concurrency)
+        self.language = language
+        self.logger = logger
+        self._clock = clock
+        self.ready = False
+        self.error = None
+        self.timings = {name: {} for name in self.models}
+        self.total_s = None
+        self._thread = None
+
+    def _log(self, message):
+        if self.logger is not None:
+            self.logger.info(message)
+
+    def _transcribe(self, model, audio, language):
+        segments, _ = model.transcribe(audio, language=language, beam_size=1, word_timestamps=True)
+        return list(segments)
+
+    def _warm(self, name):
+        timing = self.timings[name]
+        started = self._clock()
+        handle = self.load_model(name)
+        timing["load_s"] = round(self._clock() - started, 3)
+        self._log(f"Loaded model {name} in {timing['load_s']}s")
+        passes = {}
+        with model_context(handle) as model, ThreadPoolExecutor(self.concurrency) as pool:
+            for i, seconds in enumerate(self.lengths_s):
+                audio = synthetic_audio(seconds, seed=i)
+                language = None if i == 0 else self.language
+                t = self._clock()
+                list(pool.map(lambda _: self._transcribe(model, audio, language), range(self.concurrency)))
+                passes[f"{seconds}s"] = round(self._clock() - t, 3)
+        timing["warmup_s"] = round(sum(passes.values()), 3)
+        timing["passes"] = passes
+        self._log(f"Warmed model {name} in {timing['warmup_s']}s: {passes}")
+
+    def run(self):
+        """Load and warm every model (blocking); sets `ready` when all succeeded."""
+        started = self._clock()
+        self._log(f"Preloading models {self.models} ({self.workers} at a time), warmup at {self.lengths_s}s "
+                  f"x{self.concurrency}")
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                list(pool.map(self._warm, self.models))
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            if self.logger is not None:
+                self.logger.exception(f"Model preload/warmup failed; /ready stays 503: {e}")
+            return self.status()
+        self.total_s = round(self._clock() - started, 3)
+        self.ready = True
+        self._log(f"All models loaded and warm in {self.total_s}s: {self.timings}")
+        return self.status()
+
+    def start(self):
+        """Run in a background thread so the server can answer /ready (503) meanwhile."""
+        self._thread = threading.Thread(target=self.run, name="asr-warmup", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def status(self) -> dict:
+        return {"ready": self.ready, "error": self.error, "total_s": self.total_s, "models": self.timings}
+
+    def router(self):
+        from fastapi import APIRouter
+        from fastapi.responses import JSONResponse
+
+        router = APIRouter()
+
+        @router.get("/ready")
+        async def ready():
+            """Readiness: 503 until every preload model is loaded and warmed."""
+            status = self.status()
+            return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+        return router
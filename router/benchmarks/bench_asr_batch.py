@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Throughput against added latency of cross-stream ASR micro-batching
+(ASR_BATCH_MAX / ASR_BATCH_WAIT_MS) on CPU with a small faster-whisper model.
+
+`--streams` threads each decode a `--window-s` window of speech every
+`--step-s`, as StreamingTranscriber does for a live call, through one
+BatchedWhisper per batch setting. Reported per setting: windows decoded per
+second, mean batch size, time spent waiting for a batch to fill, and
+submit-to-result latency. `1/0` (batch of one, no wait) is the unbatched
+baseline. Needs faster-whisper installed.
+
+Usage (from router/):  python -m benchmarks.bench_asr_batch --streams 8 --settings 1/0 4/10 8/10 8/30
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT_DIR)
+
+from asr.audio_dsp import PolyphaseResampler  # noqa: E402
+from asr.batching import BatchedWhisper  # noqa: E402
+from benchmarks.bench_asr_stream import load_8k  # noqa: E402
+
+
+def speech_16k(path, seconds):
+    pcm = np.frombuffer(PolyphaseResampler(8000, 16000).process(load_8k(path)), dtype=np.int16)
+    pcm = np.tile(pcm, int(np.ceil(seconds * 16000 / len(pcm))))
+    return pcm.astype(np.float32) / 32768
+
+
+def run(model, max_batch, max_wait_ms, args, audio):
+    whisper = BatchedWhisper(model, max_batch, max_wait_ms)
+    latencies, stop = [], threading.Event()
+    rng = np.random.default_rng(0)
+    offsets = rng.integers(0, len(audio) - int(args.window_s * 16000), args.streams)
+    phases = rng.random(args.streams) * args.step_s
+
+    def stream(i):
+        window = audio[offsets[i]:offsets[i] + int(args.window_s * 16000)]
+        next_at = time.perf_counter() + phases[i]
+        while not stop.is_set():
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+            started = time.perf_counter()
+            whisper.transcribe(window, language="en", initial_prompt="Twas brillig, and the slithy toves")
+            latencies.append(time.perf_counter() - started)
+            next_at = max(next_at + args.step_s, time.perf_counter())
+
+    threads = [threading.Thread(target=stream, args=(i,), daemon=True) for i in range(args.streams)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    stats = whisper.scheduler.stats()
+    whisper.close()
+    return stats, np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wav", default=os.path.join(ROOT_DIR, "Jabberwocky Studio.wav"))
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--threads", type=int, default=0, help="CTranslate2 CPU threads (0 = library default)")
+    parser.add_argument("--streams", type=int, default=8)
+    parser.add_argument("--window-s", type=float, default=2.0)
+    parser.add_argument("--step-s", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--settings", nargs="+", default=["1/0", "4/10", "8/10", "8/30"], help="max_batch/max_wait_ms")
+    args = parser.parse_args()
+
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(args.model, device="cpu", compute_type=args.compute_type, cpu_threads=args.threads)
+    audio = speech_16k(args.wav, 30)
+    demand = args.streams / args.step_s
+    print(f"🎧 {args.streams} streams x {args.window_s}s window every {args.step_s}s = {demand:.1f} windows/s offered")
+    print(f"{'setting':>8} {'win/s':>7} {'batch':>6} {'wait p50':>9} {'wait p95':>9} {'lat p50':>8} {'lat p95':>8} {'busy %':>7}")
+    for setting in args.settings:
+        max_batch, max_wait_ms = setting.split("/")
+        stats, lat = run(model, int(max_batch), float(max_wait_ms), args, audio)
+        p50, p95 = np.percentile(lat, [50, 95]) if len(lat) else (0.0, 0.0)
+        print(f"{setting:>8} {stats['items_per_s']:>7.1f} {stats['mean_batch']:>6.2f} {stats['wait_p50_ms']:>7.1f}ms "
+              f"{stats['wait_p95_ms']:>7.1f}ms {p50:>6.0f}ms {p95:>6.0f}ms {stats['busy_pct']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
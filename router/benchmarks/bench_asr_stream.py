@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+CPU real-time factor and transcript latency of the ASR streaming endpoint's
+StreamingTranscriber with a small faster-whisper model.
+
+A WAV file, repeated `--repeat` times, is downsampled to 8kHz PCM16 and fed
+in 20ms chunks on a simulated real-time clock: chunk i arrives at i*20ms, and
+each decode occupies the (single) decoder for as long as it really took, so a
+slow decoder builds a backlog exactly as it would live. Latency is the time an
+event is emitted minus the stream time its text ends at. Needs faster-whisper
+installed.
+
+Usage (from router/):  python -m benchmarks.bench_asr_stream --model tiny --step-s 1.0
+"""
+import argparse
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT_DIR)
+
+from asr.audio_dsp import PolyphaseResampler  # noqa: E402
+from asr.streaming import StreamingTranscriber  # noqa: E402
+
+CHUNK_S = 0.02
+
+
+def load_8k(path):
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise SystemExit(f"{path}: expected 16-bit PCM")
+        pcm = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        pcm = pcm.reshape(-1, f.getnchannels())[:, 0]
+        rate = f.getframerate()
+    return PolyphaseResampler(rate, 8000).process(pcm.tobytes()) if rate != 8000 else pcm.tobytes()
+
+
+def percentiles(values):
+    if not values:
+        return "-"
+    p50, p95 = np.percentile(values, [50, 95])
+    return f"p50 {p50 * 1000:.0f}ms p95 {p95 * 1000:.0f}ms (n={len(values)})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wav", default=os.path.join(ROOT_DIR, "Jabberwocky Studio.wav"))
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--threads", type=int, default=0, help="CTranslate2 CPU threads (0 = library default)")
+    parser.add_argument("--repeat", type=int, default=10, help="play the clip this many times back to back")
+    parser.add_argument("--step-s", type=float, default=1.0)
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(args.model, device="cpu", compute_type=args.compute_type, cpu_threads=args.threads)
+    audio = load_8k(args.wav) * args.repeat
+    chunk = int(8000 * CHUNK_S) * 2
+    print(f"🎧 {len(audio) / 16000:.1f}s of 8kHz audio, model={args.model} ({args.compute_type}), step={args.step_s}s")
+
+    transcriber = StreamingTranscriber(model, "pcm16", 8000, args.language, step_s=args.step_s)
+    latency = {"partial": [], "final": []}
+    decoder_free_at = 0.0  # simulated time the decoder finishes its current work
+
+    def emit(events, at):
+        for event in events:
+            latency[event["type"]].append(at - event["end"])
+            if event["type"] == "final":
+                print(f"   [{event['start']:6.2f}-{event['end']:6.2f}s] {event['text']}")
+
+    for i in range(0, len(audio), chunk):
+        arrived = (i // chunk + 1) * CHUNK_S
+        transcriber.feed(audio[i:i + chunk])
+        if transcriber.ready() and decoder_free_at <= arrived:
+            started = time.perf_counter()
+            events = transcriber.decode()
+            decoder_free_at = arrived + time.perf_counter() - started
+            emit(events, decoder_free_at)
+    started = time.perf_counter()
+    events = transcriber.finish()
+    emit(events, max(decoder_free_at, transcriber.audio_s) + time.perf_counter() - started)
+
+    stats = transcriber.stats()
+    print(f"\nRTF {stats['rtf']} ({stats['decode_s']}s decoding for {stats['audio_s']}s of audio, "
+          f"{stats['decodes']} decodes over {stats['decoded_s']}s of window)")
+    print(f"partial latency {percentiles(latency['partial'])}")
+    print(f"final latency   {percentiles(latency['final'])}")
+
+
+if __name__ == "__main__":
+    main()
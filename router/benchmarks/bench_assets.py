@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Cost of preparing the call-start trigger clip: per-call pydub decode (old
+send_initial_trigger) versus an AudioAssetCache hit.
+
+Usage (from router/):  python -m benchmarks.bench_assets --calls 50
+"""
+import argparse
+import os
+import sys
+import time
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROUTER_DIR)
+
+from voice_router.assets import AudioAssetCache, decode_audio  # noqa: E402
+
+DEFAULT_CLIP = os.path.join(os.path.dirname(ROUTER_DIR), "Jabberwocky Studio.wav")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clip", default=DEFAULT_CLIP)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        decode_audio(args.clip, 16000)
+    per_call_decode = (time.perf_counter() - start) / args.calls * 1000
+
+    cache = AudioAssetCache()
+    cache.get(args.clip, 16000)
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        cache.get(args.clip, 16000)
+    per_call_cached = (time.perf_counter() - start) / args.calls * 1000
+
+    print(f"🎵 {os.path.basename(args.clip)} -> 16kHz mono PCM16, {args.calls} calls")
+    print(f"   decode per call:  {per_call_decode:8.3f} ms on the path to first audio")
+    print(f"   cache hit:        {per_call_cached:8.3f} ms (stat + dict lookup)")
+    print("   Live time-to-first-Gemini-audio is logged per call as '⏱️ Time to first Gemini audio'.")
+
+
+if __name__ == "__main__":
+    main()
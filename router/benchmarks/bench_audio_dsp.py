@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Per-frame cost of the asr.audio_dsp paths versus the audioop/scipy code they replace.
+
+Usage (from router/):  python -m benchmarks.bench_audio_dsp --frames 20000
+"""
+import argparse
+import audioop
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from asr import audio_dsp  # noqa: E402
+from asr.audio_convert import Pcm24kToUlaw8k, UlawToPcm16k  # noqa: E402
+
+try:
+    from scipy.signal import resample
+except ImportError:
+    resample = None
+
+rng = np.random.default_rng(0)
+ULAW_20MS = audioop.lin2ulaw((rng.standard_normal(160) * 3000).astype(np.int16).tobytes(), 2)
+PCM8K_20MS = (rng.standard_normal(160) * 3000).astype(np.int16).tobytes()
+PCM24K_20MS = (rng.standard_normal(480) * 3000).astype(np.int16).tobytes()
+
+
+def legacy_ulaw8k_to_pcm16k(ulaw_bytes):
+    pcm_np = np.frombuffer(audioop.ulaw2lin(ulaw_bytes, 2), dtype=np.int16)
+    return np.clip(resample(pcm_np, len(pcm_np) * 2), -32767, 32767).astype(np.int16).tobytes()
+
+
+def legacy_pcm24k_to_ulaw8k(pcm24k_bytes):
+    pcm_np = np.frombuffer(pcm24k_bytes, dtype=np.int16)
+    pcm8k = np.clip(resample(pcm_np, len(pcm_np) // 3), -32767, 32767).astype(np.int16)
+    return audioop.lin2ulaw(pcm8k.tobytes(), 2)
+
+
+def legacy_mix(frame1, frame2):
+    return audioop.add(audioop.mul(frame1, 2, 1.0), audioop.mul(frame2, 2, 0.0001), 2)
+
+
+def cases():
+    up, down = UlawToPcm16k(), Pcm24kToUlaw8k()
+    mixer = audio_dsp.FrameMixer(160)
+    mix_out = np.empty(160, dtype=np.int16)
+    codes = np.empty(160, dtype=np.uint8)
+    pcm = np.empty(160, dtype=np.int16)
+    yield "ulaw decode", lambda: audioop.ulaw2lin(ULAW_20MS, 2), lambda: audio_dsp.ulaw_decode(ULAW_20MS, out=pcm)
+    yield "ulaw encode", lambda: audioop.lin2ulaw(PCM8K_20MS, 2), lambda: audio_dsp.ulaw_encode(PCM8K_20MS, out=codes)
+    yield "mix speech + background", lambda: legacy_mix(PCM8K_20MS, PCM8K_20MS), \
+        lambda: mixer.mix(PCM8K_20MS, PCM8K_20MS, mix_out, 1.0, 0.0001)
+    if resample is not None:
+        yield "ulaw 8k -> pcm 16k", lambda: legacy_ulaw8k_to_pcm16k(ULAW_20MS), lambda: up.process(ULAW_20MS)
+        yield "pcm 24k -> ulaw 8k", lambda: legacy_pcm24k_to_ulaw8k(PCM24K_20MS), lambda: down.process(PCM24K_20MS)
+    else:
+        yield "ulaw 8k -> pcm 16k", None, lambda: up.process(ULAW_20MS)
+        yield "pcm 24k -> ulaw 8k", None, lambda: down.process(PCM24K_20MS)
+
+
+def per_frame_us(fn, frames):
+    fn()
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'20ms frame op':<26} {'legacy us':>10} {'audio_dsp us':>13}")
+    for label, legacy, new in cases():
+        legacy_us = f"{per_frame_us(legacy, args.frames):>10.2f}" if legacy else f"{'n/a':>10}"
+        print(f"{label:<26} {legacy_us} {per_frame_us(new, args.frames):>13.2f}")
+    if resample is None:
+        print("(scipy not installed: legacy resample paths skipped)")
+
+
+if __name__ == "__main__":
+    main()
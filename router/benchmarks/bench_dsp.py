@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Event-loop latency and call capacity of the shared playout engine per DSP
+executor mode (DSP_EXECUTOR): inline, thread and process.
+
+Each simulated call returns a `MixFrame` every tick (reply audio over the
+background bed, the expensive case) and its send encodes the mixed frame as
+an Exotel media message. `bypass` is the pipeline's path when the bed's gain
+is below BACKGROUND_MIX_MIN_GAIN: each call zero-checks its reply frame and
+returns it unmixed. A probe task measures how late the loop wakes it
+(loop lag). A call count passes while under `--max-late-pct` of ticks are
+late and loop lag p99 stays under `--max-lag-ms`; capacity is the highest
+passing count. Compare modes on the same host: absolute numbers depend on it.
+
+Usage (from router/):  python -m benchmarks.bench_dsp --seconds 5 --calls 200 500 1000 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_router.dsp_executor import MODES, DspExecutor, MixFrame  # noqa: E402
+from voice_router.exotel_codec import MediaEncoder  # noqa: E402
+from voice_router.playout import PlayoutEngine  # noqa: E402
+
+PROBE_S = 0.005
+
+
+class FakeCall:
+    def __init__(self, index, rng, bypass=False):
+        self.speech = [rng.integers(-12000, 12000, 160, dtype=np.int16).tobytes() for _ in range(4)]
+        self.bed = rng.integers(-300, 300, 160, dtype=np.int16)
+        self.encoder = MediaEncoder(f"bench-{index}")
+        self.bypass = bypass
+        self.n = 0
+
+    def next_frame(self):
+        self.n += 1
+        speech = self.speech[self.n % 4]
+        if self.bypass:
+            np.frombuffer(speech, dtype=np.int16).any()
+            return speech
+        return MixFrame(speech, self.bed)
+
+    async def send(self, frame):
+        self.encoder.encode(frame)
+        await asyncio.sleep(0)
+
+
+async def probe_lag(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t = loop.time()
+        await asyncio.sleep(PROBE_S)
+        lags.append((loop.time() - t - PROBE_S) * 1000)
+
+
+async def run(mode, workers, n_calls, seconds):
+    executor = DspExecutor("inline" if mode == "bypass" else mode, workers=workers)
+    rng = np.random.default_rng(0)
+    try:
+        await executor.start()
+        engine = PlayoutEngine(frame_ms=20, dsp=executor)
+        for i in range(n_calls):
+            call = FakeCall(i, rng, bypass=mode == "bypass")
+            engine.register(f"call-{i}", call.next_frame, call.send)
+        lags, stop = [], asyncio.Event()
+        probe = asyncio.get_running_loop().create_task(probe_lag(lags, stop))
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        await asyncio.sleep(seconds)
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        stop.set()
+        await probe
+        stats = engine.clock.stats
+        await engine.stop()
+        await asyncio.sleep(0.05)  # let the last tick's mix/deliver tasks finish
+    finally:
+        executor.close()
+    return {
+        "loop_cpu_pct": 100 * cpu / wall,
+        "lag_p50": float(np.percentile(lags, 50)),
+        "lag_p99": float(np.percentile(lags, 99)),
+        "late_pct": 100 * stats.late_frames / max(1, stats.frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--calls", type=int, nargs="+", default=[200, 500, 1000, 2000])
+    parser.add_argument("--modes", nargs="+", default=[*MODES, "bypass"], choices=[*MODES, "bypass"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-lag-ms", type=float, default=20.0)
+    parser.add_argument("--max-late-pct", type=float, default=5.0)
+    args = parser.parse_args()
+
+    capacity = {}
+    print(f"{'mode':>8} {'calls':>6} {'cpu %':>7} {'lag p50':>8} {'lag p99':>8} {'late %':>7}")
+    for mode in args.modes:
+        capacity[mode] = 0
+        for n in args.calls:
+            r = asyncio.run(run(mode, args.workers, n, args.seconds))
+            print(f"{mode:>8} {n:>6} {r['loop_cpu_pct']:>7.1f} {r['lag_p50']:>6.2f}ms {r['lag_p99']:>6.2f}ms {r['late_pct']:>7.2f}")
+            if r["late_pct"] >= args.max_late_pct or r["lag_p99"] >= args.max_lag_ms:
+                break
+            capacity[mode] = n
+    print("\ncapacity: " + ", ".join(f"{mode} {n} calls" for mode, n in capacity.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Reply smoothness versus added delay of the playout jitter buffer under
+bursty Gemini delivery, simulated on the 20ms playout clock.
+
+Each reply is `--reply-ms` of audio sent as 40ms chunks at `--rate` x real
+time, with every chunk's arrival delayed by a random stall (`--stall-pct` of
+chunks stall for up to `--stall-ms`). A gap is a background frame played in
+the middle of a reply; the old pass-through playout is JITTER_MAX_MS=0.
+
+Usage (from router/):  python -m benchmarks.bench_jitter --replies 200 --max-ms 0 40 100 200
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_router.jitter import JitterBuffer  # noqa: E402
+
+FRAME_MS = 20
+CHUNK_MS = 40
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def arrivals(rng, reply_ms, rate, stall_pct, stall_ms):
+    """Arrival times (s, relative to the reply's first chunk) of each chunk."""
+    n = reply_ms // CHUNK_MS
+    base = np.arange(n) * CHUNK_MS / rate
+    stalls = np.where(rng.random(n) < stall_pct / 100, rng.random(n) * stall_ms, 0.0)
+    # A stalled chunk holds back every chunk after it on the same stream
+    return (base + np.maximum.accumulate(stalls)) / 1000
+
+
+def simulate(max_ms, args):
+    rng = np.random.default_rng(0)
+    clock = Clock()
+    jb = JitterBuffer(initial_ms=min(40, max_ms), max_ms=max_ms, clock=clock)
+    chunk = bytes(CHUNK_MS * 16)
+    gaps = first_frame_ms = 0
+    for _ in range(args.replies):
+        start = clock.now
+        pending = list(start + arrivals(rng, args.reply_ms, args.rate, args.stall_pct, args.stall_ms))
+        first, played, total = None, 0, args.reply_ms // FRAME_MS
+        while played < total:
+            while pending and pending[0] <= clock.now:
+                jb.push(chunk, pending.pop(0))
+            if not pending:
+                jb.end_turn()
+            if jb.pop() is not None:
+                played += 1
+                first = clock.now if first is None else first
+            elif first is not None:
+                gaps += 1
+            clock.now += FRAME_MS / 1000
+        first_frame_ms += (first - start) * 1000
+        jb.pop()  # the tick after the last frame finds the turn played out
+        clock.now += 1.0  # caller's turn
+    return {"gaps": gaps, "first_frame_ms": first_frame_ms / args.replies, **jb.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replies", type=int, default=200)
+    parser.add_argument("--reply-ms", type=int, default=3000)
+    parser.add_argument("--rate", type=float, default=1.2, help="Gemini delivery speed, x real time")
+    parser.add_argument("--stall-pct", type=float, default=5.0)
+    parser.add_argument("--stall-ms", type=float, default=120.0)
+    parser.add_argument("--max-ms", type=int, nargs="+", default=[0, 40, 100, 200])
+    args = parser.parse_args()
+
+    print(f"{'max_ms':>7} {'gap frames':>11} {'underruns':>10} {'first frame':>12} {'target':>8}")
+    for max_ms in args.max_ms:
+        r = simulate(max_ms, args)
+        print(f"{max_ms:>7} {r['gaps']:>11} {r['underruns']:>10} {r['first_frame_ms']:>10.0f}ms {r['target_ms']:>6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Event-loop stall caused by logging: no logging vs synchronous handlers
+(the old basicConfig setup) vs the queue-based `setup_logging`.
+
+A 20ms ticker stands in for the playout engine and records how late each
+tick fires while other tasks log at `--rate` records/s into a sink whose
+writes take `--write-ms` (a slow disk or a stdout pipe nobody is draining).
+
+Usage (from router/):  python -m benchmarks.bench_logging --seconds 5 --rate 500 --write-ms 1
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROUTER_DIR)
+
+from voice_router.logging_setup import CallLogger, setup_logging  # noqa: E402
+
+
+class SlowStream:
+    def __init__(self, write_ms):
+        self.write_s = write_ms / 1000
+
+    def write(self, text):
+        time.sleep(self.write_s)
+
+    def flush(self):
+        pass
+
+
+async def ticker(seconds, lateness):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    end = deadline + seconds
+    while deadline < end:
+        deadline += 0.02
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
+        lateness.append((loop.time() - deadline) * 1000)
+
+
+async def chatter(log, seconds, rate):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    n = 0
+    while loop.time() < end:
+        n += 1
+        log.info("🔄 Got Gemini turn, processing responses... %d", n)
+        await asyncio.sleep(1 / rate)
+
+
+async def run(log, seconds, rate):
+    lateness = []
+    tasks = [ticker(seconds, lateness)]
+    if log is not None:
+        tasks.append(chatter(log, seconds, rate))
+    await asyncio.gather(*tasks)
+    return np.array(lateness)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=500.0, help="log records per second")
+    parser.add_argument("--write-ms", type=float, default=1.0, help="time each sink write takes")
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    results = {}
+
+    results["off"] = asyncio.run(run(None, args.seconds, args.rate))
+
+    sync_handler = logging.StreamHandler(SlowStream(args.write_ms))
+    root.addHandler(sync_handler)
+    root.setLevel(logging.INFO)
+    results["sync"] = asyncio.run(run(CallLogger(logging.getLogger("bench"), stream_sid="sync"), args.seconds, args.rate))
+    root.removeHandler(sync_handler)
+
+    runtime = setup_logging(log_dir=None, level="INFO", stream=SlowStream(args.write_ms))
+    results["queue"] = asyncio.run(run(CallLogger(logging.getLogger("bench"), stream_sid="queue"), args.seconds, args.rate))
+    runtime.stop()
+    root.removeHandler(runtime.handler)
+
+    print(f"{args.rate:.0f} records/s, {args.write_ms}ms per sink write, 20ms ticker")
+    print(f"{'logging':<8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'ticks >5ms late':>16}")
+    for name, late in results.items():
+        print(f"{name:<8} {np.percentile(late, 50):>8.2f} {np.percentile(late, 99):>8.2f} "
+              f"{late.max():>8.2f} {int((late > 5).sum()):>16}")
+    print(f"queue handler: {runtime.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Inbound Exotel messages parsed per second on one core: the old
+`receive_json` + `base64.b64decode` path versus `MediaDecoder` backends.
+
+`receive_json` is modelled as Starlette does it (`json.loads` of the text),
+on the realistic mix of one control event per `--control-every` media events.
+
+Usage (from router/):  python -m benchmarks.bench_media_decoder --messages 200000
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROUTER_DIR)
+
+from voice_router import exotel_codec  # noqa: E402
+from voice_router.exotel_codec import MediaDecoder  # noqa: E402
+
+STREAM_SID = "a1b2c3d4e5f60718293a4b5c6d7e8f90"
+
+
+def messages(control_every):
+    out = []
+    for i in range(64):
+        if control_every and i % control_every == control_every - 1:
+            out.append(json.dumps({"event": "mark", "sequence_number": str(i), "stream_sid": STREAM_SID,
+                                   "mark": {"name": f"m{i}"}}))
+            continue
+        out.append(json.dumps({
+            "event": "media", "sequence_number": str(i), "stream_sid": STREAM_SID,
+            "media": {"chunk": str(i), "timestamp": str(i * 20), "payload": base64.b64encode(os.urandom(320)).decode()},
+        }))
+    return out
+
+
+def receive_json_path(text):
+    msg = json.loads(text)
+    if msg.get("event") == "media":
+        return base64.b64decode(msg["media"]["payload"])
+    return msg
+
+
+def measure(decode, msgs, n):
+    start = time.process_time()
+    for i in range(n):
+        decode(msgs[i & 63])
+    return n / (time.process_time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--control-every", type=int, default=32)
+    args = parser.parse_args()
+
+    msgs = messages(args.control_every)
+    cases = [("receive_json (old)", receive_json_path)]
+    for backend in exotel_codec.DECODER_BACKENDS[1:]:  # "auto" is one of the others
+        try:
+            cases.append((backend, MediaDecoder(backend).decode))
+        except ValueError as e:
+            print(f"   ({e}, skipping)")
+
+    baseline = None
+    print(f"{'path':<20} {'msgs/s/core':>12} {'us/msg':>8} {'calls/core @50fps':>18}")
+    for name, decode in cases:
+        rate = measure(decode, msgs, args.messages)
+        baseline = baseline or rate
+        print(f"{name:<20} {rate:>12,.0f} {1e6 / rate:>8.2f} {rate / 50:>18,.0f}  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
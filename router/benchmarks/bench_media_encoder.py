@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Outbound Exotel media messages per second on one core: the old per-frame
+dict + `send_json` serialization versus `MediaEncoder` backends.
+
+`send_json` is modelled as Starlette does it (`json.dumps` with compact
+separators), so the numbers are the CPU spent before the websocket write.
+
+Usage (from router/):  python -m benchmarks.bench_media_encoder --frames 200000
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROUTER_DIR)
+
+from voice_router import exotel_codec  # noqa: E402
+from voice_router.exotel_codec import MediaEncoder  # noqa: E402
+
+STREAM_SID = "a1b2c3d4e5f60718293a4b5c6d7e8f90"
+
+
+def send_json_path(frame):
+    msg = {"event": "media", "stream_sid": STREAM_SID, "media": {"payload": base64.b64encode(frame).decode()}}
+    return json.dumps(msg, separators=(",", ":"), ensure_ascii=False)
+
+
+def measure(encode, frames, n):
+    start = time.process_time()
+    for i in range(n):
+        encode(frames[i & 15])
+    return n / (time.process_time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200000)
+    args = parser.parse_args()
+
+    frames = [os.urandom(320) for _ in range(16)]
+    cases = [("send_json (old)", send_json_path)]
+    for backend in exotel_codec.BACKENDS:
+        if backend == "orjson" and exotel_codec.orjson is None:
+            print("   (orjson not installed, skipping)")
+            continue
+        encoder = MediaEncoder(STREAM_SID, backend=backend)
+        cases.append((f"{backend} encode", encoder.encode))
+        if backend == "template":
+            cases.append(("template encode_bytes", encoder.encode_bytes))
+
+    baseline = None
+    print(f"{'path':<22} {'msgs/s/core':>12} {'us/msg':>8} {'calls/core @50fps':>18}")
+    for name, encode in cases:
+        rate = measure(encode, frames, args.frames)
+        baseline = baseline or rate
+        print(f"{name:<22} {rate:>12,.0f} {1e6 / rate:>8.2f} {rate / 50:>18,.0f}  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop CPU for outbound playout: one FrameClock loop per call
+(the old send_audio_to_exotel_continuous model) versus the shared PlayoutEngine.
+
+Usage (from router/):  python -m benchmarks.bench_playout --seconds 5 --calls 50 200 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_router.pacing import FrameClock  # noqa: E402
+from voice_router.playout import PlayoutEngine  # noqa: E402
+
+FRAME = b"\x00\x01" * 160  # 20ms of 8kHz PCM16
+
+
+class FakeCall:
+    """Stands in for an Exotel websocket: counts frames, yields like a real send."""
+
+    def __init__(self):
+        self.sent = 0
+
+    def next_frame(self):
+        return FRAME
+
+    async def send(self, frame):
+        self.sent += 1
+        await asyncio.sleep(0)
+
+
+async def per_call_loops(n_calls, seconds):
+    calls = [FakeCall() for _ in range(n_calls)]
+    clocks = []
+
+    async def loop(call):
+        clock = FrameClock(frame_ms=20)
+        clocks.append(clock)
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            await clock.wait()
+            await call.send(call.next_frame())
+
+    await asyncio.gather(*(loop(c) for c in calls))
+    late = sum(c.stats.late_frames for c in clocks)
+    jitter = max(c.stats.jitter_max_ms for c in clocks)
+    return sum(c.sent for c in calls), late, jitter
+
+
+async def shared_engine(n_calls, seconds):
+    calls = [FakeCall() for _ in range(n_calls)]
+    engine = PlayoutEngine(frame_ms=20)
+    sessions = [engine.register(f"call-{i}", c.next_frame, c.send) for i, c in enumerate(calls)]
+    await asyncio.sleep(seconds)
+    await engine.stop()
+    late = engine.clock.stats.late_frames
+    jitter = engine.clock.stats.jitter_max_ms
+    return sum(s.frames_sent for s in sessions), late, jitter
+
+
+def measure(mode, n_calls, seconds):
+    runner = per_call_loops if mode == "per-call" else shared_engine
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    frames, late, jitter = asyncio.run(runner(n_calls, seconds))
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    expected = n_calls * seconds * 50
+    return {
+        "cpu_pct": 100 * cpu / wall,
+        "fps_ratio": frames / expected,
+        "late": late,
+        "jitter_max_ms": jitter,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--calls", type=int, nargs="+", default=[50, 200, 500])
+    args = parser.parse_args()
+
+    print(f"{'calls':>6} {'mode':>9} {'cpu %':>7} {'delivered':>10} {'late':>6} {'jitter max ms':>14}")
+    for n in args.calls:
+        for mode in ("per-call", "shared"):
+            r = measure(mode, n, args.seconds)
+            print(f"{n:>6} {mode:>9} {r['cpu_pct']:>7.1f} {r['fps_ratio']:>10.1%} {r['late']:>6} {r['jitter_max_ms']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
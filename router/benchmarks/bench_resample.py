@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Throughput of each streaming resampler backend on call-sized chunks.
+
+Usage (from router/):  python -m benchmarks.bench_resample --seconds 60
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROUTER_DIR, os.path.dirname(ROUTER_DIR)]
+
+from voice_router.resample import BACKENDS, create_resampler  # noqa: E402
+
+# (label, in_rate, out_rate, chunk bytes)
+CASES = [
+    ("uplink 8k->16k, 20ms packets", 8000, 16000, 320),
+    ("downlink 24k->8k, 40ms chunks", 24000, 8000, 1920),
+]
+
+
+def noise(rate, seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(rate * seconds)) * 3000).astype(np.int16).tobytes()
+
+
+def run(backend, in_rate, out_rate, chunk, pcm):
+    resampler = create_resampler(in_rate, out_rate, backend)
+    start = time.perf_counter()
+    for i in range(0, len(pcm), chunk):
+        resampler.process(pcm[i:i + chunk])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio seconds per case")
+    args = parser.parse_args()
+
+    print(f"{'case':<32} {'backend':>8} {'us/chunk':>9} {'x realtime':>11}")
+    for label, in_rate, out_rate, chunk in CASES:
+        pcm = noise(in_rate, args.seconds)
+        n_chunks = -(-len(pcm) // chunk)
+        for backend in BACKENDS:
+            try:
+                elapsed = run(backend, in_rate, out_rate, chunk, pcm)
+            except ImportError:
+                print(f"{label:<32} {backend:>8} {'(not available on this Python)':>21}")
+                continue
+            print(f"{label:<32} {backend:>8} {elapsed / n_chunks * 1e6:>9.1f} {args.seconds / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Time to first Gemini audio after the call-start trigger clip, per send mode.
+
+Starts mock_gemini_server (server VAD over the audio it receives, then a
+scripted reply latency) and, per call, connects with the google-genai SDK as
+pipeline.py does. It sends the trigger clip while a caller line streams 20ms
+silence packets in real time, and measures from trigger start to the first
+reply audio. Modes:
+
+    blob         one message (TRIGGER_STREAM_CHUNK_MS=0, the default)
+    burst:<ms>   <ms> chunks sent back to back (send_asset before pacing)
+    paced:<ms>   <ms> chunks on a real-time schedule (send_asset)
+
+The mock judges end of speech from the audio it has received, not wall time,
+so it shows what faster-than-real-time delivery gains at most. Fully offline.
+
+Usage (from router/):  python -m benchmarks.bench_trigger --calls 5 --modes blob burst:40 paced:40
+"""
+import argparse
+import asyncio
+import os
+import sys
+import wave
+
+import numpy as np
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROUTER_DIR)
+sys.path.insert(0, os.path.dirname(ROUTER_DIR))
+
+from asr.audio_dsp import PolyphaseResampler  # noqa: E402
+from mock_gemini_server import MockLiveServer, MockTurn  # noqa: E402
+from voice_router.assets import AudioAssetCache, send_asset  # noqa: E402
+from voice_router.gemini import default_client_factory  # noqa: E402
+
+DEFAULT_CLIP = os.path.join(os.path.dirname(ROUTER_DIR), "Jabberwocky Studio.wav")
+
+
+def decode_wav(path, sample_rate, channels=1, sample_width=2):
+    """WAV-only stand-in for pydub, so the benchmark does not need ffmpeg."""
+    with wave.open(path, "rb") as f:
+        pcm = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).reshape(-1, f.getnchannels())[:, 0]
+        rate = f.getframerate()
+    return PolyphaseResampler(rate, sample_rate).process(pcm.tobytes()) if rate != sample_rate else pcm.tobytes()
+
+
+async def send_burst(send_chunk, asset, chunk_ms):
+    for piece in asset.chunks(chunk_ms):
+        await send_chunk(piece)
+
+
+async def one_call(port, asset, mode, chunk_ms):
+    from google.genai import types
+
+    loop = asyncio.get_running_loop()
+    client = default_client_factory(base_url=f"ws://127.0.0.1:{port}")
+    config = types.LiveConnectConfig(response_modalities=["AUDIO"])
+    async with client.aio.live.connect(model="mock", config=config) as session:
+        async def send_chunk(pcm):
+            await session.send_realtime_input(audio=types.Blob(data=pcm, mime_type=asset.mime_type))
+
+        stop = asyncio.Event()
+
+        async def caller_line():
+            next_at = loop.time()
+            while not stop.is_set():
+                await send_chunk(bytes(640))
+                next_at += 0.02
+                await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+        started = loop.time()
+        line = loop.create_task(caller_line())
+        if mode == "burst":
+            await send_burst(send_chunk, asset, chunk_ms)
+        else:
+            await send_asset(send_chunk, asset, chunk_ms)
+        sent_ms = (loop.time() - started) * 1000
+        first_ms = None
+        async for response in session.receive():
+            if response.data:
+                first_ms = (loop.time() - started) * 1000
+                break
+        stop.set()
+        await line
+    return sent_ms, first_ms
+
+
+async def run(args, asset):
+    server = MockLiveServer([MockTurn(latency_ms=args.latency_ms, audio_ms=500)], end_silence_ms=args.end_silence_ms)
+    results = {}
+    async with server.serve("127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        for spec in args.modes:
+            mode, _, chunk = spec.partition(":")
+            chunk_ms = int(chunk or 0) if mode != "blob" else 0
+            results[spec] = [await one_call(port, asset, mode, chunk_ms) for _ in range(args.calls)]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clip", default=DEFAULT_CLIP)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["blob", "burst:40", "paced:40", "paced:100"])
+    parser.add_argument("--latency-ms", type=float, default=600, help="mock reply latency after end of speech")
+    parser.add_argument("--end-silence-ms", type=float, default=500, help="mock VAD silence that ends speech")
+    args = parser.parse_args()
+    os.environ.setdefault("GOOGLE_API_KEY", "mock")
+
+    asset = AudioAssetCache(decoder=decode_wav).get(args.clip, 16000)
+    print(f"🎵 {os.path.basename(args.clip)}: {asset.duration_s:.2f}s; mock reply {args.latency_ms:.0f}ms after "
+          f"{args.end_silence_ms:.0f}ms of silence; {args.calls} calls per mode")
+    print(f"{'mode':>10} {'sent p50':>9} {'first audio p50':>16} {'min':>7} {'max':>7}")
+    for spec, calls in asyncio.run(run(args, asset)).items():
+        sent = np.array([s for s, _ in calls])
+        first = np.array([f for _, f in calls if f is not None])
+        print(f"{spec:>10} {np.median(sent):>7.0f}ms {np.median(first):>14.0f}ms {first.min():>5.0f}ms {first.max():>5.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Upstream message rate and CPU per call for each uplink frame size.
+
+Each sent frame is wrapped in a `types.Blob` (when google-genai is installed)
+and encoded the way the Live API client sends it (base64 inside a JSON
+realtimeInput message), so CPU includes the per-message overhead.
+
+Usage (from router/):  python -m benchmarks.bench_uplink --seconds 60
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROUTER_DIR, os.path.dirname(ROUTER_DIR)]
+
+from voice_router.resample import create_resampler  # noqa: E402
+from voice_router.uplink import UplinkBatcher  # noqa: E402
+
+try:
+    from google.genai import types
+except ImportError:
+    types = None
+
+SETTINGS = [(20, False), (40, False), (60, False), (100, False), (60, True), (100, True)]
+
+
+def caller_audio(seconds):
+    """8kHz PCM16 alternating 1.5s speech-like bursts and 1.5s near-silence."""
+    rng = np.random.default_rng(0)
+    n = int(seconds * 8000)
+    t = np.arange(n) / 8000
+    speech = np.sin(2 * np.pi * 220 * t) * 6000 + rng.standard_normal(n) * 800
+    gate = (t % 3.0) < 1.5
+    return np.where(gate, speech, rng.standard_normal(n) * 50).astype(np.int16).tobytes()
+
+
+def encode_message(frame):
+    if types is not None:
+        types.Blob(data=frame, mime_type="audio/pcm;rate=16000")
+    return json.dumps({"realtimeInput": {"audio": {"data": base64.b64encode(frame).decode(), "mimeType": "audio/pcm;rate=16000"}}})
+
+
+def run(pcm, frame_ms, adaptive):
+    resampler = create_resampler(8000, 16000, "numpy")
+    batcher = UplinkBatcher(frame_ms=frame_ms, adaptive=adaptive)
+    start = time.process_time()
+    for i in range(0, len(pcm), 320):
+        if frame := batcher.push(resampler.process(pcm[i:i + 320])):
+            encode_message(frame)
+    if frame := batcher.flush():
+        encode_message(frame)
+    return batcher, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    pcm = caller_audio(args.seconds)
+    print(f"{'frame ms':>8} {'adaptive':>9} {'msgs/s':>7} {'onset flushes':>14} {'cpu ms per call-s':>18}")
+    for frame_ms, adaptive in SETTINGS:
+        batcher, cpu = run(pcm, frame_ms, adaptive)
+        stats = batcher.stats()
+        print(f"{frame_ms:>8} {str(adaptive):>9} {stats['messages_out'] / args.seconds:>7.1f} "
+              f"{stats['onset_flushes']:>14} {cpu / args.seconds * 1000:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
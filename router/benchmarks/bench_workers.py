@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Concurrent-call capacity per number of serve.py workers.
+
+Starts the mock Gemini Live server and `serve.py --workers W` on a free port,
+then runs load_test against /ws/exotel at increasing call counts. A call
+level passes while every call completes, frame drop stays under
+`--max-drop-pct` and outbound jitter p99 under `--max-jitter-ms`; capacity is
+the highest passing level. Fully offline (no API key or network).
+
+Usage (from router/):  python -m benchmarks.bench_workers --workers 1 2 4 --calls 50 100 200 400
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from types import SimpleNamespace
+
+import numpy as np
+
+ROUTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROUTER_DIR)
+
+import load_test  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url, timeout_s=60.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except Exception:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def start_router(workers, port, mock_port):
+    env = dict(os.environ, GEMINI_BASE_URL=f"ws://127.0.0.1:{mock_port}", GOOGLE_API_KEY="mock",
+               LOG_LEVEL="WARNING")
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROUTER_DIR, "serve.py"), "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--drain-timeout-s", "10", "--log-level", "warning"],
+        env=env, cwd=ROUTER_DIR,
+    )
+
+
+def stop(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_level(port, calls, args):
+    load_args = SimpleNamespace(
+        url=f"ws://127.0.0.1:{port}/ws/exotel", metrics_url=None, calls=calls, ramp_s=args.ramp_s,
+        duration_s=args.duration_s, talk_s=2.0, pause_s=4.0, audio=load_test.DEFAULT_CLIP,
+        connect_timeout_s=10.0, seed=0,
+    )
+    results, _, _, _ = asyncio.run(load_test.main_async(load_args))
+    ok = [r for r in results if r.error is None]
+    expected = sum(r.expected_frames for r in ok)
+    drop = max(0, expected - sum(r.frames for r in ok)) / expected * 100 if expected else 100.0
+    jitter = [v for r in ok for v in r.jitter_ms]
+    p99 = float(np.percentile(jitter, 99)) if jitter else float("inf")
+    passed = len(ok) == calls and drop <= args.max_drop_pct and p99 <= args.max_jitter_ms
+    return len(ok), drop, p99, passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--calls", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--duration-s", type=float, default=20.0)
+    parser.add_argument("--ramp-s", type=float, default=5.0)
+    parser.add_argument("--max-drop-pct", type=float, default=1.0)
+    parser.add_argument("--max-jitter-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    mock_port = free_port()
+    mock = subprocess.Popen([sys.executable, os.path.join(ROUTER_DIR, "mock_gemini_server.py"),
+                             "--host", "127.0.0.1", "--port", str(mock_port)], cwd=ROUTER_DIR)
+    capacity = {}
+    try:
+        print(f"{'workers':>7} {'calls':>6} {'ok':>6} {'drop %':>7} {'jitter p99':>11} {'pass':>5}")
+        for workers in args.workers:
+            port = free_port()
+            router = start_router(workers, port, mock_port)
+            try:
+                if not wait_ready(f"http://127.0.0.1:{port}/ready"):
+                    print(f"{workers:>7} ❌ router did not become ready")
+                    continue
+                capacity[workers] = 0
+                for calls in args.calls:
+                    ok, drop, p99, passed = run_level(port, calls, args)
+                    print(f"{workers:>7} {calls:>6} {ok:>6} {drop:>7.2f} {p99:>9.1f}ms {'✅' if passed else '❌':>5}")
+                    if not passed:
+                        break
+                    capacity[workers] = calls
+            finally:
+                stop(router)
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    base = capacity.get(min(capacity)) if capacity else 0
+    print(f"\n{'workers':>7} {'capacity':>9} {'scaling':>8}")
+    for workers, calls in capacity.items():
+        print(f"{workers:>7} {calls:>9} {calls / base if base else 0:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Deterministic load generator for /ws/exotel.
+
+Opens N simulated Exotel media streams against a running router, each
+streaming real 8kHz PCM16 (a WAV clip, cut into utterances separated by
+silence) in paced 20ms packets, and measures what comes back:
+
+    connect_ms         websocket handshake time
+    first_audio_ms     call start to the first non-background frame
+    response_ms        end of each caller utterance to the next reply frame
+    jitter_ms          |inter-arrival - 20ms| of outbound media frames
+    drop %             frames missing against one per 20ms of call time
+    clears             Exotel `clear` events (interruptions)
+
+Server CPU and RSS are read from the router's /metrics before and after the
+run. Pair it with mock_gemini_server.py for fully offline capacity runs:
+
+    python mock_gemini_server.py --port 9100 --latency-ms 600 &
+    GEMINI_BASE_URL=ws://localhost:9100 GOOGLE_API_KEY=mock python start_server.py &
+    python load_test.py --calls 50 --ramp-s 5 --duration-s 30
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from websockets.asyncio.client import connect
+
+ROUTER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROUTER_DIR)
+
+from voice_router.assets import decode_audio  # noqa: E402
+
+DEFAULT_CLIP = os.path.join(os.path.dirname(ROUTER_DIR), "Jabberwocky Studio.wav")
+FRAME_MS = 20
+FRAME_BYTES = 8000 * 2 * FRAME_MS // 1000
+# Outbound frames louder than this are reply audio; the idle background bed is far quieter
+REPLY_RMS = 1000.0
+
+
+def load_caller_audio(path):
+    """8kHz mono PCM16 from `path`, or a synthetic voice-like signal if it is missing."""
+    if path and os.path.exists(path):
+        return decode_audio(path, 8000)
+    t = np.arange(8000 * 10) / 8000
+    return (np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)) * 7000).astype(np.int16).tobytes()
+
+
+def caller_script(pcm, duration_s, talk_s, pause_s, rng):
+    """Packets for one call and the packet index at which each utterance ends."""
+    n_packets = int(duration_s * 1000 // FRAME_MS)
+    talk, pause = int(talk_s * 1000 // FRAME_MS), int(pause_s * 1000 // FRAME_MS)
+    silence = bytes(FRAME_BYTES)
+    usable = len(pcm) // FRAME_BYTES
+    packets, utterance_ends = [], []
+    while len(packets) < n_packets:
+        start = rng.randrange(max(1, usable - talk))
+        packets.extend(pcm[(start + i) * FRAME_BYTES:(start + i + 1) * FRAME_BYTES].ljust(FRAME_BYTES, b"\0") for i in range(talk))
+        utterance_ends.append(len(packets))
+        packets.extend([silence] * pause)
+    return packets[:n_packets], [i for i in utterance_ends if i < n_packets]
+
+
+def rms(pcm):
+    x = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.dot(x, x) / len(x))) if len(x) else 0.0
+
+
+class CallResult:
+    def __init__(self, index):
+        self.index = index
+        self.connect_ms = None
+        self.first_audio_ms = None
+        self.response_ms = []
+        self.jitter_ms = []
+        self.frames = 0
+        self.expected_frames = 0
+        self.clears = 0
+        self.error = None
+
+
+async def run_call(args, index, pcm):
+    result = CallResult(index)
+    rng = random.Random(args.seed + index)
+    packets, utterance_ends = caller_script(pcm, args.duration_s, args.talk_s, args.pause_s, rng)
+    stream_sid = f"load-{args.seed}-{index:05d}"
+    loop = asyncio.get_running_loop()
+    try:
+        t0 = loop.time()
+        async with connect(args.url, max_size=None, open_timeout=args.connect_timeout_s) as ws:
+            result.connect_ms = (loop.time() - t0) * 1000
+            await ws.send(json.dumps({"event": "connected"}))
+            await ws.send(json.dumps({"event": "start", "stream_sid": stream_sid, "start": {
+                "stream_sid": stream_sid, "media_format": {"encoding": "raw/slin", "sample_rate": "8000"}}}))
+            call_start = loop.time()
+            speech_ended_at = []  # utterance end times not yet answered
+
+            async def receive():
+                last = None
+                async for raw in ws:
+                    now = loop.time()
+                    msg = json.loads(raw)
+                    if msg.get("event") == "clear":
+                        result.clears += 1
+                        continue
+                    if msg.get("event") != "media":
+                        continue
+                    result.frames += 1
+                    if last is not None:
+                        result.jitter_ms.append(abs((now - last) * 1000 - FRAME_MS))
+                    last = now
+                    if rms(base64.b64decode(msg["media"]["payload"])) >= REPLY_RMS:
+                        if result.first_audio_ms is None:
+                            result.first_audio_ms = (now - call_start) * 1000
+                        if speech_ended_at:
+                            result.response_ms.append((now - speech_ended_at[-1]) * 1000)
+                            speech_ended_at.clear()
+
+            receiver = loop.create_task(receive())
+            ends = set(utterance_ends)
+            deadline = loop.time()
+            for i, packet in enumerate(packets):
+                if i in ends:
+                    speech_ended_at.append(loop.time())
+                await ws.send(json.dumps({"event": "media", "stream_sid": stream_sid,
+                                          "media": {"payload": base64.b64encode(packet).decode()}}))
+                deadline += FRAME_MS / 1000
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+            result.expected_frames = int((loop.time() - call_start) * 1000 // FRAME_MS)
+            await ws.send(json.dumps({"event": "stop", "stream_sid": stream_sid}))
+            await asyncio.sleep(0.2)
+            receiver.cancel()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def scrape_process_metrics(url):
+    """(cpu_seconds, rss_bytes) from prometheus_client's process collector, or None."""
+    if not url:
+        return None
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            text = response.read().decode()
+    except Exception:
+        return None
+    values = {}
+    for line in text.splitlines():
+        if line.startswith(("process_cpu_seconds_total ", "process_resident_memory_bytes ")):
+            name, value = line.split()
+            values[name] = float(value)
+    if len(values) < 2:
+        return None
+    return values["process_cpu_seconds_total"], values["process_resident_memory_bytes"]
+
+
+def summarize(name, values, unit="ms"):
+    if not values:
+        return f"{name:<16} {'-':>8}"
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return f"{name:<16} {len(values):>8} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {max(values):>9.1f} {unit}"
+
+
+async def main_async(args):
+    pcm = load_caller_audio(args.audio)
+    before = scrape_process_metrics(args.metrics_url)
+    wall_start = time.monotonic()
+    tasks = []
+    for i in range(args.calls):
+        tasks.append(asyncio.create_task(run_call(args, i, pcm)))
+        if args.ramp_s and args.calls > 1:
+            await asyncio.sleep(args.ramp_s / (args.calls - 1))
+    results = await asyncio.gather(*tasks)
+    wall = time.monotonic() - wall_start
+    after = scrape_process_metrics(args.metrics_url)
+    return results, wall, before, after
+
+
+def report(results, wall, before, after):
+    ok = [r for r in results if r.error is None]
+    print(f"📞 {len(results)} calls, {len(ok)} completed, {len(results) - len(ok)} failed, {wall:.1f}s wall")
+    for r in results:
+        if r.error:
+            print(f"   ❌ call {r.index}: {r.error}")
+    print(f"{'':<16} {'n':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    print(summarize("connect", [r.connect_ms for r in ok]))
+    print(summarize("first audio", [r.first_audio_ms for r in ok if r.first_audio_ms is not None]))
+    print(summarize("response", [v for r in ok for v in r.response_ms]))
+    print(summarize("jitter", [v for r in ok for v in r.jitter_ms]))
+    expected = sum(r.expected_frames for r in ok)
+    received = sum(r.frames for r in ok)
+    if expected:
+        print(f"frames           {received}/{expected} received, drop {max(0, expected - received) / expected * 100:.2f}%")
+    print(f"clears           {sum(r.clears for r in ok)}")
+    if before and after:
+        print(f"server CPU       {(after[0] - before[0]) / wall * 100:.1f}% of one core, RSS {after[1] / 2**20:.0f} MiB")
+    else:
+        print("server CPU/RSS   unavailable (is --metrics-url reachable?)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="ws://localhost:8000/ws/exotel")
+    parser.add_argument("--metrics-url", default="http://localhost:8000/metrics")
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--ramp-s", type=float, default=0.0, help="spread call starts over this many seconds")
+    parser.add_argument("--duration-s", type=float, default=30.0)
+    parser.add_argument("--talk-s", type=float, default=2.0)
+    parser.add_argument("--pause-s", type=float, default=4.0)
+    parser.add_argument("--audio", default=DEFAULT_CLIP, help="caller audio clip (any format pydub reads)")
+    parser.add_argument("--connect-timeout-s", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report(*asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
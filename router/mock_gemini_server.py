@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Gemini Live API (BidiGenerateContent websocket).
+
+Speaks the same JSON protocol as the google-genai SDK: answers `setup` with
+`setupComplete`, listens to `realtimeInput` audio, and when the caller stops
+talking replies after a configurable latency with a scripted audio turn
+(24kHz PCM `inlineData` chunks), then `usageMetadata` with `turnComplete`.
+Caller speech during a reply, or a scripted `interrupt_after_ms`, produces
+`serverContent.interrupted` the way server-side VAD does.
+
+Run it and point the router at it (no API key or network needed):
+    python mock_gemini_server.py --port 9100 --latency-ms 600
+    GEMINI_BASE_URL=ws://localhost:9100 GOOGLE_API_KEY=mock python start_server.py
+
+A script file is a JSON list of turns, used in order and then repeated:
+    [{"latency_ms": 500, "audio_ms": 2000}, {"latency_ms": 900, "audio_ms": 4000, "interrupt_after_ms": 1500}]
+"""
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import random
+
+import numpy as np
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+logger = logging.getLogger("mock_gemini")
+
+INPUT_RATE = 16000
+OUTPUT_RATE = 24000
+
+
+def response_audio(duration_ms, rate=OUTPUT_RATE):
+    """Speech-like PCM16: a 180Hz tone with a 4Hz syllable envelope."""
+    t = np.arange(rate * duration_ms // 1000) / rate
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+    return (np.sin(2 * np.pi * 180 * t) * envelope * 9000).astype(np.int16).tobytes()
+
+
+def _field(message, camel):
+    """Proto JSON accepts lowerCamelCase or snake_case keys; the SDK sends snake_case."""
+    if camel in message:
+        return message[camel]
+    return message.get("".join("_" + c.lower() if c.isupper() else c for c in camel))
+
+
+def _b64decode(data):
+    """Proto JSON bytes may be standard or URL-safe base64, padded or not."""
+    return base64.b64decode(data + "=" * (-len(data) % 4), altchars=b"-_")
+
+
+class MockTurn:
+    def __init__(self, latency_ms=600, audio_ms=2000, interrupt_after_ms=None, latency_jitter_ms=0):
+        self.latency_ms = latency_ms
+        self.audio_ms = audio_ms
+        self.interrupt_after_ms = interrupt_after_ms
+        self.latency_jitter_ms = latency_jitter_ms
+
+
+class MockLiveServer:
+    """Scripted Live API endpoint; one `MockLiveSession` per websocket."""
+
+    def __init__(self, turns=None, chunk_ms=40, pace=1.0, end_silence_ms=500, barge_in_ms=200,
+                 speech_rms=500.0, connect_latency_ms=0, seed=0):
+        self.turns = turns or [MockTurn()]
+        self.chunk_ms = chunk_ms
+        self.pace = pace
+        self.end_silence_ms = end_silence_ms
+        self.barge_in_ms = barge_in_ms
+        self.speech_rms = speech_rms
+        self.connect_latency_ms = connect_latency_ms
+        self.seed = seed
+        self._audio_cache = {}
+        self._sessions = itertools.count()
+        self.stats = {"sessions": 0, "turns": 0, "interruptions": 0, "audio_in_ms": 0.0}
+
+    def audio(self, duration_ms):
+        if duration_ms not in self._audio_cache:
+            self._audio_cache[duration_ms] = response_audio(duration_ms)
+        return self._audio_cache[duration_ms]
+
+    async def handler(self, ws):
+        session = MockLiveSession(self, ws, next(self._sessions))
+        self.stats["sessions"] += 1
+        try:
+            await session.run()
+        except ConnectionClosed:
+            pass
+        finally:
+            session.cancel_reply()
+
+    def serve(self, host="localhost", port=9100):
+        return serve(self.handler, host, port, max_size=None)
+
+
+class MockLiveSession:
+    def __init__(self, server, ws, index):
+        self.server = server
+        self.ws = ws
+        self.rng = random.Random(server.seed + index)
+        self.turns = itertools.cycle(server.turns)
+        self.speaking = False
+        self.speech_ms = 0.0
+        self.silence_ms = 0.0
+        self.reply_task = None
+        self.prompt_tokens = 0
+
+    async def send(self, message):
+        await self.ws.send(json.dumps(message))
+
+    async def run(self):
+        setup = json.loads(await self.ws.recv())
+        if "setup" not in setup:
+            await self.ws.close(1008, "expected setup message")
+            return
+        if self.server.connect_latency_ms:
+            await asyncio.sleep(self.server.connect_latency_ms / 1000)
+        await self.send({"setupComplete": {}})
+        async for raw in self.ws:
+            message = json.loads(raw)
+            for pcm in self._audio_payloads(message):
+                await self.on_audio(pcm)
+            if _field(_field(message, "realtimeInput") or {}, "audioStreamEnd"):
+                await self.on_speech_end()
+
+    @staticmethod
+    def _audio_payloads(message):
+        realtime = _field(message, "realtimeInput") or {}
+        blobs = [realtime["audio"]] if "audio" in realtime else _field(realtime, "mediaChunks") or []
+        return [_b64decode(blob["data"]) for blob in blobs if blob.get("data")]
+
+    async def on_audio(self, pcm):
+        duration_ms = len(pcm) / 2 / INPUT_RATE * 1000
+        self.server.stats["audio_in_ms"] += duration_ms
+        self.prompt_tokens += max(1, int(duration_ms / 40))  # ~25 audio tokens per second
+        x = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        loud = len(x) > 0 and float(np.sqrt(np.dot(x, x) / len(x))) >= self.server.speech_rms
+        if loud:
+            self.speaking = True
+            self.speech_ms += duration_ms
+            self.silence_ms = 0.0
+            if self.replying and self.speech_ms >= self.server.barge_in_ms:
+                await self.interrupt()
+        elif self.speaking:
+            self.silence_ms += duration_ms
+            if self.silence_ms >= self.server.end_silence_ms:
+                await self.on_speech_end()
+
+    async def on_speech_end(self):
+        if not self.speaking:
+            return
+        self.speaking = False
+        self.speech_ms = self.silence_ms = 0.0
+        self.cancel_reply()
+        self.reply_task = asyncio.get_running_loop().create_task(self.reply(next(self.turns)))
+
+    @property
+    def replying(self) -> bool:
+        return self.reply_task is not None and not self.reply_task.done()
+
+    def cancel_reply(self):
+        if self.replying:
+            self.reply_task.cancel()
+
+    async def interrupt(self):
+        self.cancel_reply()
+        self.server.stats["interruptions"] += 1
+        await self.send({"serverContent": {"interrupted": True}})
+
+    async def reply(self, turn):
+        server = self.server
+        jitter = self.rng.uniform(-turn.latency_jitter_ms, turn.latency_jitter_ms) if turn.latency_jitter_ms else 0
+        await asyncio.sleep(max(0.0, turn.latency_ms + jitter) / 1000)
+        pcm = server.audio(turn.audio_ms)
+        chunk_bytes = OUTPUT_RATE * 2 * server.chunk_ms // 1000
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        sent_ms = 0
+        for i in range(0, len(pcm), chunk_bytes):
+            if turn.interrupt_after_ms is not None and sent_ms >= turn.interrupt_after_ms:
+                server.stats["interruptions"] += 1
+                await self.send({"serverContent": {"interrupted": True}})
+                return
+            chunk = pcm[i:i + chunk_bytes]
+            await self.send({"serverContent": {"modelTurn": {"parts": [{"inlineData": {
+                "mimeType": f"audio/pcm;rate={OUTPUT_RATE}",
+                "data": base64.b64encode(chunk).decode(),
+            }}]}}})
+            sent_ms += server.chunk_ms
+            if server.pace:
+                await asyncio.sleep(max(0.0, started + sent_ms / 1000 / server.pace - loop.time()))
+        server.stats["turns"] += 1
+        response_tokens = max(1, turn.audio_ms // 40)
+        await self.send({
+            "serverContent": {"turnComplete": True},
+            "usageMetadata": {
+                "promptTokenCount": self.prompt_tokens,
+                "responseTokenCount": response_tokens,
+                "totalTokenCount": self.prompt_tokens + response_tokens,
+                "responseTokensDetails": [{"modality": "AUDIO", "tokenCount": response_tokens}],
+            },
+        })
+        self.prompt_tokens = 0
+
+
+def load_script(path):
+    with open(path, encoding="utf-8") as f:
+        return [MockTurn(**turn) for turn in json.load(f)]
+
+
+async def main_async(args):
+    turns = load_script(args.script) if args.script else [
+        MockTurn(args.latency_ms, args.audio_ms, args.interrupt_after_ms, args.latency_jitter_ms)
+    ]
+    server = MockLiveServer(turns, chunk_ms=args.chunk_ms, pace=args.pace, end_silence_ms=args.end_silence_ms,
+                            barge_in_ms=args.barge_in_ms, connect_latency_ms=args.connect_latency_ms, seed=args.seed)
+    async with server.serve(args.host, args.port):
+        logger.info(f"🧪 Mock Gemini Live server on ws://{args.host}:{args.port} ({len(turns)} scripted turn(s))")
+        try:
+            await asyncio.Future()
+        finally:
+            logger.info(f"📊 Mock stats: {server.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--script", help="JSON list of turns (overrides the per-turn flags below)")
+    parser.add_argument("--latency-ms", type=float, default=600, help="end of caller speech to first reply audio")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--audio-ms", type=int, default=2000, help="length of each reply")
+    parser.add_argument("--interrupt-after-ms", type=int, default=None)
+    parser.add_argument("--connect-latency-ms", type=float, default=0)
+    parser.add_argument("--chunk-ms", type=int, default=40)
+    parser.add_argument("--pace", type=float, default=1.0, help="reply speed vs real time (0 = send all at once)")
+    parser.add_argument("--end-silence-ms", type=float, default=500)
+    parser.add_argument("--barge-in-ms", type=float, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded call through a running router.
+
+Takes a `.vrcap` capture written with RECORD_DIR set (voice_router/recording.py)
+and plays both sides of it again. The tool connects to /ws/exotel as Exotel
+and sends the recorded caller packets. It also serves the Gemini Live
+protocol itself and sends the recorded Gemini audio, interruptions and turn
+ends on whichever router session starts talking to it. Both timelines run on
+the recorded clock, at `--speed` times real time (0 = as fast as possible).
+
+The report compares the replay against the capture: frames, clears, and
+reply latency (first Gemini audio of a turn to the first reply frame out).
+Replaying one capture before and after a change gives a like-for-like
+regression number on real traffic:
+
+    GEMINI_BASE_URL=ws://localhost:9100 GOOGLE_API_KEY=mock GEMINI_POOL_SIZE=0 python start_server.py &
+    python replay_call.py captures/<stream_sid>_2026-01-01_12-00-00_123.vrcap --gemini-port 9100 --speed 0
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+ROUTER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROUTER_DIR)
+
+from load_test import REPLY_RMS, rms  # noqa: E402
+from voice_router.recording import EVENT, GEMINI_AUDIO, INBOUND, OUTBOUND, read_capture  # noqa: E402
+
+GEMINI_EVENTS = {
+    "interrupted": {"serverContent": {"interrupted": True}},
+    "turn_complete": {"serverContent": {"turnComplete": True}},
+}
+
+
+def gemini_audio_message(chunk):
+    return {"serverContent": {"modelTurn": {"parts": [{"inlineData": {
+        "mimeType": "audio/pcm;rate=24000", "data": base64.b64encode(chunk).decode()}}]}}}
+
+
+def summarize(records):
+    """Counts and reply latencies (ms) for capture-style (seconds, kind, payload) records."""
+    summary = {"inbound": 0, "gemini_chunks": 0, "outbound": 0, "clears": 0, "reply_ms": []}
+    turn_started_at = None
+    new_turn = True
+    for t, kind, payload in records:
+        if kind == INBOUND:
+            summary["inbound"] += 1
+        elif kind == GEMINI_AUDIO:
+            summary["gemini_chunks"] += 1
+            if new_turn:
+                new_turn, turn_started_at = False, t
+        elif kind == OUTBOUND:
+            summary["outbound"] += 1
+            if turn_started_at is not None and rms(payload) >= REPLY_RMS:
+                summary["reply_ms"].append((t - turn_started_at) * 1000)
+                turn_started_at = None
+        elif kind == EVENT:
+            if payload["event"] == "clear":
+                summary["clears"] += 1
+            elif payload["event"] == "turn_complete":
+                # Playout lags the turn's audio; its first reply frame may still be on the way
+                new_turn = True
+            elif payload["event"] == "interrupted":
+                new_turn, turn_started_at = True, None
+    return summary
+
+
+class ReplayGemini:
+    """Gemini Live stand-in that plays recorded responses on the router's call session."""
+
+    def __init__(self):
+        self.session = None
+        self._ready = asyncio.Event()
+        self.sessions = 0
+
+    async def handler(self, ws):
+        self.sessions += 1
+        try:
+            await ws.recv()  # setup
+            await ws.send(json.dumps({"setupComplete": {}}))
+            async for _ in ws:
+                # Pre-warmed sessions sit idle; the first one the router talks on is the call's
+                if self.session is None:
+                    self.session = ws
+                    self._ready.set()
+        except ConnectionClosed:
+            pass
+
+    async def send(self, message, timeout_s=10.0):
+        await asyncio.wait_for(self._ready.wait(), timeout_s)
+        await self.session.send(json.dumps(message))
+
+
+async def replay(capture, url, gemini_port, speed=1.0, tail_s=1.0):
+    """Replay `capture` records against the router at `url`; returns the observed records."""
+    gemini = ReplayGemini()
+    observed = []
+    start = next((p for _, k, p in capture if k == EVENT and p["event"] == "start"), {})
+    stream_sid = f"{start.get('stream_sid', 'call')}-replay"
+    async with serve(gemini.handler, "localhost", gemini_port, max_size=None):
+        async with connect(url, max_size=None) as ws:
+            t0 = time.monotonic()
+            now = lambda: time.monotonic() - t0  # noqa: E731
+
+            async def receive():
+                async for raw in ws:
+                    msg = json.loads(raw)
+                    if msg.get("event") == "media":
+                        observed.append((now(), OUTBOUND, base64.b64decode(msg["media"]["payload"])))
+                    elif msg.get("event") == "clear":
+                        observed.append((now(), EVENT, {"event": "clear"}))
+
+            receiver = asyncio.get_running_loop().create_task(receive())
+            await ws.send(json.dumps({"event": "connected"}))
+            await ws.send(json.dumps({"event": "start", "stream_sid": stream_sid, "start": {
+                "stream_sid": stream_sid, "media_format": {"encoding": "raw/slin", "sample_rate": "8000"}}}))
+            for t, kind, payload in capture:
+                if speed:
+                    await asyncio.sleep(max(0.0, t / speed - now()))
+                if kind == INBOUND:
+                    await ws.send(json.dumps({"event": "media", "stream_sid": stream_sid,
+                                              "media": {"payload": base64.b64encode(payload).decode()}}))
+                    observed.append((now(), INBOUND, payload))
+                elif kind == GEMINI_AUDIO:
+                    await gemini.send(gemini_audio_message(payload))
+                    observed.append((now(), GEMINI_AUDIO, payload))
+                elif kind == EVENT and payload["event"] in GEMINI_EVENTS:
+                    await gemini.send(GEMINI_EVENTS[payload["event"]])
+                    observed.append((now(), EVENT, payload))
+                elif kind == EVENT and payload["event"] == "stop":
+                    break
+                if not speed:
+                    await asyncio.sleep(0)
+            await asyncio.sleep(tail_s)
+            await ws.send(json.dumps({"event": "stop", "stream_sid": stream_sid}))
+            await asyncio.sleep(0.2)
+            receiver.cancel()
+    return observed, time.monotonic() - t0
+
+
+def percentiles(values):
+    if not values:
+        return "-"
+    p50, p95 = np.percentile(values, [50, 95])
+    return f"p50 {p50:.0f}ms p95 {p95:.0f}ms max {max(values):.0f}ms"
+
+
+def report(recorded, replayed, wall):
+    print(f"{'':<14} {'recorded':>10} {'replayed':>10}")
+    for key in ("inbound", "gemini_chunks", "outbound", "clears"):
+        print(f"{key:<14} {recorded[key]:>10} {replayed[key]:>10}")
+    print(f"reply latency  recorded {percentiles(recorded['reply_ms'])}")
+    print(f"               replayed {percentiles(replayed['reply_ms'])}")
+    print(f"⏱️ replay took {wall:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("capture")
+    parser.add_argument("--url", default="ws://localhost:8000/ws/exotel")
+    parser.add_argument("--gemini-port", type=int, default=9100, help="serve recorded Gemini responses here")
+    parser.add_argument("--speed", type=float, default=1.0, help="x real time; 0 = as fast as possible")
+    parser.add_argument("--tail-s", type=float, default=1.0, help="keep listening after the last record")
+    args = parser.parse_args()
+    capture = list(read_capture(args.capture))
+    observed, wall = asyncio.run(replay(capture, args.url, args.gemini_port, args.speed, args.tail_s))
+    report(summarize(capture), summarize(observed), wall)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the voice router.
+
+`start_server.py` runs a single `--reload` process: every call shares one
+event loop and one core, and a reload drops live calls. This runs N uvicorn
+worker processes of `router.pipeline:app` instead. Each worker binds its own
+SO_REUSEPORT socket so the kernel spreads new connections across them (where
+SO_REUSEPORT is missing the parent binds one socket the workers share).
+uvloop and httptools are used when installed (`uvicorn[standard]`).
+
+SIGTERM/SIGINT drains instead of killing calls: every worker turns `/ready`
+to 503, refuses new `/ws/exotel` connections and exits once its in-flight
+calls have ended, or after `--drain-timeout-s`. A second signal exits
+immediately. Workers that crash outside a drain are restarted, and a worker
+whose supervisor is killed outright (SIGKILL) drains and exits on its own.
+
+Metrics are kept per worker, so /metrics on the shared port answers for
+whichever worker took the connection. With `--metrics-port P`, worker i also
+serves the app on its own port P+i; scrape those instead, one target per
+worker.
+
+    python router/serve.py --workers 4 --port 8000 --metrics-port 9400
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)  # the app is imported as router.pipeline:app
+
+import uvicorn  # noqa: E402
+
+from router.voice_router.lifecycle import LIFECYCLE  # noqa: E402
+
+logger = logging.getLogger("serve")
+
+APP = "router.pipeline:app"
+
+
+def bind_socket(host, port, reuse_port):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server whose first exit signal drains calls instead of closing them."""
+
+    def __init__(self, config, drain_timeout_s, supervisor_pid=None):
+        super().__init__(config)
+        self.drain_timeout_s = drain_timeout_s
+        self.supervisor_pid = supervisor_pid
+
+    def handle_exit(self, sig, frame):
+        if LIFECYCLE.draining:
+            return super().handle_exit(sig, frame)
+        LIFECYCLE.start_drain()
+        logger.info(f"🚰 Worker {os.getpid()} draining {LIFECYCLE.active_calls} call(s)")
+
+    async def on_tick(self, counter) -> bool:
+        if self.supervisor_pid is not None and os.getppid() != self.supervisor_pid and not LIFECYCLE.draining:
+            # Supervisor was killed outright; drain rather than live on as an orphan nobody will stop
+            logger.warning(f"👻 Worker {os.getpid()} lost its supervisor, draining {LIFECYCLE.active_calls} call(s)")
+            LIFECYCLE.start_drain()
+        if LIFECYCLE.drained(self.drain_timeout_s):
+            if LIFECYCLE.active_calls:
+                logger.warning(f"⏰ Worker {os.getpid()} drain timed out with {LIFECYCLE.active_calls} call(s) left")
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+def run_worker(index, args, sock, supervisor_pid=None):
+    # Own process group: a terminal Ctrl+C reaches only the supervisor, which forwards it once.
+    # That also shields workers from a group kill, so on_tick watches for the supervisor going away.
+    os.setpgrp()
+    if sock is None:
+        sock = bind_socket(args.host, args.port, reuse_port=True)
+    config = uvicorn.Config(
+        APP,
+        loop=args.loop,
+        http=args.http,
+        ws="auto",
+        lifespan="on",
+        log_level=args.log_level,
+        timeout_keep_alive=args.keep_alive_s,
+    )
+    sockets = [sock]
+    if args.metrics_port:
+        sockets.append(bind_socket(args.host, args.metrics_port + index, reuse_port=False))
+    server = DrainingServer(config, args.drain_timeout_s, supervisor_pid)
+    server.run(sockets=sockets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "0")),
+                        help="worker i also listens on this port + i, for per-worker /metrics scrapes (0 = off)")
+    parser.add_argument("--drain-timeout-s", type=float, default=float(os.getenv("DRAIN_TIMEOUT_S", "600")))
+    parser.add_argument("--loop", default="auto", help="uvicorn loop (auto picks uvloop when installed)")
+    parser.add_argument("--http", default="auto", help="uvicorn http (auto picks httptools when installed)")
+    parser.add_argument("--keep-alive-s", type=int, default=5)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-reuse-port", action="store_true", help="share one inherited socket instead")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    reuse_port = hasattr(socket, "SO_REUSEPORT") and not args.no_reuse_port
+    # Bind once up front: fails fast on a busy port, and is the shared socket without SO_REUSEPORT
+    shared = bind_socket(args.host, args.port, reuse_port)
+    ctx = multiprocessing.get_context("spawn")
+    workers = {}
+    stopping = False
+
+    def spawn(index):
+        process = ctx.Process(target=run_worker, args=(index, args, None if reuse_port else shared, os.getpid()),
+                              name=f"voice-router-{index}")
+        process.start()
+        workers[index] = process
+
+    def on_signal(sig, frame):
+        nonlocal stopping
+        if stopping:
+            logger.warning("🛑 Second signal: stopping workers now")
+        else:
+            logger.info(f"🚰 Draining {len(workers)} worker(s) (up to {args.drain_timeout_s:.0f}s)")
+        stopping = True
+        for process in workers.values():
+            if process.is_alive():
+                os.kill(process.pid, sig)
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    for i in range(args.workers):
+        spawn(i)
+    if reuse_port:
+        # Each worker has its own listener; keeping this one would take a share of connections
+        shared.close()
+    logger.info(f"🚀 {args.workers} worker(s) on {args.host}:{args.port} "
+                f"({'SO_REUSEPORT' if reuse_port else 'shared socket'}, loop={args.loop}, http={args.http})")
+    if args.metrics_port:
+        logger.info(f"📊 Per-worker /metrics on ports {args.metrics_port}-{args.metrics_port + args.workers - 1}")
+
+    while workers:
+        for index, process in list(workers.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del workers[index]
+            if not stopping:
+                logger.warning(f"♻️ Worker {index} exited with {process.exitcode}, restarting")
+                spawn(index)
+        time.sleep(0.5)
+    logger.info("👋 All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
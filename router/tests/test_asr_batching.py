@@ -0,0 +1,143 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from asr import batching
+from asr.batching import BatchedWhisper, BatchScheduler
+
+
+def test_full_batch_runs_without_waiting_and_routes_results():
+    sizes = []
+
+    def run_batch(items):
+        sizes.append(len(items))
+        return [x * 2 for x in items]
+
+    scheduler = BatchScheduler(run_batch, max_batch=4, max_wait_ms=1000)
+    started = time.perf_counter()
+    futures = [scheduler.submit(i) for i in range(10)]
+    assert [f.result(timeout=5) for f in futures[:8]] == [i * 2 for i in range(8)]
+    assert time.perf_counter() - started < 0.5
+    assert [f.result(timeout=5) for f in futures[8:]] == [16, 18]
+    scheduler.close()
+    assert sizes == [4, 4, 2]
+    stats = scheduler.stats()
+    assert stats["items"] == 10 and stats["batch_sizes"] == {2: 1, 4: 2}
+
+
+def test_partial_batch_waits_at_most_max_wait_and_errors_reach_every_caller():
+    calls = []
+
+    def run_batch(items):
+        calls.append(items)
+        if "bad" in items:
+            raise ValueError("decode failed")
+        return items
+
+    scheduler = BatchScheduler(run_batch, max_batch=8, max_wait_ms=50)
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(scheduler(i))) for i in range(3)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    waited = time.perf_counter() - started
+    assert sorted(results) == [0, 1, 2] and len(calls) == 1
+    assert 0.04 <= waited < 1.0
+
+    bad, good = scheduler.submit("bad"), scheduler.submit("ok")
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    with pytest.raises(ValueError):
+        good.result(timeout=5)
+    scheduler.close()
+
+
+def test_batched_whisper_groups_by_language(monkeypatch):
+    class Model:
+        def transcribe(self, audio, language=None, **kwargs):
+            return iter([]), None
+
+    runs = []
+
+    def fake_transcribe_batch(model, audios, prompts, language, beam_size=1):
+        runs.append((language, list(audios)))
+        return [[f"{language}:{a}"] for a in audios]
+
+    monkeypatch.setattr(batching, "transcribe_batch", fake_transcribe_batch)
+    whisper = BatchedWhisper(Model(), max_batch=3, max_wait_ms=1000)
+    results = {}
+
+    def stream(audio, language):
+        segments, info = whisper.transcribe(audio, language=language, initial_prompt="hi", word_timestamps=True)
+        results[audio] = (next(segments).words, info.language)
+
+    threads = [threading.Thread(target=stream, args=a) for a in (("a", "en"), ("b", "hi"), ("c", "en"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    whisper.close()
+    assert results == {"a": (["en:a"], "en"), "b": (["hi:b"], "hi"), "c": (["en:c"], "en")}
+    assert sorted(len(audios) for _, audios in runs) == [1, 2]
+    # Language detection (first window of a stream) bypasses the batch
+    assert whisper.transcribe("x")[1] is None
+
+
+def test_silent_windows_yield_no_words():
+    transcribe = pytest.importorskip("faster_whisper.transcribe")
+    eot = 50257
+    aligned_batches = []
+
+    def result(no_speech_prob, score):
+        return SimpleNamespace(sequences_ids=[[7, 8, 9]], scores=[score], no_speech_prob=no_speech_prob)
+
+    def align(encoder_output, sot_sequence, text_tokens, num_frames, median_filter_width=7):
+        aligned_batches.append((np.asarray(encoder_output).shape[0], len(text_tokens), list(num_frames)))
+        return [SimpleNamespace(text_token_probs=[0.9] * (len(tokens) + 1),
+                                alignments=[(i, 10 * i) for i in range(len(tokens) + 1)]) for tokens in text_tokens]
+
+    class Model(transcribe.WhisperModel):
+        """Real word alignment (add_word_timestamps, find_alignment) over a stubbed CTranslate2 model."""
+
+        frames_per_second = 100
+        tokens_per_second = 50
+        max_length = 448
+
+        def __init__(self, results):
+            self.model = SimpleNamespace(generate=lambda *args, **kwargs: results, align=align)
+
+        def feature_extractor(self, audio):
+            return np.zeros((80, len(audio) // 160 + 1), dtype=np.float32)
+
+        def get_prompt(self, tokenizer, context, without_timestamps=False):
+            return [1] + context
+
+        def encode(self, features):
+            import ctranslate2
+
+            return ctranslate2.StorageView.from_array(np.ascontiguousarray(features))
+
+        def _split_segments_by_timestamps(self, tokens, segment_duration, seek, **kwargs):
+            return [{"seek": seek, "tokens": tokens, "start": 0.0, "end": segment_duration}], seek, False
+
+    tokenizer = SimpleNamespace(
+        eot=eot, sot_sequence=(1,), decode=lambda tokens: "".join(f" w{t}" for t in tokens),
+        split_to_word_tokens=lambda tokens: ([f" w{t}" for t in tokens[:-1]] + [""], [[t] for t in tokens]),
+    )
+    audio = np.zeros(16000, dtype=np.float32)
+    # Silent and unsure / speech-like but confident / unsure but not silent
+    model = Model([result(0.9, -2.0), result(0.9, -0.2), result(0.1, -2.0)])
+    words = batching._generate_words(model, tokenizer, [audio] * 3, [[], [], []], beam_size=1)
+    assert [[w.word for w in stream] for stream in words] == [[], [" w7", " w8", " w9"], [" w7", " w8", " w9"]]
+    # Only the two windows with text were aligned, against their own encoder rows
+    assert aligned_batches == [(2, 2, [100, 100])]
+
+    # A batch where every window is silent aligns nothing and still returns a result per window
+    model = Model([result(0.9, -2.0)] * 2)
+    assert batching._generate_words(model, tokenizer, [audio] * 2, [[], []], beam_size=1) == [[], []]
+    assert len(aligned_batches) == 1
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from asr.audio_dsp import ulaw_encode
+from asr.streaming import StreamingTranscriber, format_sse
+
+BLOCK = 8000  # one "word" per 0.5s at 16kHz
+
+
+class FakeWhisper:
+    """Reads word k from a 0.5s block held at level k*1000; a trailing partial block is a guess."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, language=None, initial_prompt=None, **kwargs):
+        self.calls.append({"samples": len(audio), "language": language, "prompt": initial_prompt})
+        words = []
+        for i in range(0, len(audio), BLOCK):
+            block = audio[i:i + BLOCK]
+            if len(block) < BLOCK // 2:
+                break
+            k = round(float(np.median(block[len(block) // 4:-len(block) // 4])) * 32768 / 1000)
+            text = f" w{k}." if k % 4 == 3 else f" w{k}"
+            if len(block) < BLOCK:
+                text = " maybe"
+            words.append(SimpleNamespace(word=text, start=i / 16000, end=(i + len(block)) / 16000))
+        return iter([SimpleNamespace(words=words)]), SimpleNamespace(language="en")
+
+
+def speech_8k(n_words):
+    return np.repeat(np.arange(n_words, dtype=np.int16) * 1000, 4000)
+
+
+def run(transcriber, data, chunk_bytes):
+    events = []
+    for i in range(0, len(data), chunk_bytes):
+        transcriber.feed(data[i:i + chunk_bytes])
+        if transcriber.ready():
+            events += transcriber.decode()
+    return events + transcriber.finish()
+
+
+def test_partials_then_finals_without_redecoding_committed_audio():
+    model = FakeWhisper()
+    t = StreamingTranscriber(model, step_s=1.0)
+    events = run(t, speech_8k(8).tobytes(), 321)  # odd sizes split samples across chunks
+    finals = [e["text"] for e in events if e["type"] == "final"]
+    assert finals == ["w0 w1 w2 w3.", "w4 w5 w6 w7."]
+    partials = [e for e in events if e["type"] == "partial"]
+    assert partials and all(p["text"] for p in partials)
+    assert events[0]["type"] == "partial" and events[-1]["type"] == "final"
+    assert abs(events[-1]["end"] - 4.0) < 0.01
+
+    # The language found on the first decode is pinned, and committed words become the prompt
+    assert model.calls[0]["language"] is None and {c["language"] for c in model.calls[1:]} == {"en"}
+    assert any(c["prompt"] and "w0" in c["prompt"] for c in model.calls)
+    # Only the uncommitted tail is ever re-decoded: far less than re-running the growing stream
+    whole_stream_each_time = 1 + 2 + 3 + 4 + 4
+    assert t.stats()["decoded_s"] < 0.6 * whole_stream_each_time
+
+
+def test_ulaw_input_and_formats():
+    model = FakeWhisper()
+    pcm = speech_8k(4)
+    t = StreamingTranscriber(model, encoding="ulaw", step_s=0.5)
+    events = run(t, ulaw_encode(pcm).tobytes(), 160)
+    assert [e["text"] for e in events if e["type"] == "final"] == ["w0 w1 w2 w3."]
+    assert format_sse(events[-1]).startswith("event: final\ndata: {")
+
+    with pytest.raises(ValueError):
+        StreamingTranscriber(model, encoding="ulaw", sample_rate=16000)
+    with pytest.raises(ValueError):
+        StreamingTranscriber(model, encoding="opus")
+
+
+def test_stream_endpoint_reads_body_while_streaming_events():
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from asr.streaming import create_stream_router
+
+    whisper = FakeWhisper()
+    app = fastapi.FastAPI()
+    app.include_router(create_stream_router(lambda name: whisper, "tiny"))
+
+    def body():
+        data = speech_8k(8).tobytes()
+        for i in range(0, len(data), 3200):
+            yield data[i:i + 3200]
+
+    with TestClient(app) as client:
+        response = client.post("/v1/audio/stream", content=body(), params={"step_s": 1.0})
+        assert client.post("/v1/audio/stream", content=b"", params={"encoding": "opus"}).status_code == 400
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/event-stream")
+    events = [line for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events[0] == "event: partial" and events[-1] == "event: final"
+    assert '"text": "w0 w1 w2 w3. w4 w5 w6 w7."' in response.text.split("event: final")[-1]
@@ -0,0 +1,54 @@
+import contextlib
+import threading
+import time
+
+from asr.warmup import ModelWarmup, synthetic_audio
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, language=None, **kwargs):
+        with self._lock:
+            self.calls.append((len(audio), language))
+        return iter([]), None
+
+
+def test_parallel_preload_and_warmup_then_ready():
+    models = {"tiny": FakeModel(), "small": FakeModel()}
+    loading = []
+
+    def load_model(name):
+        loading.append(name)
+        time.sleep(0.3)
+        if name == "small":
+            # Model managers may hand out a context manager holding the model
+            return contextlib.nullcontext(models[name])
+        return models[name]
+
+    warmup = ModelWarmup(load_model, ["tiny", "small", "tiny"], lengths_s=(1, 2), concurrency=2)
+    assert not warmup.ready
+    started = time.perf_counter()
+    status = warmup.run()
+    assert time.perf_counter() - started < 0.55  # both loads overlapped
+    assert status["ready"] and warmup.ready and sorted(loading) == ["small", "tiny"]
+    for model in models.values():
+        assert sorted(model.calls) == [(16000, None), (16000, None), (32000, "en"), (32000, "en")]
+    timing = status["models"]["small"]
+    assert timing["load_s"] >= 0.3 and set(timing["passes"]) == {"1s", "2s"}
+
+
+def test_failed_load_keeps_service_unready():
+    def load_model(name):
+        raise OSError("no such model")
+
+    warmup = ModelWarmup(load_model, ["tiny"])
+    warmup.start().join(timeout=5)
+    assert not warmup.ready and "no such model" in warmup.status()["error"]
+
+
+def test_synthetic_audio():
+    audio = synthetic_audio(1.5)
+    assert audio.dtype.name == "float32" and len(audio) == 24000 and 0 < abs(audio).max() < 1
@@ -0,0 +1,61 @@
+import asyncio
+import os
+
+from voice_router.assets import AudioAssetCache, send_asset
+
+
+def fake_decoder(calls):
+    def decode(path, sample_rate, channels, sample_width):
+        calls.append((path, sample_rate))
+        return b"\x01\x00" * sample_rate  # one second of audio
+    return decode
+
+
+def test_cache_hits_until_mtime_changes(tmp_path):
+    clip = tmp_path / "trigger.wav"
+    clip.write_bytes(b"RIFF")
+    calls = []
+    cache = AudioAssetCache(decoder=fake_decoder(calls))
+    first = cache.get(str(clip), 16000)
+    assert cache.get(str(clip), 16000) is first
+    assert len(calls) == 1
+
+    cache.get(str(clip), 8000)  # a different target format is a separate entry
+    assert len(calls) == 2
+
+    st = os.stat(clip)
+    os.utime(clip, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(str(clip), 16000) is not first
+    assert len(calls) == 3
+
+
+def test_preload_tolerates_missing_files(tmp_path):
+    calls = []
+    cache = AudioAssetCache(decoder=fake_decoder(calls))
+    cache.preload(str(tmp_path / "missing.wav"))
+    assert calls == []
+
+
+def test_send_asset_blob_or_realtime_chunks(tmp_path):
+    clip = tmp_path / "trigger.wav"
+    clip.write_bytes(b"RIFF")
+    asset = AudioAssetCache(decoder=fake_decoder([])).get(str(clip), 16000)
+    assert asset.duration_s == 1.0
+
+    sent, times = [], []
+
+    async def send(pcm):
+        sent.append(pcm)
+        times.append(asyncio.get_running_loop().time())
+
+    assert asyncio.run(send_asset(send, asset)) == 1
+    assert sent == [asset.pcm]
+
+    sent.clear()
+    times.clear()
+    assert asyncio.run(send_asset(send, asset, chunk_ms=100)) == 10
+    assert all(len(c) == 3200 for c in sent)
+    assert b"".join(sent) == asset.pcm
+    # Paced in real time: piece i leaves ~i*100ms after the first, without drift
+    offsets = [t - times[0] for t in times]
+    assert all(i * 0.1 - 0.001 <= offset < i * 0.1 + 0.05 for i, offset in enumerate(offsets))
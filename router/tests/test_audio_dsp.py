@@ -0,0 +1,63 @@
+import audioop
+
+import numpy as np
+import pytest
+
+from asr import audio_dsp
+from asr.audio_convert import Pcm24kToUlaw8k, UlawToPcm16k
+
+ALL_PCM = np.arange(-32768, 32768, dtype=np.int16)
+ALL_CODES = np.arange(256, dtype=np.uint8)
+
+
+def test_ulaw_tables_match_audioop():
+    assert audio_dsp.ulaw_encode(ALL_PCM).tobytes() == audioop.lin2ulaw(ALL_PCM.tobytes(), 2)
+    assert audio_dsp.ulaw_decode(ALL_CODES).tobytes() == audioop.ulaw2lin(ALL_CODES.tobytes(), 2)
+
+
+def test_alaw_tables_match_audioop():
+    assert audio_dsp.alaw_encode(ALL_PCM).tobytes() == audioop.lin2alaw(ALL_PCM.tobytes(), 2)
+    assert audio_dsp.alaw_decode(ALL_CODES).tobytes() == audioop.alaw2lin(ALL_CODES.tobytes(), 2)
+
+
+def test_codecs_write_into_preallocated_buffers():
+    frame = (np.sin(np.arange(160) / 5) * 8000).astype(np.int16)
+    codes = np.empty(160, dtype=np.uint8)
+    pcm = np.empty(160, dtype=np.int16)
+    assert audio_dsp.ulaw_encode(frame, out=codes) is codes
+    assert audio_dsp.ulaw_decode(codes, out=pcm) is pcm
+    assert np.max(np.abs(pcm.astype(int) - frame)) < 300
+
+
+def test_mixer_saturates_and_pads():
+    mixer = audio_dsp.FrameMixer(4)
+    out = np.empty(4, dtype=np.int16)
+    mixer.mix(np.array([30000, -30000, 100, 7], dtype=np.int16), np.array([30000, -30000], dtype=np.int16), out)
+    assert out.tolist() == [32767, -32768, 100, 7]
+    mixer.gain(np.array([1000, -1000, 3, 0], dtype=np.int16), 0.5, out)
+    assert out.tolist() == [500, -500, 2, 0]
+
+
+@pytest.mark.parametrize("in_rate,out_rate", [(8000, 16000), (24000, 8000), (16000, 24000)])
+def test_polyphase_process_into_streams_continuously(in_rate, out_rate):
+    rng = np.random.default_rng(1)
+    pcm = (rng.standard_normal(in_rate // 2) * 4000).astype(np.int16)
+    one_shot = np.frombuffer(audio_dsp.PolyphaseResampler(in_rate, out_rate).process(pcm.tobytes()), dtype=np.int16)
+
+    r = audio_dsp.PolyphaseResampler(in_rate, out_rate, max_chunk=480)
+    out = np.empty(r.max_output(480), dtype=np.int16)
+    pieces = []
+    for i in range(0, len(pcm), 480):
+        n = r.process_into(pcm[i:i + 480], out)
+        pieces.append(out[:n].copy())
+    chunked = np.concatenate(pieces)
+    assert len(chunked) == len(one_shot)
+    assert np.max(np.abs(chunked.astype(int) - one_shot)) <= 1
+
+
+def test_stream_converters_round_trip_rates():
+    ulaw = audioop.lin2ulaw((np.ones(160, dtype=np.int16) * 1000).tobytes(), 2)
+    up = UlawToPcm16k()
+    assert len(up.process(ulaw)) == 320 * 2
+    down = Pcm24kToUlaw8k()
+    assert len(down.process(b"\x00\x00" * 480)) == 160
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from voice_router.audio_queue import DROP_NEWEST, DROP_OLDEST, AudioQueue
+
+
+def test_drop_oldest_keeps_freshest_audio_within_capacity():
+    q = AudioQueue(max_bytes=10, policy=DROP_OLDEST)
+    for chunk in (b"aaaa", b"bbbb", b"cccc"):
+        assert q.put_nowait(chunk)
+    assert q.nbytes == 8
+    assert [q.get_nowait(), q.get_nowait()] == [b"bbbb", b"cccc"]
+    assert q.stats()["dropped_chunks"] == 1
+    assert q.stats()["high_water_bytes"] == 8
+
+
+def test_drop_newest_rejects_incoming_audio():
+    q = AudioQueue(max_bytes=10, policy=DROP_NEWEST)
+    assert q.put_nowait(b"aaaa") and q.put_nowait(b"bbbb")
+    assert not q.put_nowait(b"cccc")
+    assert q.get_nowait() == b"aaaa"
+    assert q.stats()["dropped_bytes"] == 4
+
+
+def test_put_never_blocks_the_producer_when_full():
+    async def scenario():
+        q = AudioQueue(max_bytes=4, policy=DROP_NEWEST)
+        for _ in range(1000):
+            await asyncio.wait_for(q.put(b"xxxx"), timeout=0.1)
+        return q
+    q = asyncio.run(scenario())
+    assert q.qsize() == 1
+    assert q.dropped_chunks == 999
+
+
+def test_flush_empties_in_one_step_and_bumps_generation():
+    q = AudioQueue(max_bytes=1000)
+    for _ in range(50):
+        q.put_nowait(b"12345678")
+    generation = q.generation
+    assert q.flush() == 400
+    assert q.empty() and q.nbytes == 0
+    assert q.generation == generation + 1
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+    assert q.stats()["flushed_bytes"] == 400
+
+
+def test_get_waits_for_data():
+    async def scenario():
+        q = AudioQueue(max_bytes=100)
+        getter = asyncio.ensure_future(q.get())
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+        q.put_nowait(b"hi")
+        return await asyncio.wait_for(getter, timeout=1)
+    assert asyncio.run(scenario()) == b"hi"
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        AudioQueue(10, policy="drop_random")
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+
+from voice_router.background import BackgroundBank
+
+
+def make_source(tmp_path, n_samples=800):
+    src = tmp_path / "bg.mp3"
+    src.write_bytes(b"not really an mp3")
+    pcm = (np.arange(n_samples) % 200 * 100 - 10000).astype(np.int16).tobytes()
+    calls = []
+
+    def decoder(path):
+        calls.append(path)
+        return pcm
+    return src, pcm, decoder, calls
+
+
+def test_decoded_once_and_shared_between_loads(tmp_path):
+    src, pcm, decoder, calls = make_source(tmp_path)
+    cache = tmp_path / "cache"
+    first = BackgroundBank(str(src), cache_dir=str(cache), decoder=decoder).load()
+    second = BackgroundBank(str(src), cache_dir=str(cache), decoder=decoder).load()
+    assert len(calls) == 1
+    assert isinstance(second.variants["idle"], np.memmap)
+    assert first.frame("raw", 0).tobytes() == pcm[:320]
+
+
+def test_variants_are_prescaled_and_frames_wrap(tmp_path):
+    src, pcm, decoder, _ = make_source(tmp_path, n_samples=810)  # 5 whole frames + a partial
+    bank = BackgroundBank(str(src), cache_dir=str(tmp_path / "cache"), decoder=decoder).load()
+    assert bank.n_frames == 5
+    raw = np.frombuffer(pcm, dtype=np.int16)[:160]
+    assert np.array_equal(bank.frame("idle", 0), np.rint(raw * 0.5).astype(np.int16))
+    cursor = bank.cursor()
+    frames = [cursor.next("raw").tobytes() for _ in range(6)]
+    assert frames[5] == frames[0]
+    assert cursor.index == 1
+
+
+def test_changed_source_invalidates_cache(tmp_path):
+    src, _, decoder, calls = make_source(tmp_path)
+    cache = tmp_path / "cache"
+    BackgroundBank(str(src), cache_dir=str(cache), decoder=decoder).load()
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    BackgroundBank(str(src), cache_dir=str(cache), decoder=decoder).load()
+    assert len(calls) == 2
+    assert len(os.listdir(cache)) == 3
+
+
+def test_rebuild_keeps_other_sources_caches(tmp_path):
+    src, _, decoder, calls = make_source(tmp_path)
+    other = tmp_path / "bg-2.mp3"
+    other.write_bytes(b"another track")
+    cache = tmp_path / "cache"
+    BackgroundBank(str(other), cache_dir=str(cache), decoder=decoder).load()
+    BackgroundBank(str(src), cache_dir=str(cache), decoder=decoder).load()
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    BackgroundBank(str(src), cache_dir=str(cache), decoder=decoder).load()
+    names = os.listdir(cache)
+    assert len(names) == 6 and sum(n.startswith("bg-2-") for n in names) == 3
+    BackgroundBank(str(other), cache_dir=str(cache), decoder=decoder).load()
+    assert len(calls) == 3  # bg-2's cache survived bg's rebuild
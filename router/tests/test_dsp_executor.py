@@ -0,0 +1,116 @@
+import asyncio
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from voice_router.dsp_executor import MODES, DspExecutor, MixFrame, mix_batch
+from voice_router.playout import PlayoutEngine
+
+
+def frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    speech = rng.integers(-30000, 30000, (n, 160), dtype=np.int16)
+    speech[1:2] = 0
+    beds = rng.integers(-8000, 8000, (n, 160), dtype=np.int16)
+    return speech, beds
+
+
+def test_mix_batch_saturates_and_flags_silent_rows():
+    speech, beds = frames(8)
+    out = np.empty_like(speech)
+    silent = mix_batch(speech, beds, out)
+    expected = np.clip(speech.astype(np.int32) + beds, -32768, 32767)
+    np.testing.assert_array_equal(out, expected)
+    assert silent.tolist() == [i == 1 for i in range(8)]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_modes_agree(mode):
+    speech, beds = frames(600, seed=3)
+    silent_rows = []
+    batch = [MixFrame(s.tobytes(), b, lambda i=i: silent_rows.append(i)) for i, (s, b) in enumerate(zip(speech, beds))]
+    executor = DspExecutor(mode, workers=2, min_split=100)
+
+    async def scenario():
+        await executor.start()
+        return await executor.mix(batch)
+
+    try:
+        out = asyncio.run(scenario())
+    finally:
+        executor.close()
+    expected = np.empty_like(speech)
+    mix_batch(speech, beds, expected)
+    assert out == [row.tobytes() for row in expected]
+    assert silent_rows == [1]
+    assert executor.stats()["frames"] == 600 and executor.stats()["fallbacks"] == 0
+
+
+def test_process_mode_survives_dead_and_stalled_workers():
+    speech, beds = frames(50, seed=5)
+    batch = [MixFrame(s.tobytes(), b) for s, b in zip(speech, beds)]
+    expected = np.empty_like(speech)
+    mix_batch(speech, beds, expected)
+    expected = [row.tobytes() for row in expected]
+    executor = DspExecutor("process", workers=1, deadline_ms=20)
+
+    async def scenario():
+        await executor.start()
+        assert await executor.mix(batch) == expected
+        pool = executor._procs
+        worker = pool.procs[0]
+        worker.kill()
+        worker.join(timeout=5)
+        # Dead worker: mixed inline, no error, and a replacement is started
+        assert await executor.mix(batch) == expected
+        await asyncio.sleep(0.05)
+        assert pool.procs[0] is not worker
+        await executor.start()
+        assert await executor.mix(batch) == expected
+
+        os.kill(pool.procs[0].pid, signal.SIGSTOP)
+        try:
+            started = asyncio.get_running_loop().time()
+            # Stalled worker: the tick waits one deadline, then mixes inline
+            assert await executor.mix(batch) == expected
+            assert asyncio.get_running_loop().time() - started < 0.5
+        finally:
+            os.kill(pool.procs[0].pid, signal.SIGCONT)
+        await asyncio.sleep(0.1)
+        return len(pool.free)
+
+    try:
+        free = asyncio.run(scenario())
+        stats = executor.stats()
+    finally:
+        executor.close()
+    assert stats["restarts"] == 1 and stats["timeouts"] == 1 and stats["fallbacks"] == 2
+    assert free == 4  # the timed-out slot came back once the worker answered
+
+
+def test_engine_sends_mixed_frames_off_loop():
+    speech, beds = frames(1)
+    executor = DspExecutor("thread")
+
+    async def scenario():
+        engine = PlayoutEngine(frame_ms=20, dsp=executor)
+        sent = []
+
+        async def send(frame):
+            sent.append(frame)
+
+        engine.register("call", lambda: MixFrame(speech[0].tobytes(), beds[0]), send)
+        engine.register("plain", lambda: b"raw", send)
+        await asyncio.sleep(0.07)
+        await engine.stop()
+        return sent
+
+    try:
+        sent = asyncio.run(scenario())
+    finally:
+        executor.close()
+    expected = np.empty_like(speech)
+    mix_batch(speech, beds, expected)
+    assert b"raw" in sent and expected[0].tobytes() in sent
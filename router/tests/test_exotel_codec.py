@@ -0,0 +1,73 @@
+import base64
+import json
+
+import pytest
+
+from voice_router import exotel_codec
+from voice_router.exotel_codec import MediaDecoder, MediaEncoder
+
+FRAME = bytes(range(256)) + bytes(64)
+
+
+def legacy_message(stream_sid, frame):
+    return {"event": "media", "stream_sid": stream_sid, "media": {"payload": base64.b64encode(frame).decode()}}
+
+
+@pytest.mark.parametrize("backend", [b for b in exotel_codec.BACKENDS if b != "orjson" or exotel_codec.orjson])
+def test_encoders_match_send_json_payload(backend):
+    encoder = MediaEncoder('sid-"quoted"', backend=backend)
+    assert json.loads(encoder.encode(FRAME)) == legacy_message('sid-"quoted"', FRAME)
+    assert json.loads(bytes(encoder.encode_bytes(FRAME))) == legacy_message('sid-"quoted"', FRAME)
+
+
+def test_encode_bytes_reuses_buffer_and_handles_size_changes():
+    encoder = MediaEncoder("abc")
+    first = encoder.encode_bytes(FRAME)
+    second = encoder.encode_bytes(FRAME[::-1])
+    assert first.obj is second.obj
+    short = bytes(encoder.encode_bytes(b"\x01\x02\x03\x04"))
+    assert json.loads(short) == legacy_message("abc", b"\x01\x02\x03\x04")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        MediaEncoder("abc", backend="msgpack")
+
+
+DECODER_BACKENDS = [b for b in exotel_codec.DECODER_BACKENDS
+                    if (b != "orjson" or exotel_codec.orjson) and (b != "simdjson" or exotel_codec.simdjson)]
+
+
+@pytest.mark.parametrize("backend", DECODER_BACKENDS)
+def test_decoders_agree_with_full_parse(backend):
+    decoder = MediaDecoder(backend)
+    media = json.dumps({"event": "media", "sequence_number": "3", "stream_sid": "abc",
+                        "media": {"chunk": "2", "timestamp": "40", "payload": base64.b64encode(FRAME).decode()}})
+    assert decoder.decode(media) == ("media", FRAME, None)
+    # Spacing and key order vary between senders
+    spaced = '{ "stream_sid" : "abc", "media" : { "payload" : "%s" }, "event" : "media" }' % base64.b64encode(FRAME).decode()
+    assert decoder.decode(spaced) == ("media", FRAME, None)
+    start = {"event": "start", "start": {"stream_sid": "abc", "media_format": {"sample_rate": "8000"}}}
+    assert decoder.decode(json.dumps(start)) == ("start", None, start)
+    assert decoder.decode('{"event":"stop","stream_sid":"abc"}') == ("stop", None, {"event": "stop", "stream_sid": "abc"})
+
+
+def test_fast_decoder_parses_only_control_events():
+    decoder = MediaDecoder("fast")
+    media = MediaEncoder("abc").encode(FRAME)
+    for _ in range(5):
+        assert decoder.decode(media)[1] == FRAME
+    decoder.decode('{"event":"dtmf","dtmf":{"digit":"5"}}')
+    # Minimal media events (no sid or sequence numbers) still take the fast path
+    assert decoder.decode('{"event":"media","media":{"payload":"%s"}}' % base64.b64encode(b"ok").decode())[1] == b"ok"
+    assert decoder.stats() == {"backend": "fast", "fast_hits": 6, "full_parses": 1}
+
+
+def test_fast_decoder_falls_back_on_unusual_media():
+    decoder = MediaDecoder("fast")
+    payload = base64.b64encode(b"ok").decode()
+    # Escaped event name, no "event" key at all, a null payload next to a string one
+    assert decoder.decode('{"event":"\\u006dedia","media":{"payload":"%s"}}' % payload)[1] == b"ok"
+    assert decoder.decode('{"media":{"payload":"%s"}}' % payload) == (None, None, {"media": {"payload": payload}})
+    assert decoder.decode('{"event":"media","media":{"payload":  "%s"}}' % payload)[1] == b"ok"
+    assert decoder.stats()["fast_hits"] == 0 and decoder.stats()["full_parses"] == 3
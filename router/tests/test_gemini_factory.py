@@ -0,0 +1,93 @@
+import asyncio
+import contextlib
+import itertools
+
+from voice_router.gemini import GeminiSessionFactory
+
+
+class FakeLive:
+    """Stand-in for `client.aio.live`: each connect yields a numbered session."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.counter = itertools.count()
+        self.open = set()
+        self.configs = []
+
+    @contextlib.asynccontextmanager
+    async def connect(self, model, config):
+        await asyncio.sleep(self.delay)
+        self.configs.append(config)
+        session = f"session-{next(self.counter)}"
+        self.open.add(session)
+        try:
+            yield session
+        finally:
+            self.open.discard(session)
+
+
+class FakeClient:
+    def __init__(self, live):
+        self.aio = type("Aio", (), {"live": live})()
+
+
+def make_factory(live, **kwargs):
+    clients = []
+
+    def client_factory():
+        clients.append(FakeClient(live))
+        return clients[-1]
+    return GeminiSessionFactory(model="m", config={"cfg": 1}, client_factory=client_factory, **kwargs), clients
+
+
+def test_one_client_and_config_shared_across_calls():
+    live = FakeLive()
+    factory, clients = make_factory(live)
+
+    async def scenario():
+        for _ in range(3):
+            async with factory.connect() as session:
+                assert session in live.open
+    asyncio.run(scenario())
+    assert len(clients) == 1
+    assert all(c is live.configs[0] for c in live.configs)
+    assert live.open == set()
+    assert factory.stats["cold_connects"] == 3
+
+
+def test_prewarmed_session_skips_connect_latency():
+    live = FakeLive(delay=0.05)
+    factory, _ = make_factory(live, pool_size=1)
+
+    async def scenario():
+        await factory.start()
+        await asyncio.sleep(0.1)
+        assert factory.pooled == 1
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with factory.connect() as session:
+            elapsed = loop.time() - start
+            assert session == "session-0"
+        await asyncio.sleep(0.1)  # pool refills in the background
+        assert factory.pooled == 1
+        await factory.close()
+        return elapsed
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 0.02
+    assert factory.stats["warm_hits"] == 1
+    assert live.open == set()
+
+
+def test_stale_pooled_session_is_not_handed_out():
+    live = FakeLive()
+    factory, _ = make_factory(live, pool_size=1, max_idle_s=0.0)
+
+    async def scenario():
+        await factory.start()
+        await asyncio.sleep(0.01)
+        async with factory.connect() as session:
+            fresh = session
+        await factory.close()
+        return fresh
+    assert asyncio.run(scenario()) != "session-0"
+    assert factory.stats["expired"] >= 1
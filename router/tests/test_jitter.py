@@ -0,0 +1,76 @@
+from voice_router.jitter import JitterBuffer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def ramp(n_samples, start=0):
+    return b"".join(((start + i) % 30000).to_bytes(2, "little") for i in range(n_samples))
+
+
+def test_holds_for_target_then_plays_sample_accurate_frames():
+    clock = FakeClock()
+    jb = JitterBuffer(initial_ms=40, clock=clock)
+    # Chunks that do not divide into 20ms frames: 250 + 230 samples
+    assert jb.push(ramp(250), arrival=clock.now) and jb.push(ramp(230, 250), arrival=clock.now)
+    assert jb.pop() is None and jb.active
+    clock.now += 0.05
+    frames = [jb.pop(), jb.pop(), jb.pop()]
+    assert frames == [ramp(160), ramp(160, 160), ramp(160, 320)]
+    assert jb.pop() is None and jb.stats()["underruns"] == 1
+
+    # End of turn plays the remainder, padded to a whole frame
+    jb.push(ramp(100, 480), arrival=clock.now)
+    jb.end_turn()
+    assert jb.pop() == ramp(100, 480) + bytes(120)
+    assert jb.pop() is None and not jb.active
+    assert jb.stats()["padded_frames"] == 1
+
+
+def test_target_learns_lateness_and_decays():
+    clock = FakeClock()
+    jb = JitterBuffer(initial_ms=0, max_ms=200, decay=0.5, clock=clock)
+    jb.push(ramp(800), arrival=clock.now)  # 100ms of audio
+    clock.now += 0.25  # next chunk due at +100ms arrives 150ms late
+    jb.push(ramp(800), arrival=clock.now)
+    assert jb.stats()["max_lateness_ms"] == 150 and jb.target_ms == 150
+    jb.end_turn()
+    while jb.pop() is not None:
+        pass
+    # A clean spurt halves the target, never below what it needs
+    jb.push(ramp(800), arrival=clock.now)
+    jb.end_turn()
+    while jb.pop() is not None:
+        pass
+    assert jb.target_ms == 75
+
+    # Bounded by max_ms
+    jb.push(ramp(160), arrival=clock.now)
+    clock.now += 5
+    jb.push(ramp(160), arrival=clock.now)
+    assert jb.target_ms == 200
+
+
+def test_clear_overrun_and_stamps():
+    clock = FakeClock()
+    jb = JitterBuffer(initial_ms=0, capacity_ms=60, clock=clock)
+    assert jb.push(ramp(320), arrival=1.0) and jb.push(ramp(160), arrival=2.0)
+    assert not jb.push(ramp(160), arrival=3.0)
+    assert jb.stats()["overruns"] == 1 and jb.stats()["dropped_ms"] == 20
+    jb.pop()
+    assert jb.last_stamp == 1.0
+    jb.pop()
+    assert jb.last_stamp == 1.0
+    jb.pop()
+    assert jb.last_stamp == 2.0
+
+    jb.push(ramp(480), arrival=4.0)
+    jb.clear()
+    assert jb.pop() is None and not jb.active
+    jb.push(ramp(160), arrival=5.0)
+    assert jb.pop() == ramp(160) and jb.last_stamp == 5.0
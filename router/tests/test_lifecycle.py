@@ -0,0 +1,47 @@
+from voice_router.lifecycle import CallLifecycle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ready_only_after_startup_and_until_drain():
+    lifecycle = CallLifecycle()
+    assert not lifecycle.status()["ready"]
+    lifecycle.mark_ready()
+    assert lifecycle.status()["ready"]
+    lifecycle.start_drain()
+    status = lifecycle.status()
+    assert not status["ready"] and status["draining"]
+
+
+def test_drain_refuses_new_calls_and_waits_for_in_flight():
+    clock = FakeClock()
+    lifecycle = CallLifecycle(clock=clock)
+    lifecycle.mark_ready()
+    assert lifecycle.call_started() and lifecycle.call_started()
+    assert not lifecycle.drained()
+    lifecycle.start_drain()
+    assert not lifecycle.call_started()
+    assert lifecycle.status()["refused_calls"] == 1
+    lifecycle.call_finished()
+    assert not lifecycle.drained(timeout_s=30)
+    lifecycle.call_finished()
+    assert lifecycle.drained(timeout_s=30)
+    assert lifecycle.status()["active_calls"] == 0 and lifecycle.status()["total_calls"] == 2
+
+
+def test_drain_gives_up_after_timeout():
+    clock = FakeClock()
+    lifecycle = CallLifecycle(clock=clock)
+    lifecycle.call_started()
+    lifecycle.start_drain()
+    clock.now = 29.9
+    assert not lifecycle.drained(timeout_s=30)
+    clock.now = 30.0
+    assert lifecycle.drained(timeout_s=30)
+    assert not lifecycle.drained()
@@ -0,0 +1,77 @@
+import io
+import json
+import logging
+import queue
+
+from voice_router.logging_setup import (
+    CallContextFilter,
+    CallLogger,
+    DroppingQueueHandler,
+    JsonLinesFormatter,
+    RateLimitFilter,
+    setup_logging,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_record(msg="hello", **extra):
+    record = logging.LogRecord("test", logging.WARNING, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(2))
+    for _ in range(5):
+        handler.handle(make_record())
+    assert (handler.enqueued, handler.dropped) == (2, 3)
+
+
+def test_rate_limit_is_per_key_and_call_and_reports_suppressed():
+    clock = FakeClock()
+    limiter = RateLimitFilter(interval_s=1.0, clock=clock)
+    assert limiter.filter(make_record(rate_key="silent", stream_sid="a"))
+    assert not limiter.filter(make_record(rate_key="silent", stream_sid="a"))
+    assert not limiter.filter(make_record(rate_key="silent", stream_sid="a"))
+    assert limiter.filter(make_record(rate_key="silent", stream_sid="b"))
+    assert limiter.filter(make_record())
+    clock.now = 1.5
+    record = make_record(rate_key="silent", stream_sid="a")
+    assert limiter.filter(record)
+    assert record.getMessage() == "hello (+2 suppressed)"
+    assert limiter.suppressed == 2
+
+
+def test_call_logger_fields_reach_json_output():
+    out = io.StringIO()
+    handler = logging.StreamHandler(out)
+    handler.setFormatter(JsonLinesFormatter())
+    handler.addFilter(CallContextFilter())
+    base = logging.getLogger("test_call_logger")
+    base.addHandler(handler)
+    base.propagate = False
+    log = CallLogger(base).bind(stream_sid="sid-1")
+    log.bind(turn_id=3)
+    log.warning("turn %d done", 3, extra={"rate_key": "x"})
+    entry = json.loads(out.getvalue())
+    assert entry["msg"] == "turn 3 done"
+    assert (entry["stream_sid"], entry["turn_id"], entry["level"]) == ("sid-1", 3, "WARNING")
+
+
+def test_setup_logging_writes_through_listener(tmp_path):
+    runtime = setup_logging(log_dir=str(tmp_path), level="INFO", fmt="text", stream=None)
+    try:
+        CallLogger(logging.getLogger("pipeline"), stream_sid="abcdef123456").info("🎬 started")
+    finally:
+        runtime.stop()
+        logging.getLogger().removeHandler(runtime.handler)
+    with open(runtime.log_file) as f:
+        assert "[abcdef12] 🎬 started" in f.read()
+    assert runtime.stats()["enqueued"] >= 1
@@ -0,0 +1,39 @@
+from prometheus_client import CollectorRegistry, generate_latest
+
+from voice_router.audio_queue import AudioQueue
+from voice_router.metrics import Histogram, VoiceRouterMetrics
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    h = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        h.observe(value)
+    assert h.cumulative_buckets() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert h.count == 4 and abs(h.sum - 2.65) < 1e-9
+
+
+def test_exposition_includes_stage_histograms_and_queue_depth():
+    metrics = VoiceRouterMetrics()
+    registry = CollectorRegistry()
+    registry.register(metrics)
+    metrics.active_calls.inc()
+    metrics.frames_out.inc(3)
+    metrics.encode.observe(2e-6)
+    queue = AudioQueue(1000, name="out")
+    metrics.track_queue(queue)
+    queue.put_nowait(b"\x00" * 320)
+
+    text = generate_latest(registry).decode()
+    assert "voice_router_active_calls 1.0" in text
+    assert 'voice_router_frames_total{direction="out"} 3.0' in text
+    assert 'voice_router_stage_seconds_bucket{le="2.5e-06",stage="encode"} 1.0' in text
+    assert 'voice_router_queue_bytes{queue="out"} 320.0' in text
+
+
+def test_queue_drops_fold_into_counter():
+    metrics = VoiceRouterMetrics()
+    queue = AudioQueue(100, policy="drop_newest", name="in")
+    queue.put_nowait(b"\x00" * 80)
+    queue.put_nowait(b"\x00" * 80)
+    metrics.record_queue_drops(queue)
+    assert metrics.queue_dropped_bytes.labels("in").value == 80
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import base64
+import json
+
+import numpy as np
+import pytest
+
+import load_test
+from mock_gemini_server import MockLiveServer, MockTurn
+
+LOUD = (np.sin(np.arange(1600) / 3) * 8000).astype(np.int16).tobytes()  # 100ms at 16kHz
+QUIET = bytes(3200)
+
+
+async def talk_to_mock(server, packets, stop_after_turn=True):
+    genai_types = pytest.importorskip("google.genai.types")
+    from voice_router.gemini import default_client_factory
+
+    async with server.serve("localhost", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        client = default_client_factory(base_url=f"ws://localhost:{port}")
+        config = genai_types.LiveConnectConfig(response_modalities=["AUDIO"])
+        async with client.aio.live.connect(model="mock", config=config) as session:
+            for pcm in packets:
+                await session.send_realtime_input(audio=genai_types.Blob(data=pcm, mime_type="audio/pcm;rate=16000"))
+            responses = []
+            async for response in session.receive():
+                responses.append(response)
+                if response.server_content and response.server_content.interrupted:
+                    break
+            return responses
+
+
+def test_sdk_receives_scripted_turn_with_usage(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "mock")
+    server = MockLiveServer([MockTurn(latency_ms=50, audio_ms=200)], pace=0, end_silence_ms=100)
+    responses = asyncio.run(talk_to_mock(server, [LOUD] * 3 + [QUIET] * 2))
+    audio = b"".join(r.data for r in responses if r.data)
+    assert len(audio) == 24000 * 2 * 200 // 1000
+    assert responses[-1].server_content.turn_complete
+    assert responses[-1].usage_metadata.response_token_count == 5
+
+
+def test_scripted_interruption(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "mock")
+    server = MockLiveServer([MockTurn(latency_ms=0, audio_ms=1000, interrupt_after_ms=120)], pace=0, end_silence_ms=100)
+    responses = asyncio.run(talk_to_mock(server, [LOUD, QUIET, QUIET]))
+    assert responses[-1].server_content.interrupted
+    assert sum(1 for r in responses if r.data) == 3  # 40ms chunks until 120ms
+    assert server.stats["interruptions"] == 1
+
+
+def test_load_generator_against_fake_router():
+    from websockets.asyncio.server import serve
+
+    reply = base64.b64encode((np.ones(160) * 5000).astype(np.int16).tobytes()).decode()
+
+    async def fake_router(ws):
+        async for raw in ws:
+            if json.loads(raw)["event"] == "media":
+                await ws.send(json.dumps({"event": "media", "media": {"payload": reply}}))
+
+    async def scenario():
+        async with serve(fake_router, "localhost", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            args = argparse.Namespace(url=f"ws://localhost:{port}", metrics_url=None, calls=2, ramp_s=0,
+                                      duration_s=0.4, talk_s=0.1, pause_s=0.1, audio=None,
+                                      connect_timeout_s=5, seed=1)
+            return await load_test.main_async(args)
+
+    results, wall, before, after = asyncio.run(scenario())
+    assert [r.error for r in results] == [None, None]
+    for r in results:
+        assert r.frames >= 15 and r.first_audio_ms is not None and r.response_ms
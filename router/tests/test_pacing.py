@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from voice_router.pacing import FrameClock
+
+
+class FakeTime:
+    """Manual clock; `sleep` advances time by the requested delay plus `overshoot`."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.overshoot = 0.0
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay + self.overshoot
+
+
+def run_frames(clock, fake, n, work=0.0):
+    async def loop():
+        sent = []
+        for _ in range(n):
+            await clock.wait()
+            sent.append(fake.now)
+            fake.now += work  # time spent resampling/mixing/sending
+        return sent
+    return asyncio.run(loop())
+
+
+def test_cadence_ignores_per_frame_work():
+    fake = FakeTime()
+    clock = FrameClock(frame_ms=20, clock=fake.clock, sleep=fake.sleep)
+    sent = run_frames(clock, fake, 50, work=0.007)
+    # 50 frames span exactly 49 slots, unlike sleep(0.02) which drifts by 7ms per frame
+    assert abs((sent[-1] - sent[0]) - 49 * 0.02) < 1e-9
+    assert clock.stats.late_frames == 0
+
+
+def test_small_lag_is_caught_up_without_skipping():
+    fake = FakeTime()
+    clock = FrameClock(frame_ms=20, max_lag_frames=5, clock=fake.clock, sleep=fake.sleep)
+    run_frames(clock, fake, 1)
+    fake.now += 0.05  # stall for 2.5 frames
+    sent = run_frames(clock, fake, 4)
+    assert clock.stats.skipped_frames == 0
+    # Late frames go out back-to-back until the grid is caught up
+    assert sent[0] == sent[1]
+    assert sent[3] - sent[2] == pytest.approx(0.02)
+    assert clock.stats.late_frames == 2
+
+
+def test_large_lag_skips_missed_slots():
+    fake = FakeTime()
+    clock = FrameClock(frame_ms=20, max_lag_frames=5, clock=fake.clock, sleep=fake.sleep)
+    run_frames(clock, fake, 1)
+    fake.now += 0.5  # 25 frames behind
+    run_frames(clock, fake, 1)
+    assert clock.stats.skipped_frames == 24
+    # Next frame is paced normally again
+    before = fake.now
+    run_frames(clock, fake, 1)
+    assert 0 < fake.now - before <= 0.02
+
+
+def test_jitter_stats_track_sleep_overshoot():
+    fake = FakeTime()
+    fake.overshoot = 0.002
+    clock = FrameClock(frame_ms=20, clock=fake.clock, sleep=fake.sleep)
+    run_frames(clock, fake, 10)
+    stats = clock.stats.as_dict()
+    assert stats["frames"] == 10
+    assert 1.5 < stats["jitter_max_ms"] <= 2.0
+    assert stats["late_frames"] == 0
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from voice_router.playout import PlayoutEngine
+
+
+def test_single_tick_serves_every_call():
+    async def scenario():
+        engine = PlayoutEngine(frame_ms=20)
+        received = {i: [] for i in range(3)}
+        sessions = []
+        for i in range(3):
+            async def send(frame, i=i):
+                received[i].append(frame)
+            sessions.append(engine.register(f"call-{i}", lambda i=i: bytes([i]) * 4, send))
+        await asyncio.sleep(0.11)
+        await engine.stop()
+        return received, sessions
+
+    received, sessions = asyncio.run(scenario())
+    counts = [len(v) for v in received.values()]
+    assert min(counts) >= 4 and max(counts) - min(counts) <= 1
+    assert received[2][0] == b"\x02" * 4
+    assert all(s.closed for s in sessions)
+
+
+def test_slow_send_is_skipped_not_queued():
+    async def scenario():
+        engine = PlayoutEngine(frame_ms=20)
+        release = asyncio.Event()
+        fast_frames = []
+
+        async def slow_send(frame):
+            await release.wait()
+
+        async def fast_send(frame):
+            fast_frames.append(frame)
+
+        # Registered first, so the slow call's send starts ahead of the fast one's every tick
+        slow = engine.register("slow", lambda: b"s", slow_send)
+        fast = engine.register("fast", lambda: b"f", fast_send)
+        await asyncio.sleep(0.1)
+        release.set()
+        await engine.stop()
+        return slow, fast, fast_frames
+
+    slow, fast, fast_frames = asyncio.run(scenario())
+    assert len(fast_frames) >= 4 and fast.busy_ticks == 0
+    assert slow.frames_sent == 1
+    assert slow.busy_ticks >= 3
+
+
+def test_closed_session_is_dropped_on_next_tick():
+    async def scenario():
+        engine = PlayoutEngine(frame_ms=20)
+        sent = []
+
+        async def send(frame):
+            sent.append(frame)
+
+        session = engine.register("call", lambda: b"x", send)
+        await asyncio.sleep(0.05)
+        session.close()
+        await asyncio.sleep(0.05)
+        return engine, session, len(sent)
+
+    engine, session, n = asyncio.run(scenario())
+    assert engine.sessions == []
+    assert session.frames_sent == n
+
+
+def test_each_session_keeps_its_own_pacing_stats():
+    async def scenario():
+        engine = PlayoutEngine(frame_ms=20)
+
+        async def send(frame):
+            pass
+
+        def late_frame():
+            time.sleep(0.008)  # holds up this tick past the 5ms late threshold
+            return b"l"
+
+        on_time = engine.register("on-time", lambda: b"o", send)
+        await asyncio.sleep(0.06)
+        late = engine.register("late", late_frame, send)
+        await asyncio.sleep(0.06)
+        await engine.stop()
+        return on_time, late
+
+    on_time, late = asyncio.run(scenario())
+    assert late.pacing.frames == late.frames_sent and late.pacing.late_frames == late.frames_sent
+    assert on_time.pacing.frames == on_time.frames_sent > late.frames_sent
+    assert 0 < on_time.pacing.late_frames < on_time.frames_sent
+    assert late.pacing.as_dict()["jitter_max_ms"] >= 8
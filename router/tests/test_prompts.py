@@ -0,0 +1,60 @@
+import pytest
+
+from voice_router.prompts import PromptLintError, PromptRegistry, lint_prompt
+from voice_router.usage import SessionUsage
+
+SECTION = """Persona & Style
+• Warm, encouraging, and conversational—imagine a caring astrologer.
+• Maintain a calm, reassuring tone throughout the whole conversation."""
+
+
+def test_shipped_prompts_are_clean():
+    registry = PromptRegistry().load()
+    prompt = registry.get("astrovoice")
+    assert prompt.id.startswith("astrovoice@")
+    assert lint_prompt(prompt.text) == []
+
+
+def test_lint_rejects_duplicated_sections():
+    problems = lint_prompt(f"You are AstroVoice.\n\n{SECTION}\n\n{SECTION}\n")
+    assert any("repeats heading" in p for p in problems)
+    assert any("repeats the body" in p for p in problems)
+
+
+def test_lint_rejects_repeated_long_lines_across_sections():
+    line = "• Keep each response short enough to fit comfortably in one breath."
+    problems = lint_prompt(f"A\n{line}\n\nB\n{line}\n")
+    assert any("duplicates line 2" in p for p in problems)
+
+
+def test_registry_versions_and_load_failure(tmp_path):
+    (tmp_path / "agent").mkdir()
+    (tmp_path / "agent" / "v2.md").write_text("Be brief.\n")
+    (tmp_path / "agent" / "v10.md").write_text("Be very brief.\n")
+    registry = PromptRegistry(str(tmp_path)).load()
+    assert registry.versions("agent") == ["v2", "v10"]
+    assert registry.get("agent").version == "v10"
+    assert registry.get("agent", "v2").text == "Be brief.\n"
+    with pytest.raises(KeyError):
+        registry.get("agent", "v3")
+
+    (tmp_path / "agent" / "v11.md").write_text(f"{SECTION}\n\n{SECTION}\n")
+    with pytest.raises(PromptLintError, match="agent@v11"):
+        PromptRegistry(str(tmp_path)).load()
+
+
+def test_session_usage_is_tagged_and_summed():
+    class Usage:
+        def __init__(self, prompt, response):
+            self.prompt_token_count = prompt
+            self.response_token_count = response
+            self.total_token_count = prompt + (response or 0)
+
+    totals = SessionUsage("astrovoice@v1")
+    totals.add(Usage(700, 50))
+    totals.add(Usage(120, None))
+    summary = totals.as_dict()
+    assert summary["prompt"] == "astrovoice@v1"
+    assert summary["input_tokens"] == 820
+    assert summary["output_tokens"] == 50
+    assert summary["reports"] == 2
@@ -0,0 +1,117 @@
+import asyncio
+import base64
+import json
+import os
+import socket
+
+import numpy as np
+
+from replay_call import replay, summarize
+from voice_router.recording import EVENT, GEMINI_AUDIO, INBOUND, OUTBOUND, CallRecorder, CaptureWriter, read_capture
+
+REPLY = (np.ones(160) * 5000).astype(np.int16).tobytes()
+BED = bytes(320)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def record_call(path):
+    clock = FakeClock()
+    writer = CaptureWriter()
+    recorder = CallRecorder(str(path), writer=writer, clock=clock, flush_bytes=512)
+    recorder.event("start", stream_sid="abc")
+    for i in range(5):
+        clock.now += 0.02
+        recorder.inbound(bytes([i]) * 320)
+    recorder.gemini_audio(b"\x01\x00" * 480)
+    clock.now += 0.05
+    recorder.outbound(BED)
+    recorder.outbound(REPLY)
+    recorder.event("turn_complete")
+    clock.now += 0.02
+    recorder.event("stop")
+    recorder.close()
+    writer.stop()
+    return recorder
+
+
+def test_capture_round_trip(tmp_path):
+    path = tmp_path / "call.vrcap"
+    recorder = record_call(path)
+    records = list(read_capture(path))
+    assert [k for _, k, _ in records] == [EVENT] + [INBOUND] * 5 + [GEMINI_AUDIO, OUTBOUND, OUTBOUND, EVENT, EVENT]
+    assert records[0] == (0.0, EVENT, {"event": "start", "stream_sid": "abc"})
+    assert records[3][2] == b"\x02" * 320
+    assert abs(records[7][0] - 0.15) < 1e-9
+    assert recorder.stats()["records"] == 11 and recorder.stats()["bytes"] == path.stat().st_size
+
+    # A capture cut off mid-record still reads up to the last whole record
+    path.write_bytes(path.read_bytes()[:-5])
+    assert len(list(read_capture(path))) == 10
+
+
+def test_capture_name_stays_inside_record_dir(tmp_path):
+    writer = CaptureWriter()
+    recorder = CallRecorder.for_call(str(tmp_path / "captures"), "../../etc/cron.d/x" + "y" * 100, writer=writer)
+    recorder.close()
+    writer.stop()
+    path = recorder.path
+    assert os.path.dirname(path) == str(tmp_path / "captures")
+    assert os.path.basename(path).startswith("______etc_cron_d_x" + "y" * 46 + "_")
+    assert os.path.exists(path)
+
+
+def test_summarize_reply_latency(tmp_path):
+    path = tmp_path / "call.vrcap"
+    record_call(path)
+    summary = summarize(read_capture(path))
+    assert summary["inbound"] == 5 and summary["gemini_chunks"] == 1 and summary["outbound"] == 2
+    assert len(summary["reply_ms"]) == 1 and abs(summary["reply_ms"][0] - 50) < 1e-6
+
+
+def test_replay_drives_router_and_gemini(tmp_path):
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+
+    path = tmp_path / "call.vrcap"
+    record_call(path)
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        gemini_port = s.getsockname()[1]
+
+    async def fake_router(exotel):
+        """Dials Gemini on call start and plays every Gemini chunk back as one reply frame."""
+        async for raw in exotel:
+            if json.loads(raw)["event"] == "start":
+                break
+        async with connect(f"ws://localhost:{gemini_port}") as gemini:
+            await gemini.send(json.dumps({"setup": {}}))
+            await gemini.recv()
+            await gemini.send(json.dumps({"realtimeInput": {"text": "hi"}}))
+
+            async def forward():
+                async for raw in gemini:
+                    if "modelTurn" in json.loads(raw)["serverContent"]:
+                        await exotel.send(json.dumps({"event": "media", "media": {"payload": base64.b64encode(REPLY).decode()}}))
+
+            task = asyncio.get_running_loop().create_task(forward())
+            async for raw in exotel:
+                if json.loads(raw)["event"] == "stop":
+                    break
+            task.cancel()
+
+    async def scenario():
+        async with serve(fake_router, "localhost", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            return await replay(list(read_capture(path)), f"ws://localhost:{port}", gemini_port, speed=0, tail_s=0.2)
+
+    observed, wall = asyncio.run(scenario())
+    summary = summarize(observed)
+    assert summary["inbound"] == 5 and summary["gemini_chunks"] == 1 and summary["outbound"] == 1
+    assert len(summary["reply_ms"]) == 1 and summary["reply_ms"][0] < 1000
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from voice_router.resample import BACKENDS, create_resampler
+
+
+def tone(rate, seconds=0.5, freq=440.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * freq * t) * 12000).astype(np.int16).tobytes()
+
+
+def stream(resampler, pcm, chunk_bytes):
+    return b"".join(resampler.process(pcm[i:i + chunk_bytes]) for i in range(0, len(pcm), chunk_bytes))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("in_rate,out_rate,chunk_bytes", [
+    (8000, 16000, 320),   # Exotel 20ms packet -> Gemini
+    (24000, 8000, 4802),  # odd-sized Gemini chunks -> Exotel
+])
+def test_streaming_matches_one_shot(backend, in_rate, out_rate, chunk_bytes):
+    if backend == "audioop":
+        pytest.importorskip("audioop")
+    pcm = tone(in_rate)
+    one_shot = np.frombuffer(create_resampler(in_rate, out_rate, backend).process(pcm), dtype=np.int16)
+    chunked = np.frombuffer(stream(create_resampler(in_rate, out_rate, backend), pcm, chunk_bytes), dtype=np.int16)
+    assert len(chunked) == len(one_shot)
+    assert np.max(np.abs(chunked.astype(int) - one_shot)) <= 1
+    assert len(one_shot) == pytest.approx(len(pcm) // 2 * out_rate / in_rate, abs=2)
+
+
+def test_stateless_chunks_are_discontinuous():
+    # The old per-packet ratecv(..., None) restarts the filter at each boundary
+    audioop = pytest.importorskip("audioop")
+    pcm = tone(8000)
+    one_shot = np.frombuffer(audioop.ratecv(pcm, 2, 1, 8000, 16000, None)[0], dtype=np.int16)
+    stateless = np.frombuffer(b"".join(
+        audioop.ratecv(pcm[i:i + 320], 2, 1, 8000, 16000, None)[0] for i in range(0, len(pcm), 320)
+    ), dtype=np.int16)
+    n = min(len(one_shot), len(stateless))
+    assert np.max(np.abs(stateless[:n].astype(int) - one_shot[:n])) > 1
+
+
+def test_polyphase_passes_band_and_rejects_alias():
+    r = create_resampler(24000, 8000, "numpy")
+    passband = np.frombuffer(r.process(tone(24000, freq=1000)), dtype=np.int16)[200:]
+    r.reset()
+    alias = np.frombuffer(r.process(tone(24000, freq=7000)), dtype=np.int16)[200:]
+    assert np.abs(passband).max() > 11000
+    assert np.abs(alias).max() < 300
+
+
+def test_integer_backend_rejects_fractional_ratio():
+    with pytest.raises(ValueError):
+        create_resampler(16000, 24000, "integer")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_resampler(8000, 16000, "sox")
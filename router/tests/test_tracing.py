@@ -0,0 +1,87 @@
+import json
+import logging
+
+from voice_router import tracing
+from voice_router.tracing import CallTracer, SpanExporter, read_stage_durations
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ListExporter:
+    def __init__(self):
+        self.turns = []
+
+    def export(self, turn):
+        self.turns.append(turn)
+
+
+def run_turn(tracer, clock, turn_id, t0):
+    tracer.uplink_packet(received=t0, dequeued=t0 + 0.001, resampled=t0 + 0.0015, loud=True)
+    tracer.uplink_packet(received=t0 + 0.02, dequeued=t0 + 0.021, resampled=t0 + 0.0215, loud=False)
+    clock.now = t0 + 0.03
+    tracer.uplink_sent()
+    tracer.response_audio(turn_id, stamp=t0 + 0.5)
+    clock.now = t0 + 0.52
+    tracer.response_dequeued(t0 + 0.4)  # some earlier chunk: ignored
+    tracer.response_dequeued(t0 + 0.5)
+    clock.now = t0 + 0.56
+    tracer.frame_sent()
+
+
+def test_turn_follows_last_loud_packet_through_every_stage(caplog):
+    clock = FakeClock()
+    exporter = ListExporter()
+    tracer = CallTracer("sid", exporter=exporter, clock=clock)
+    with caplog.at_level(logging.INFO, logger=tracing.__name__):
+        run_turn(tracer, clock, turn_id=1, t0=10.0)
+    [turn] = exporter.turns
+    stages = {k: round(v * 1000, 3) for k, v in turn.stages().items()}
+    assert stages == {"in_queue": 1.0, "resample_in": 0.5, "uplink_send": 28.5,
+                      "gemini": 470.0, "out_queue": 20.0, "playout": 40.0}
+    assert turn.complete
+    assert tracing.TRACE_LOG_MARKER in caplog.text
+
+
+def test_turn_without_new_speech_only_has_response_stages():
+    clock = FakeClock()
+    exporter = ListExporter()
+    tracer = CallTracer("sid", exporter=exporter, clock=clock)
+    run_turn(tracer, clock, turn_id=1, t0=0.0)
+    tracer.response_audio(2, stamp=5.0)
+    clock.now = 5.01
+    tracer.response_dequeued(5.0)
+    tracer.frame_sent()
+    assert set(exporter.turns[1].stages()) == {"out_queue", "playout"}
+
+
+def test_otlp_export_and_analyzer(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "traces.jsonl"
+    exporter = SpanExporter(str(path))
+    tracer = CallTracer("sid", exporter=exporter, clock=clock)
+    for i in range(3):
+        run_turn(tracer, clock, turn_id=i + 1, t0=10.0 * i)
+    exporter.close()
+
+    lines = path.read_text().splitlines()
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans][:2] == ["turn", "in_queue"]
+    assert all(s.get("parentSpanId") == spans[0]["spanId"] for s in spans[1:])
+
+    durations = read_stage_durations(lines)
+    assert len(durations["gemini"]) == 3
+    assert abs(durations["gemini"][0] - 470.0) < 0.01
+
+
+def test_analyzer_reads_text_and_json_log_lines():
+    summary = {"call": "sid", "turn": 1, "complete": True, "total_ms": 560.0, "stages_ms": {"gemini": 470.0}}
+    text_line = "2026-01-01 - INFO - " + tracing.TRACE_LOG_MARKER + json.dumps(summary)
+    json_line = json.dumps({"msg": tracing.TRACE_LOG_MARKER + json.dumps(summary)})
+    durations = read_stage_durations([text_line, json_line, "unrelated line"])
+    assert durations == {"gemini": [470.0, 470.0], "total": [560.0, 560.0]}
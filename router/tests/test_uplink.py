@@ -0,0 +1,68 @@
+import numpy as np
+
+from voice_router.uplink import UplinkBatcher, UplinkGate
+
+SILENCE = b"\x00\x00" * 320  # 20ms at 16kHz
+SPEECH = (np.sin(np.arange(320) / 3) * 8000).astype(np.int16).tobytes()
+
+
+def test_packets_coalesce_into_configured_frames():
+    batcher = UplinkBatcher(frame_ms=60, adaptive=False)
+    out = [batcher.push(SILENCE) for _ in range(6)]
+    frames = [f for f in out if f]
+    assert len(frames) == 2
+    assert all(len(f) == 3 * len(SILENCE) for f in frames)
+    assert batcher.stats()["messages_out"] == 2
+
+
+def test_speech_onset_flushes_immediately():
+    batcher = UplinkBatcher(frame_ms=100, adaptive=True, quiet_packets=3)
+    for _ in range(3):
+        assert batcher.push(SILENCE) is None
+    frame = batcher.push(SPEECH)
+    assert frame == SILENCE * 3 + SPEECH
+    # Continued speech is batched normally again
+    assert batcher.push(SPEECH) is None
+    assert batcher.stats()["onset_flushes"] == 1
+
+
+def test_flush_returns_partial_frame_once():
+    batcher = UplinkBatcher(frame_ms=100, adaptive=False)
+    batcher.push(SILENCE)
+    assert batcher.flush() == SILENCE
+    assert batcher.flush() is None
+
+
+def test_last_loud_at_tracks_speech_even_without_adaptive_flush():
+    now = [0.0]
+    batcher = UplinkBatcher(frame_ms=100, adaptive=False, clock=lambda: now[0])
+    batcher.push(SILENCE)
+    assert batcher.last_loud_at is None
+    now[0] = 1.0
+    batcher.push(SPEECH)
+    now[0] = 2.0
+    batcher.push(SILENCE)
+    assert batcher.last_loud_at == 1.0
+
+
+def test_gate_sends_speech_with_pre_and_post_roll():
+    gate = UplinkGate(pre_roll_ms=60, post_roll_ms=40, packet_ms=20)
+    quiet = [bytes([i]) * 320 for i in range(5)]
+    assert all(gate.push(p, False) == ([], False) for p in quiet)
+    # Onset replays the last 60ms, including the packet that triggered it
+    packets, end = gate.push(b"S" * 320, True)
+    assert packets == quiet[-2:] + [b"S" * 320] and not end
+    assert gate.push(b"S" * 320, True) == ([b"S" * 320], False)
+    assert gate.push(quiet[0], False) == ([quiet[0]], False)
+    assert gate.push(quiet[1], False) == ([quiet[1]], True)
+    assert gate.push(quiet[2], False) == ([], False)
+    stats = gate.stats()
+    assert stats["opens"] == 1
+    assert stats["seconds_in"] == 0.2 and stats["seconds_sent"] == 0.12 and stats["seconds_saved"] == 0.08
+
+
+def test_gate_comfort_frames_are_sparse_silence():
+    gate = UplinkGate(pre_roll_ms=20, post_roll_ms=20, comfort_ms=100)
+    sent = [gate.push(b"\x07" * 320, False)[0] for _ in range(20)]
+    comfort = [p for packets in sent for p in packets]
+    assert comfort == [bytes(320)] * 4
@@ -1,6 +1,74 @@
+import wave
+
+import numpy as np
 import pytest
-# TODO: Import VAD node/class
 
-def test_vad_gating():
-    # TODO: Use synthetic barge-in WAV fixture
-    assert True  # Replace with real test 
\ No newline at end of file
+from voice_router.vad import SPEECH_END, SPEECH_START, StreamingVad
+
+RATE = 8000
+PACKET = 320  # 20ms of 8kHz PCM16
+
+
+def voiced(seconds, rng, level=6000):
+    """Harmonic 'vowel' at 140Hz with a syllable envelope, plus a little breath noise."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    harmonics = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return harmonics * envelope * level / 2 + rng.standard_normal(len(t)) * 60
+
+
+@pytest.fixture
+def barge_in_wav(tmp_path):
+    """1s of line noise, 1.5s of speech, 1s of line noise: the caller talking over a reply."""
+    rng = np.random.default_rng(7)
+    noise = lambda s: rng.standard_normal(int(s * RATE)) * 80  # noqa: E731
+    signal = np.concatenate([noise(1.0), voiced(1.5, rng), noise(1.0)])
+    path = tmp_path / "barge_in.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(np.clip(signal, -32768, 32767).astype(np.int16).tobytes())
+    return path
+
+
+def read_pcm(path):
+    with wave.open(str(path), "rb") as f:
+        return f.readframes(f.getnframes())
+
+
+def stream(vad, pcm):
+    """Feed 20ms packets like Exotel; returns (event, time_ms) pairs."""
+    events = []
+    for i in range(0, len(pcm), PACKET):
+        for event in vad.process(pcm[i:i + PACKET]):
+            events.append((event, (i + PACKET) / 2 / RATE * 1000))
+    return events
+
+
+def test_vad_gating(barge_in_wav):
+    vad = StreamingVad(onset_frames=3, hangover_frames=12)
+    events = stream(vad, read_pcm(barge_in_wav))
+    assert [e for e, _ in events] == [SPEECH_START, SPEECH_END]
+    (_, start_ms), (_, end_ms) = events
+    # Barge-in is detected within the onset window, not a network round trip later
+    assert 1000 < start_ms <= 1000 + 3 * 20 + 20
+    assert 2500 < end_ms <= 2500 + 12 * 20 + 20
+
+
+def test_loud_hiss_is_not_speech():
+    rng = np.random.default_rng(1)
+    hiss = np.clip(rng.standard_normal(RATE * 2) * 4000, -32768, 32767).astype(np.int16).tobytes()
+    vad = StreamingVad()
+    assert stream(vad, hiss) == []
+    assert vad.speech_frames == 0
+
+
+def test_odd_packet_sizes_match_whole_file(barge_in_wav):
+    pcm = read_pcm(barge_in_wav)
+    whole = StreamingVad().process(pcm)
+    chunked = StreamingVad()
+    events = []
+    for i in range(0, len(pcm), 246):
+        events += chunked.process(pcm[i:i + 246])
+    assert events == whole == [SPEECH_START, SPEECH_END]
@@ -0,0 +1,118 @@
+"""
+Startup-time cache for prompt and trigger audio clips.
+
+Decoding "Jabberwocky Studio.wav" with pydub/ffmpeg on every call start put
+disk I/O and a resample on the critical path to first audio. Clips are now
+decoded and converted once, keyed by path and target format, and re-decoded
+only when the file's mtime changes. A clip can be handed to Gemini as one
+blob or streamed in realtime-sized chunks.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+def decode_audio(path, sample_rate, channels=1, sample_width=2):
+    """Decode any ffmpeg-readable file to raw PCM in the requested format."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path)
+    audio = audio.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(sample_width)
+    return audio.raw_data
+
+
+@dataclass
+class AudioAsset:
+    """A decoded clip in one target format."""
+    path: str
+    pcm: bytes
+    sample_rate: int
+    channels: int
+    sample_width: int
+    mtime_ns: int
+    decode_ms: float
+    _chunks: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.pcm) / (self.sample_rate * self.channels * self.sample_width)
+
+    @property
+    def mime_type(self) -> str:
+        return f"audio/pcm;rate={self.sample_rate}"
+
+    def chunks(self, chunk_ms):
+        """The clip split into `chunk_ms` pieces (computed once per size)."""
+        if chunk_ms not in self._chunks:
+            size = self.sample_rate * self.channels * self.sample_width * chunk_ms // 1000
+            size -= size % (self.channels * self.sample_width)
+            self._chunks[chunk_ms] = [self.pcm[i:i + size] for i in range(0, len(self.pcm), size)]
+        return self._chunks[chunk_ms]
+
+
+class AudioAssetCache:
+    """Decoded clips keyed by (path, rate, channels, width), invalidated by mtime."""
+
+    def __init__(self, decoder=decode_audio):
+        self._decoder = decoder
+        self._assets = {}
+
+    def get(self, path, sample_rate=16000, channels=1, sample_width=2) -> AudioAsset:
+        """Return the clip in the requested format, decoding it if missing or modified.
+
+        Raises FileNotFoundError if the clip does not exist.
+        """
+        key = (os.path.abspath(path), sample_rate, channels, sample_width)
+        mtime_ns = os.stat(path).st_mtime_ns
+        asset = self._assets.get(key)
+        if asset is None or asset.mtime_ns != mtime_ns:
+            start = time.perf_counter()
+            pcm = self._decoder(path, sample_rate, channels, sample_width)
+            decode_ms = (time.perf_counter() - start) * 1000
+            asset = AudioAsset(path, pcm, sample_rate, channels, sample_width, mtime_ns, decode_ms)
+            self._assets[key] = asset
+            logger.info(f"🎵 Cached audio asset {path}: {len(pcm)} bytes, {asset.duration_s:.1f}s, decoded in {decode_ms:.1f}ms")
+        return asset
+
+    def preload(self, *specs):
+        """Warm the cache at startup; each spec is a path or a (path, sample_rate) tuple.
+
+        Missing files are logged rather than raised so startup still succeeds.
+        """
+        for spec in specs:
+            path, sample_rate = (spec, 16000) if isinstance(spec, str) else spec
+            try:
+                self.get(path, sample_rate)
+            except FileNotFoundError:
+                logger.error(f"❌ Audio asset '{path}' not found; it will be retried on first use")
+
+    def invalidate(self, path=None):
+        if path is None:
+            self._assets.clear()
+        else:
+            absolute = os.path.abspath(path)
+            self._assets = {k: v for k, v in self._assets.items() if k[0] != absolute}
+
+
+async def send_asset(send_chunk, asset, chunk_ms=0):
+    """Send a clip with `await send_chunk(pcm)`: in one blob, or in `chunk_ms` pieces when > 0.
+
+    Pieces go out in real time, piece i at start + i * chunk_ms on the loop's
+    monotonic clock, so a slow send is caught up on rather than delaying the rest.
+    """
+    if chunk_ms <= 0:
+        await send_chunk(asset.pcm)
+        return 1
+    pieces = asset.chunks(chunk_ms)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i, piece in enumerate(pieces):
+        delay = start + i * chunk_ms / 1000 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await send_chunk(piece)
+    return len(pieces)
@@ -0,0 +1,124 @@
+"""
+Byte-bounded audio queues with drop policies.
+
+An unbounded inbound queue grows without limit when Gemini is slow, and a
+bounded `asyncio.Queue` whose producer awaits `put` stalls that producer, which
+for `receive_gemini_audio` means interruption events stop being read. An
+`AudioQueue` never blocks the producer: when a put would exceed `max_bytes`
+it drops the oldest or the newest audio according to its policy. Interruption
+handling calls `flush()`, which swaps the buffer out in one step instead of
+draining it chunk by chunk.
+
+Every chunk carries a monotonic stamp (its enqueue time unless the producer
+passes one), exposed as `last_stamp` after `get`, so tracing can follow a
+chunk across the queue.
+"""
+import asyncio
+import collections
+import time
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class AudioQueue:
+    """FIFO of audio chunks bounded by total bytes, single consumer."""
+
+    def __init__(self, max_bytes, policy=DROP_OLDEST, name="audio", clock=time.monotonic):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown drop policy {policy!r}, expected one of {POLICIES}")
+        self.name = name
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._chunks = collections.deque()
+        self._stamps = collections.deque()
+        self._nbytes = 0
+        self._not_empty = asyncio.Event()
+        self._clock = clock
+        # Stamp of the chunk most recently returned by get/get_nowait
+        self.last_stamp = None
+        # Bumped on every flush so consumers can discard audio they already dequeued
+        self.generation = 0
+        self.high_water_bytes = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.flushes = 0
+        self.flushed_bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def qsize(self) -> int:
+        return len(self._chunks)
+
+    def empty(self) -> bool:
+        return not self._chunks
+
+    def put_nowait(self, chunk, stamp=None) -> bool:
+        """Enqueue `chunk`, dropping audio per the policy if over capacity.
+
+        `stamp` defaults to now. Returns False if `chunk` itself was dropped.
+        """
+        size = len(chunk)
+        if self.policy == DROP_NEWEST or size > self.max_bytes:
+            if self._nbytes + size > self.max_bytes:
+                self.dropped_chunks += 1
+                self.dropped_bytes += size
+                return False
+        else:
+            while self._nbytes + size > self.max_bytes:
+                old = self._chunks.popleft()
+                self._stamps.popleft()
+                self._nbytes -= len(old)
+                self.dropped_chunks += 1
+                self.dropped_bytes += len(old)
+        self._chunks.append(chunk)
+        self._stamps.append(self._clock() if stamp is None else stamp)
+        self._nbytes += size
+        if self._nbytes > self.high_water_bytes:
+            self.high_water_bytes = self._nbytes
+        self._not_empty.set()
+        return True
+
+    async def put(self, chunk, stamp=None) -> bool:
+        """Same as put_nowait; never waits, so the producer keeps reading upstream."""
+        return self.put_nowait(chunk, stamp)
+
+    def get_nowait(self):
+        if not self._chunks:
+            raise asyncio.QueueEmpty
+        chunk = self._chunks.popleft()
+        self.last_stamp = self._stamps.popleft()
+        self._nbytes -= len(chunk)
+        if not self._chunks:
+            self._not_empty.clear()
+        return chunk
+
+    async def get(self):
+        while not self._chunks:
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def flush(self) -> int:
+        """Discard everything queued in one swap; returns the number of bytes dropped."""
+        flushed = self._nbytes
+        self._chunks = collections.deque()
+        self._stamps = collections.deque()
+        self._nbytes = 0
+        self._not_empty.clear()
+        self.generation += 1
+        self.flushes += 1
+        self.flushed_bytes += flushed
+        return flushed
+
+    def stats(self) -> dict:
+        return {
+            "queued_bytes": self._nbytes,
+            "high_water_bytes": self.high_water_bytes,
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_bytes": self.dropped_bytes,
+            "flushes": self.flushes,
+            "flushed_bytes": self.flushed_bytes,
+        }
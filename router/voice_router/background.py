@@ -0,0 +1,106 @@
+"""
+Shared, pre-scaled background-noise frame bank.
+
+The background track is decoded once to 8kHz mono PCM16 and cached as raw
+files next to each pre-scaled variant ("mixed" for under speech, "idle" for
+gaps). Each worker memory-maps the same files, so the pages are shared via
+the OS page cache, and a call only holds a frame offset into the bank.
+Cache files are keyed by the source's mtime and size, so replacing the
+source track invalidates them.
+"""
+import glob
+import logging
+import os
+import re
+
+import numpy as np
+
+from .assets import decode_audio
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 8000
+# Volumes previously applied per frame with audioop.mul
+VARIANTS = {"raw": 1.0, "mixed": 0.0001, "idle": 0.5}
+
+
+def decode_with_pydub(path, sample_rate=SAMPLE_RATE):
+    """Decode any ffmpeg-readable file to mono PCM16 bytes at `sample_rate`."""
+    return decode_audio(path, sample_rate)
+
+
+class BackgroundBank:
+    """Memory-mapped background frames in each pre-scaled variant."""
+
+    def __init__(self, source_path, cache_dir=None, frame_size=320, decoder=decode_with_pydub):
+        self.source_path = source_path
+        self.cache_dir = cache_dir or os.getenv("BACKGROUND_CACHE_DIR", ".cache/background")
+        self.frame_size = frame_size
+        self._decoder = decoder
+        self.variants = {}
+        self.n_frames = 0
+
+    @property
+    def _stem(self):
+        return os.path.splitext(os.path.basename(self.source_path))[0]
+
+    def _cache_path(self, variant):
+        st = os.stat(self.source_path)
+        stem = self._stem
+        return os.path.join(self.cache_dir, f"{stem}-{st.st_mtime_ns}-{st.st_size}-{SAMPLE_RATE}-{variant}.pcm")
+
+    def load(self):
+        """Map the cached variants, decoding and writing them first if missing or stale."""
+        paths = {name: self._cache_path(name) for name in VARIANTS}
+        if not all(os.path.exists(p) for p in paths.values()):
+            self._build(paths)
+        else:
+            logger.info(f"🎶 Using cached background bank for {self.source_path}")
+        for name, path in paths.items():
+            self.variants[name] = np.memmap(path, dtype=np.int16, mode="r")
+        self.n_frames = len(self.variants["raw"]) * 2 // self.frame_size
+        return self
+
+    def _build(self, paths):
+        logger.info(f"🎶 Decoding background audio {self.source_path} into {self.cache_dir}")
+        raw = np.frombuffer(self._decoder(self.source_path), dtype=np.int16)
+        # Keep whole frames only so every frame in the bank is full length
+        samples_per_frame = self.frame_size // 2
+        raw = raw[:len(raw) - len(raw) % samples_per_frame]
+        if not len(raw):
+            raise ValueError(f"Background audio {self.source_path} is shorter than one frame")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for name, volume in VARIANTS.items():
+            scaled = np.clip(np.rint(raw * volume), -32768, 32767).astype(np.int16)
+            # Write-then-rename so concurrent workers never map a partial file
+            tmp = f"{paths[name]}.{os.getpid()}.tmp"
+            scaled.tofile(tmp)
+            os.replace(tmp, paths[name])
+        # Drop variants cached for an older version of this source. The glob alone would also match
+        # other sources whose name starts with this stem ("office" vs "office-2"), so match the whole key.
+        key = re.compile(rf"{re.escape(self._stem)}-\d+-\d+-{SAMPLE_RATE}-(?:{'|'.join(VARIANTS)})\.pcm")
+        for stale in glob.glob(os.path.join(glob.escape(self.cache_dir), f"{glob.escape(self._stem)}-*.pcm")):
+            if key.fullmatch(os.path.basename(stale)) and stale not in paths.values():
+                os.remove(stale)
+
+    def frame(self, variant, index):
+        """Zero-copy int16 view of frame `index` (wrapping) in `variant`."""
+        samples = self.frame_size // 2
+        start = (index % self.n_frames) * samples
+        return self.variants[variant][start:start + samples]
+
+    def cursor(self, start=0):
+        return BackgroundCursor(self, start)
+
+
+class BackgroundCursor:
+    """A call's position in the shared bank; advances one frame per tick."""
+
+    def __init__(self, bank, start=0):
+        self.bank = bank
+        self.index = start
+
+    def next(self, variant):
+        frame = self.bank.frame(variant, self.index)
+        self.index = (self.index + 1) % self.bank.n_frames
+        return frame
@@ -0,0 +1,297 @@
+"""
+Batched outbound mixing, optionally off the event loop.
+
+Every tick the playout engine used to mix each call's reply frame with its
+background bed (and zero-check it) one call at a time on the loop thread, so
+DSP competed with websocket I/O. A call's `next_frame` now returns a
+`MixFrame` and the engine hands the whole tick's frames to a `DspExecutor`,
+which mixes them as one (calls, samples) NumPy operation:
+
+    inline   on the loop thread, but one vectorized op per tick (default)
+    thread   on a thread pool; NumPy releases the GIL for the array work, and a
+             large tick is split across `workers` threads
+    process  in worker processes: frames are written into a shared-memory ring
+             slot, the worker mixes in place and returns only the slot number
+             and the silent-row mask over a pipe. A batch that is not back
+             within `deadline_ms` (one tick), or whose worker died, is mixed
+             inline instead; a dead worker is restarted.
+
+Stateful per-call work (resampling) stays with the call: it is order
+dependent and cheap per packet, so hopping threads for it costs more than it
+saves. The result is the same whatever the mode; see benchmarks/bench_dsp.py
+for loop latency and call capacity per mode.
+"""
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODES = ("inline", "thread", "process")
+
+
+class MixFrame:
+    """A reply frame still to be mixed with its background bed.
+
+    `speech` is PCM16 bytes and `bed` an int16 array of the same length;
+    `on_silent` is called on the loop if `speech` turns out to be all zeros.
+    """
+
+    __slots__ = ("speech", "bed", "on_silent")
+
+    def __init__(self, speech, bed, on_silent=None):
+        self.speech = speech
+        self.bed = bed
+        self.on_silent = on_silent
+
+
+def mix_batch(speech, beds, out):
+    """out = saturate(speech + beds) row by row; returns a mask of all-zero speech rows."""
+    acc = speech.astype(np.int32)
+    acc += beds
+    np.clip(acc, -32768, 32767, out=acc)
+    out[...] = acc
+    return ~speech.any(axis=1)
+
+
+def _process_worker(shm_name, shape, conn):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(shape, dtype=np.int16, buffer=shm.buf)
+    try:
+        conn.send(None)  # up and attached: the pool starts routing batches here
+        while True:
+            job = conn.recv()
+            if job is None:
+                return
+            slot, n = job
+            silent = mix_batch(ring[slot, 0, :n], ring[slot, 1, :n], ring[slot, 2, :n])
+            conn.send((slot, silent.tobytes()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del ring
+        shm.close()
+
+
+class _ProcessPool:
+    """Worker processes sharing a ring of (speech, bed, out) batch slots."""
+
+    def __init__(self, workers, slots, max_batch, frame_samples, deadline_s):
+        self.max_batch = max_batch
+        self.deadline_s = deadline_s
+        self.shape = (slots, 3, max_batch, frame_samples)
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.shape)) * 2)
+        self.ring = np.ndarray(self.shape, dtype=np.int16, buffer=self.shm.buf)
+        self.free = deque(range(slots))
+        self._pending = {}  # slot -> (future, conn of the worker mixing it)
+        self._next = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._loop = None
+        self.conns, self.procs = [None] * workers, [None] * workers
+        self._ready = set()
+        self.timeouts = 0
+        self.restarts = 0
+        for i in range(workers):
+            self._spawn(i)
+
+    def _spawn(self, i):
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_process_worker, args=(self.shm.name, self.shape, child),
+                                 name=f"dsp-worker-{i}", daemon=True)
+        proc.start()
+        child.close()
+        self.conns[i], self.procs[i] = parent, proc
+        if self._loop is not None:
+            self._loop.add_reader(parent.fileno(), self._on_result, parent)
+
+    async def start(self, timeout_s):
+        """Wait until every worker is up, so the first ticks are not mixed inline."""
+        self._attach()
+        deadline = self._loop.time() + timeout_s
+        while len(self._ready) < len(self.conns) and self._loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        return len(self._ready)
+
+    def _attach(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            for conn in self.conns:
+                loop.add_reader(conn.fileno(), self._on_result, conn)
+
+    def _on_result(self, conn):
+        try:
+            while conn.poll():
+                result = conn.recv()
+                if result is None:
+                    self._ready.add(conn)
+                    continue
+                slot, silent = result
+                future, _ = self._pending.pop(slot)
+                if future.cancelled():
+                    # Its caller gave up; the slot is only safe to reuse now the worker is done with it
+                    self.free.append(slot)
+                else:
+                    future.set_result(np.frombuffer(silent, dtype=bool))
+        except (EOFError, OSError):
+            self._worker_died(conn)
+
+    def _worker_died(self, conn):
+        if conn not in self.conns:
+            return
+        i = self.conns.index(conn)
+        self._ready.discard(conn)
+        self._loop.remove_reader(conn.fileno())
+        conn.close()
+        proc = self.procs[i]
+        proc.join(timeout=0.1)
+        # Nothing will write its slots any more: hand them back and fail their callers over to inline
+        for slot, (future, owner) in list(self._pending.items()):
+            if owner is conn:
+                del self._pending[slot]
+                self.free.append(slot)
+                if not future.done():
+                    future.set_exception(ConnectionError(f"{proc.name} died"))
+        self.restarts += 1
+        logger.error(f"❌ DSP worker {proc.name} died (exit code {proc.exitcode}), restarting it")
+        self._spawn(i)
+
+    async def mix(self, speech, beds, n):
+        """Mix the first `n` rows; returns (mixed rows, silent mask), or None to have the caller mix inline."""
+        self._attach()
+        ready = [conn for conn in self.conns if conn in self._ready]
+        if not ready or not self.free or n > self.max_batch:
+            return None
+        slot = self.free.popleft()
+        self.ring[slot, 0, :n] = speech
+        self.ring[slot, 1, :n] = beds
+        future = self._loop.create_future()
+        conn = ready[self._next % len(ready)]
+        self._next += 1
+        self._pending[slot] = (future, conn)
+        try:
+            conn.send((slot, n))
+            silent = await asyncio.wait_for(future, self.deadline_s)
+        except asyncio.TimeoutError:
+            # The cancelled future hands the slot back once the worker answers
+            self.timeouts += 1
+            return None
+        except (ConnectionError, OSError):
+            self._worker_died(conn)
+            return None
+        mixed = self.ring[slot, 2, :n].copy()
+        self.free.append(slot)
+        return mixed, silent
+
+    def close(self):
+        if self._loop is not None and not self._loop.is_closed():
+            for conn in self.conns:
+                self._loop.remove_reader(conn.fileno())
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self.procs:
+            proc.join(timeout=2)
+            if proc.is_alive():
+                proc.terminate()
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
+
+
+class DspExecutor:
+    """Mixes a tick's `MixFrame`s in one batch, inline or on a thread/process pool."""
+
+    def __init__(self, mode="inline", workers=1, frame_samples=160, max_batch=4096, slots=4, min_split=256,
+                 deadline_ms=20):
+        if mode not in MODES:
+            raise ValueError(f"Unknown DSP executor mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.frame_samples = frame_samples
+        self.min_split = min_split
+        self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="dsp") if mode == "thread" else None
+        self._procs = _ProcessPool(self.workers, slots, max_batch, frame_samples, deadline_ms / 1000) if mode == "process" else None
+        self.batches = 0
+        self.frames = 0
+        self.fallbacks = 0
+
+    @property
+    def inline(self) -> bool:
+        return self.mode == "inline"
+
+    def _stack(self, frames):
+        n = len(frames)
+        speech = np.frombuffer(b"".join(f.speech for f in frames), dtype=np.int16).reshape(n, self.frame_samples)
+        beds = np.stack([f.bed for f in frames])
+        return speech, beds
+
+    def _finish(self, frames, mixed, silent):
+        self.batches += 1
+        self.frames += len(frames)
+        for frame, is_silent in zip(frames, silent.tolist()):
+            if is_silent and frame.on_silent is not None:
+                frame.on_silent()
+        return [row.tobytes() for row in mixed]
+
+    async def start(self, timeout_s=10.0):
+        """Process mode: wait for the worker processes to come up."""
+        if self._procs is not None:
+            ready = await self._procs.start(timeout_s)
+            if ready < self.workers:
+                logger.warning(f"⚠️ Only {ready}/{self.workers} DSP workers up after {timeout_s}s; mixing inline meanwhile")
+
+    def mix_now(self, frames):
+        """Mix on the calling thread; returns PCM16 bytes per frame."""
+        speech, beds = self._stack(frames)
+        mixed = np.empty_like(speech)
+        silent = mix_batch(speech, beds, mixed)
+        return self._finish(frames, mixed, silent)
+
+    async def mix(self, frames):
+        """Mix per `mode`; returns PCM16 bytes per frame, in order."""
+        if self.inline:
+            return self.mix_now(frames)
+        speech, beds = self._stack(frames)
+        if self._procs is not None:
+            result = await self._procs.mix(speech, beds, len(frames))
+            if result is None:
+                # Ring full, batch too big, worker late or dead: mix here rather than hold the tick back
+                self.fallbacks += 1
+                return self.mix_now(frames)
+            return self._finish(frames, *result)
+        mixed = np.empty_like(speech)
+        loop = asyncio.get_running_loop()
+        parts = max(1, min(self.workers, len(frames) // self.min_split))
+        bounds = np.linspace(0, len(frames), parts + 1, dtype=int)
+        masks = await asyncio.gather(*(
+            loop.run_in_executor(self._threads, mix_batch, speech[a:b], beds[a:b], mixed[a:b])
+            for a, b in zip(bounds, bounds[1:])
+        ))
+        return self._finish(frames, mixed, np.concatenate(masks))
+
+    def close(self):
+        if self._threads is not None:
+            self._threads.shutdown(wait=False)
+        if self._procs is not None:
+            self._procs.close()
+            self._procs = None
+
+    def stats(self) -> dict:
+        stats = {
+            "mode": self.mode,
+            "workers": self.workers,
+            "batches": self.batches,
+            "frames": self.frames,
+            "fallbacks": self.fallbacks,
+        }
+        if self._procs is not None:
+            stats.update(timeouts=self._procs.timeouts, restarts=self._procs.restarts)
+        return stats
@@ -0,0 +1,159 @@
+"""
+Exotel media-stream message codec.
+
+Outbound, every 20ms frame used to build a fresh dict, base64 it into a new
+str and hand it to `websocket.send_json`, which serializes the whole dict
+again. `MediaEncoder` precompiles the per-call JSON around the payload, so a
+frame costs one base64 pass plus splicing it between a prebuilt prefix and
+suffix: as str for `websocket.send_text`, or into a reusable bytes buffer for
+`send_bytes` on a binary transport.
+
+Inbound, `receive_json` fully parsed every 20ms media event into dicts before
+the payload was base64-decoded. `MediaDecoder` takes the raw text instead:
+its `fast` backend finds the event name and payload with a few `str.find`
+calls and decodes the payload straight from the text, and only control
+events (`start`, `stop`, `mark`, `dtmf`, ...) go through a full JSON parse.
+With orjson installed a full parse is cheaper still, and `auto` uses it.
+"""
+import binascii
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+BACKENDS = ("template", "orjson", "json")
+DECODER_BACKENDS = ("auto", "fast", "orjson", "simdjson", "json")
+
+
+class MediaEncoder:
+    """Encodes PCM frames as Exotel `media` events for one stream.
+
+    The `template` backend splices base64 output between a prebuilt prefix and
+    suffix; `orjson` and `json` serialize a dict per frame and exist for
+    comparison and as a fallback.
+    """
+
+    def __init__(self, stream_sid, backend="template", frame_bytes=320):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown media encoder backend {backend!r}, expected one of {BACKENDS}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        self.stream_sid = stream_sid
+        self.backend = backend
+        # json.dumps escapes the sid exactly as send_json would
+        self._prefix_text = f'{{"event":"media","stream_sid":{json.dumps(stream_sid)},"media":{{"payload":"'
+        self._suffix_text = '"}}'
+        self._prefix = self._prefix_text.encode()
+        self._suffix = self._suffix_text.encode()
+        self._buf = bytearray()
+        self._resize(frame_bytes)
+
+    def _resize(self, frame_bytes):
+        self._frame_bytes = frame_bytes
+        b64_len = 4 * -(-frame_bytes // 3)
+        self._buf = bytearray(len(self._prefix) + b64_len + len(self._suffix))
+        self._buf[:len(self._prefix)] = self._prefix
+        self._b64_len = b64_len
+        self._buf[len(self._prefix) + b64_len:] = self._suffix
+
+    def encode_bytes(self, frame):
+        """UTF-8 JSON for one frame. The returned memoryview is reused by the next call."""
+        if self.backend != "template":
+            return memoryview(self.encode(frame).encode())
+        if len(frame) != self._frame_bytes:
+            self._resize(len(frame))
+        start = len(self._prefix)
+        self._buf[start:start + self._b64_len] = binascii.b2a_base64(frame, newline=False)
+        return memoryview(self._buf)
+
+    def encode(self, frame) -> str:
+        """JSON text for one frame, ready for `websocket.send_text`."""
+        if self.backend == "template":
+            return self._prefix_text + binascii.b2a_base64(frame, newline=False).decode("ascii") + self._suffix_text
+        msg = {
+            "event": "media",
+            "stream_sid": self.stream_sid,
+            "media": {"payload": binascii.b2a_base64(frame, newline=False).decode("ascii")},
+        }
+        if self.backend == "orjson":
+            return orjson.dumps(msg).decode()
+        return json.dumps(msg, separators=(",", ":"))
+
+
+class MediaDecoder:
+    """Decodes inbound Exotel websocket text into (event, pcm, msg).
+
+    For `media` events `pcm` is the decoded payload and `msg` is None (the
+    fast path never builds it); for anything else `pcm` is None and `msg` is
+    the parsed message. `fast` falls back to a full parse whenever a message
+    does not look like a plain media event. orjson's C parser beats the
+    Python-level scan, so `auto` picks `orjson` when it is installed and
+    `fast` otherwise.
+    """
+
+    def __init__(self, backend="auto"):
+        if backend not in DECODER_BACKENDS:
+            raise ValueError(f"Unknown media decoder backend {backend!r}, expected one of {DECODER_BACKENDS}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        if backend == "simdjson" and simdjson is None:
+            raise ValueError("simdjson backend requested but pysimdjson is not installed")
+        if backend == "auto":
+            backend = "orjson" if orjson is not None else "fast"
+        self.backend = backend
+        self._loads = orjson.loads if orjson is not None else json.loads
+        self._parser = simdjson.Parser() if backend == "simdjson" else None
+        self.fast_hits = 0
+        self.full_parses = 0
+
+    def decode(self, text):
+        if self.backend == "fast":
+            pcm = self._scan_media(text)
+            if pcm is not None:
+                self.fast_hits += 1
+                return "media", pcm, None
+            return self._full(self._loads(text))
+        if self.backend == "simdjson":
+            doc = self._parser.parse(text.encode() if isinstance(text, str) else text)
+            if doc.get("event") == "media":
+                self.fast_hits += 1
+                return "media", binascii.a2b_base64(doc["media"]["payload"]), None
+            return self._full(doc.as_dict())
+        return self._full(self._loads(text) if self.backend == "orjson" else json.loads(text))
+
+    @staticmethod
+    def _scan_media(text):
+        """Payload of a media event found by string search, or None to use the full parser."""
+        key = text.find('"event"')
+        colon = text.find(":", key + 7)
+        quote = text.find('"', colon + 1)
+        # The value must be a string right after the colon (at most one space between)
+        if key < 0 or colon < 0 or quote - colon > 2 or not text.startswith('media"', quote + 1):
+            return None
+        key = text.find('"payload"')
+        colon = text.find(":", key + 9)
+        quote = text.find('"', colon + 1)
+        end = text.find('"', quote + 1)
+        if key < 0 or colon < 0 or quote - colon > 2 or end < 0:
+            return None
+        try:
+            return binascii.a2b_base64(text[quote + 1:end])
+        except binascii.Error:
+            return None
+
+    def _full(self, msg):
+        self.full_parses += 1
+        event = msg.get("event")
+        if event == "media":
+            return event, binascii.a2b_base64(msg["media"]["payload"]), None
+        return event, None, msg
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "fast_hits": self.fast_hits, "full_parses": self.full_parses}
@@ -0,0 +1,142 @@
+"""
+Shared Gemini Live session factory.
+
+Every /ws/exotel connection used to build its own `genai.Client` (fresh
+HTTP/TLS state) and its own `LiveConnectConfig` before dialing. The factory
+holds one client and one prebuilt config per process and can keep a small
+pool of already-connected Live sessions so a new caller skips the connect
+handshake entirely. Pooled sessions older than `max_idle_s` are discarded
+rather than handed out, since the server may have dropped them.
+"""
+import asyncio
+import collections
+import contextlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def default_client_factory(http_options=None, base_url=None):
+    """Build the genai client; `base_url` points it at another endpoint, e.g. mock_gemini_server.py.
+
+    The SDK always dials Live over wss:// when an API key is set, so for a plain
+    ws:// URL the client's websocket endpoint is overridden directly.
+    """
+    from google import genai
+
+    http_options = dict(http_options or {"api_version": "v1alpha"})
+    if base_url and not base_url.startswith("ws://"):
+        http_options["base_url"] = base_url
+    client = genai.Client(http_options=http_options)
+    if base_url and base_url.startswith("ws://"):
+        api_client = client._api_client
+        api_client._websocket_base_url = lambda: base_url.rstrip("/")
+        api_client._websocket_ssl_ctx = {}
+    return client
+
+
+class _Lease:
+    """An entered `live.connect()` context and the session it produced."""
+
+    def __init__(self, cm, session, connect_ms):
+        self.cm = cm
+        self.session = session
+        self.connect_ms = connect_ms
+        self.created = time.monotonic()
+
+    async def close(self):
+        try:
+            await self.cm.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing Gemini session: {e}")
+
+
+class GeminiSessionFactory:
+    """Hands out Live sessions from one shared client, optionally pre-warmed."""
+
+    def __init__(self, model, config, pool_size=0, max_idle_s=60.0, client_factory=default_client_factory):
+        self.model = model
+        self.config = config
+        self.pool_size = pool_size
+        self.max_idle_s = max_idle_s
+        self._client_factory = client_factory
+        self._client = None
+        self._pool = collections.deque()
+        self._refill_task = None
+        self.stats = {"warm_hits": 0, "cold_connects": 0, "expired": 0, "refill_errors": 0}
+
+    @property
+    def client(self):
+        """The process-wide client, created on first use."""
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    async def _dial(self):
+        start = time.monotonic()
+        cm = self.client.aio.live.connect(model=self.model, config=self.config)
+        session = await cm.__aenter__()
+        return _Lease(cm, session, (time.monotonic() - start) * 1000)
+
+    async def _acquire(self):
+        now = time.monotonic()
+        while self._pool:
+            lease = self._pool.popleft()
+            if now - lease.created <= self.max_idle_s:
+                self.stats["warm_hits"] += 1
+                self._schedule_refill()
+                return lease, True
+            self.stats["expired"] += 1
+            asyncio.get_running_loop().create_task(lease.close())
+        lease = await self._dial()
+        self.stats["cold_connects"] += 1
+        self._schedule_refill()
+        return lease, False
+
+    @contextlib.asynccontextmanager
+    async def connect(self):
+        """Async context manager yielding a connected Live session, warm if one is pooled."""
+        lease, warm = await self._acquire()
+        logger.info(f"✅ Gemini session ready ({'pre-warmed' if warm else 'dialed'}, connect {lease.connect_ms:.0f}ms)")
+        try:
+            yield lease.session
+        finally:
+            await lease.close()
+
+    def _schedule_refill(self):
+        if self.pool_size <= 0 or len(self._pool) >= self.pool_size:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.get_running_loop().create_task(self._refill())
+
+    async def _refill(self):
+        backoff = 1.0
+        while len(self._pool) < self.pool_size:
+            try:
+                self._pool.append(await self._dial())
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["refill_errors"] += 1
+                logger.error(f"❌ Failed to pre-warm Gemini session: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def start(self):
+        """Create the client and begin pre-warming the pool (call from app startup)."""
+        _ = self.client
+        self._schedule_refill()
+
+    async def close(self):
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refill_task
+        while self._pool:
+            await self._pool.popleft().close()
+
+    @property
+    def pooled(self) -> int:
+        return len(self._pool)
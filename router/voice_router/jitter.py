@@ -0,0 +1,160 @@
+"""
+Adaptive playout jitter buffer for Gemini reply audio.
+
+Gemini streams a reply in bursts whose arrival times wobble around real
+time. The playout engine takes one 20ms frame per tick, so a chunk that lands
+late leaves a hole that gets background, and the caller hears speech, a gap,
+then the rest. `JitterBuffer` holds the start of each talk spurt for
+`target_ms` before releasing it, then hands out one frame per tick, carrying
+the sub-frame remainder of each chunk into the next so the stream stays
+sample-accurate.
+
+The target is learned from arrivals. A chunk's lateness is how far behind
+the real-time schedule it arrived (spurt start plus the audio received before
+it), which is the playout delay that would have played it on time. The target
+jumps to any lateness seen (bounded by `max_ms`) and, at the end of each
+spurt, decays by `decay` towards that spurt's peak. Running dry mid-turn is
+an underrun and re-buffers for `target_ms`; audio past `capacity_ms` is
+dropped as an overrun. `end_turn()` releases whatever is held and pads the
+last partial frame with silence.
+"""
+import collections
+import time
+
+
+class JitterBuffer:
+    """Frames one call's downlink PCM16 for the playout clock; single producer and consumer."""
+
+    def __init__(self, frame_bytes=320, sample_rate=8000, initial_ms=40, min_ms=0, max_ms=200,
+                 decay=0.05, capacity_ms=60000, clock=time.monotonic):
+        self.frame_bytes = frame_bytes
+        self._bytes_per_ms = sample_rate * 2 / 1000
+        self.min_ms = min_ms
+        self.max_ms = max(min_ms, max_ms)
+        self.decay = decay
+        self.capacity_ms = capacity_ms
+        self.target_ms = min(max(initial_ms, self.min_ms), self.max_ms)
+        self._clock = clock
+        self._frames = collections.deque()
+        self._tail = b""
+        self._playing = False
+        self._ended = False
+        self._hold_from = None  # arrival that started the current hold (pre-roll or re-buffer)
+        self._spurt_start = None
+        self._spurt_ms = 0.0  # audio received so far in this spurt
+        self._spurt_peak = 0.0
+        # Frame index where each buffered chunk starts, for `last_stamp`
+        self._starts = collections.deque()
+        self._pushed_bytes = 0
+        self._popped = 0
+        # Arrival stamp of the chunk the most recently popped frame belongs to
+        self.last_stamp = None
+        self.spurts = 0
+        self.underruns = 0
+        self.overruns = 0
+        self.dropped_ms = 0.0
+        self.padded_frames = 0
+        self.max_lateness_ms = 0.0
+        self.high_water_ms = 0.0
+
+    @property
+    def depth_ms(self) -> float:
+        return (len(self._frames) * self.frame_bytes + len(self._tail)) / self._bytes_per_ms
+
+    @property
+    def active(self) -> bool:
+        """Reply audio is playing or held for playout."""
+        return self._playing or self._spurt_start is not None
+
+    def push(self, pcm, arrival=None) -> bool:
+        """Add reply audio that reached the router at `arrival` (default now).
+
+        Returns False if it was dropped because the buffer is full.
+        """
+        arrival = self._clock() if arrival is None else arrival
+        duration_ms = len(pcm) / self._bytes_per_ms
+        if self._spurt_start is None:
+            self._spurt_start, self._spurt_ms, self._spurt_peak = arrival, 0.0, 0.0
+            self.spurts += 1
+        lateness = (arrival - self._spurt_start) * 1000 - self._spurt_ms
+        self._spurt_ms += duration_ms
+        if lateness > self._spurt_peak:
+            self._spurt_peak = lateness
+            self.max_lateness_ms = max(self.max_lateness_ms, lateness)
+            self.target_ms = max(self.target_ms, min(lateness, self.max_ms))
+        if self.depth_ms + duration_ms > self.capacity_ms:
+            self.overruns += 1
+            self.dropped_ms += duration_ms
+            return False
+        if not self._playing and self._hold_from is None:
+            self._hold_from = arrival
+        self._starts.append((self._pushed_bytes // self.frame_bytes, arrival))
+        self._pushed_bytes += len(pcm)
+        data = self._tail + pcm if self._tail else pcm
+        whole = len(data) - len(data) % self.frame_bytes
+        self._frames.extend(data[i:i + self.frame_bytes] for i in range(0, whole, self.frame_bytes))
+        self._tail = data[whole:]
+        if self.depth_ms > self.high_water_ms:
+            self.high_water_ms = self.depth_ms
+        return True
+
+    def pop(self):
+        """The next frame to play, or None while holding audio back or idle."""
+        if not self._playing:
+            if not self._ended:
+                if not self._frames or (self._clock() - self._hold_from) * 1000 < self.target_ms:
+                    return None
+            self._playing = True
+        if self._frames:
+            return self._next(self._frames.popleft())
+        if self._ended:
+            frame = None
+            if self._tail:
+                frame = self._next(self._tail + bytes(self.frame_bytes - len(self._tail)))
+                self.padded_frames += 1
+            self._finish_spurt()
+            return frame
+        # Ran dry mid-turn: hold the next chunk for the (now raised) target again
+        self.underruns += 1
+        self._playing = False
+        self._hold_from = None
+        return None
+
+    def end_turn(self):
+        """Gemini finished the turn: play out what is held without waiting for the target."""
+        self._ended = True
+
+    def clear(self):
+        """Drop everything buffered (interruption); the learned target is kept."""
+        self._frames.clear()
+        self._tail = b""
+        self._finish_spurt()
+
+    def _next(self, frame):
+        index = self._popped
+        self._popped += 1
+        while self._starts and self._starts[0][0] <= index:
+            self.last_stamp = self._starts.popleft()[1]
+        return frame
+
+    def _finish_spurt(self):
+        if self._spurt_start is not None:
+            # Decay towards this spurt's peak so one bad burst does not add delay for the rest of the call
+            self.target_ms = min(self.max_ms, max(self.min_ms, self._spurt_peak, self.target_ms * (1 - self.decay)))
+        self._playing = self._ended = False
+        self._hold_from = self._spurt_start = None
+        self._tail = b""
+        self._starts.clear()
+        self._pushed_bytes = self._popped * self.frame_bytes
+
+    def stats(self) -> dict:
+        return {
+            "target_ms": round(self.target_ms, 1),
+            "spurts": self.spurts,
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "dropped_ms": round(self.dropped_ms, 1),
+            "padded_frames": self.padded_frames,
+            "max_lateness_ms": round(self.max_lateness_ms, 1),
+            "high_water_ms": round(self.high_water_ms, 1),
+        }
@@ -0,0 +1,73 @@
+"""
+Per-worker call lifecycle: active call count, readiness and graceful drain.
+
+Each server worker process owns one `LIFECYCLE`. `/ws/exotel` registers its
+calls here, `/health` and `/ready` report from it, and the production
+launcher (`serve.py`) flips it into draining on SIGTERM: readiness goes to
+503 so the load balancer stops routing, new calls are refused, and the
+worker exits once its in-flight calls have finished (or `drain_timeout_s`
+passes).
+"""
+import os
+import time
+
+
+class CallLifecycle:
+    """Active calls and drain state for one worker process."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.started_at = clock()
+        self.pid = os.getpid()
+        self.active_calls = 0
+        self.total_calls = 0
+        self.refused_calls = 0
+        self.ready = False
+        self.draining = False
+        self.drain_started_at = None
+
+    def mark_ready(self):
+        self.ready = True
+
+    def call_started(self) -> bool:
+        """Register a new call; False (and counted as refused) while draining."""
+        if self.draining:
+            self.refused_calls += 1
+            return False
+        self.active_calls += 1
+        self.total_calls += 1
+        return True
+
+    def call_finished(self):
+        self.active_calls = max(0, self.active_calls - 1)
+
+    def start_drain(self):
+        if not self.draining:
+            self.draining = True
+            self.drain_started_at = self._clock()
+
+    def drained(self, timeout_s=None) -> bool:
+        """True once draining and either idle or past `timeout_s`."""
+        if not self.draining:
+            return False
+        if self.active_calls == 0:
+            return True
+        return timeout_s is not None and self._clock() - self.drain_started_at >= timeout_s
+
+    @property
+    def accepting(self) -> bool:
+        return self.ready and not self.draining
+
+    def status(self) -> dict:
+        return {
+            "pid": self.pid,
+            "ready": self.accepting,
+            "draining": self.draining,
+            "active_calls": self.active_calls,
+            "total_calls": self.total_calls,
+            "refused_calls": self.refused_calls,
+            "uptime_s": round(self._clock() - self.started_at, 1),
+        }
+
+
+LIFECYCLE = CallLifecycle()
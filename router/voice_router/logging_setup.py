@@ -0,0 +1,206 @@
+"""
+Non-blocking logging for the audio hot path.
+
+`logging.basicConfig` with a `FileHandler` and `StreamHandler` writes on the
+event loop thread, so a slow disk or a piped stdout stalls every call's audio.
+`setup_logging` installs a single bounded `QueueHandler` on the root logger
+and moves the real handlers to a `QueueListener` thread. When the queue is
+full records are dropped (and counted) rather than blocking the loop.
+
+Per-call fields (stream_sid, turn_id) ride on a `CallLogger` adapter, and
+high-frequency messages opt into rate limiting by passing
+`extra={"rate_key": ...}`: at most one such record per key and call is
+emitted per interval, with the number suppressed appended to the next one.
+
+Environment:
+    LOG_LEVEL       INFO by default
+    LOG_FORMAT      "text" (default) or "json" (one JSON object per line)
+    LOG_QUEUE_SIZE  records buffered before dropping (default 10000)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+CALL_FIELDS = ("stream_sid", "turn_id")
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(call)s%(message)s"
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records that do not fit are dropped."""
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through one record per (rate_key, stream_sid) every `interval_s`.
+
+    Records without a `rate_key` attribute always pass.
+    """
+
+    def __init__(self, interval_s=5.0, clock=time.monotonic):
+        super().__init__()
+        self.interval_s = interval_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = {}  # key -> [last_emit, suppressed]
+        self.suppressed = 0
+
+    def filter(self, record):
+        rate_key = getattr(record, "rate_key", None)
+        if rate_key is None:
+            return True
+        key = (rate_key, getattr(record, "stream_sid", None))
+        now = self._clock()
+        with self._lock:
+            state = self._state.get(key)
+            if state is not None and now - state[0] < self.interval_s:
+                state[1] += 1
+                self.suppressed += 1
+                return False
+            skipped = state[1] if state is not None else 0
+            self._state[key] = [now, 0]
+        if skipped:
+            record.msg = f"{record.msg} (+{skipped} suppressed)"
+        return True
+
+    def forget(self, stream_sid):
+        """Drop per-key state for a finished call."""
+        with self._lock:
+            for key in [k for k in self._state if k[1] == stream_sid]:
+                del self._state[key]
+
+
+class CallContextFilter(logging.Filter):
+    """Fills missing call fields and the `call` prefix used by the text format."""
+
+    def filter(self, record):
+        for field in CALL_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, None)
+        if record.stream_sid is None:
+            record.call = ""
+        elif record.turn_id is None:
+            record.call = f"[{record.stream_sid[:8]}] "
+        else:
+            record.call = f"[{record.stream_sid[:8]}#{record.turn_id}] "
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in CALL_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class CallLogger(logging.LoggerAdapter):
+    """Logger adapter carrying per-call fields; update them with `bind()`."""
+
+    def __init__(self, logger, stream_sid=None, turn_id=None):
+        super().__init__(logger, {"stream_sid": stream_sid, "turn_id": turn_id})
+
+    def bind(self, **fields):
+        self.extra.update(fields)
+        return self
+
+    def process(self, msg, kwargs):
+        extra = kwargs.get("extra")
+        kwargs["extra"] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
+
+class LoggingRuntime:
+    """Handles returned by `setup_logging`: the listener thread and counters."""
+
+    def __init__(self, handler, listener, rate_limiter, log_file):
+        self.handler = handler
+        self.listener = listener
+        self.rate_limiter = rate_limiter
+        self.log_file = log_file
+
+    def stats(self) -> dict:
+        return {
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "rate_limited": self.rate_limiter.suppressed,
+            "queued": self.handler.queue.qsize(),
+        }
+
+    def stop(self):
+        """Flush queued records and join the listener thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+def setup_logging(log_dir="logs", level=None, fmt=None, queue_size=None, stream=sys.stdout, rate_interval_s=5.0):
+    """Route all logging through a bounded queue to file + stream handlers on a thread."""
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    fmt = fmt or os.getenv("LOG_FORMAT", "text")
+    queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unknown LOG_FORMAT {fmt!r}, expected 'text' or 'json'")
+
+    formatter = JsonLinesFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    log_file = None
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        ext = "jsonl" if fmt == "json" else "log"
+        # The pid keeps workers started in the same second (serve.py --workers N) in separate files
+        log_file = os.path.join(log_dir, f"pipeline_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{os.getpid()}.{ext}")
+        handlers.append(logging.FileHandler(log_file))
+    if stream is not None:
+        handlers.append(logging.StreamHandler(stream))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    rate_limiter = RateLimitFilter(rate_interval_s)
+    queue_handler = DroppingQueueHandler(queue.Queue(queue_size))
+    # Rate limiting and call fields are resolved before enqueueing so suppressed records cost no queue slot
+    queue_handler.addFilter(rate_limiter)
+    queue_handler.addFilter(CallContextFilter())
+    listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener.start()
+
+    runtime = LoggingRuntime(queue_handler, listener, rate_limiter, log_file)
+    atexit.register(runtime.stop)
+    return runtime
@@ -0,0 +1,189 @@
+"""
+Prometheus metrics for the voice router.
+
+Everything here is recorded from the event loop thread, several times per
+20ms frame per call, so the metric types are loop-local: a counter is an
+int add, a histogram observation is a `bisect` plus two adds, and nothing
+takes a lock. `VoiceRouterMetrics` is a prometheus_client collector that turns
+those accumulators into metric families only when /metrics is scraped.
+
+Queue depth gauges are read at scrape time from the `AudioQueue`s passed to
+`track_queue`, so the per-frame path never touches them.
+"""
+import bisect
+import time
+import weakref
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+
+# Per-frame DSP and encode work: 1us .. 10ms
+STAGE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2)
+# Playout wakeup lateness: 0.1ms .. 100ms
+JITTER_BUCKETS = (1e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 0.1)
+# Connects and conversational latencies: 10ms .. 10s
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+perf_counter = time.perf_counter
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram; `observe` is O(log buckets) with no allocation."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def observe_since(self, start):
+        """Observe `perf_counter() - start`; pairs with `start = perf_counter()`."""
+        self.observe(perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def cumulative_buckets(self):
+        total = 0
+        buckets = []
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            total += n
+            buckets.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return buckets
+
+
+class Family:
+    """A named metric and its children, one per label-value tuple."""
+
+    def __init__(self, kind, name, documentation, labelnames=(), buckets=None):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children = {}
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = Histogram(self.buckets) if self.kind == "histogram" else (Counter() if self.kind == "counter" else Gauge())
+            self._children[values] = child
+        return child
+
+    def children(self):
+        return self._children.items()
+
+
+class VoiceRouterMetrics:
+    """All router metrics; register with a prometheus_client registry to export."""
+
+    def __init__(self, namespace="voice_router"):
+        self.namespace = namespace
+        self._families = []
+        self._queues = weakref.WeakSet()
+
+        self.active_calls = self._add("gauge", "active_calls", "Calls currently connected to /ws/exotel").labels()
+        self.frames = self._add("counter", "frames", "Audio frames handled, by direction (in = from caller, out = to caller)", ("direction",))
+        self.queue_dropped_bytes = self._add("counter", "queue_dropped_bytes", "Audio bytes dropped by full call queues", ("queue",))
+        self.stage_seconds = self._add("histogram", "stage_seconds", "Audio processing time per packet/chunk/frame, by stage", ("stage",), STAGE_BUCKETS)
+        self.send_jitter_seconds = self._add("histogram", "send_jitter_seconds", "Playout tick lateness against the 20ms grid", (), JITTER_BUCKETS).labels()
+        self.gemini_connect_seconds = self._add("histogram", "gemini_connect_seconds", "Time to obtain a Gemini Live session", ("mode",), LATENCY_BUCKETS)
+        self.response_latency_seconds = self._add(
+            "histogram", "response_latency_seconds", "End of caller speech to first Gemini response audio", (), LATENCY_BUCKETS).labels()
+        self.interruption_clear_seconds = self._add(
+            "histogram", "interruption_clear_seconds", "Gemini interruption event to Exotel clear sent", (), LATENCY_BUCKETS).labels()
+        self.uplink_suppressed_seconds = self._add(
+            "counter", "uplink_suppressed_seconds", "Caller audio seconds the uplink gate did not send to Gemini", ()).labels()
+        self.barge_ins = self._add("counter", "barge_ins", "Reply playback cleared because the caller spoke, by detector", ("source",))
+        self.jitter_events = self._add(
+            "counter", "jitter_events", "Playout jitter buffer underruns (ran dry mid-turn) and overruns (audio dropped when full)", ("event",))
+
+        # Children used on the per-frame path, resolved once
+        self.frames_in = self.frames.labels("in")
+        self.frames_out = self.frames.labels("out")
+        self.resample_in = self.stage_seconds.labels("resample_in")
+        self.resample_out = self.stage_seconds.labels("resample_out")
+        self.mix = self.stage_seconds.labels("mix")
+        self.encode = self.stage_seconds.labels("encode")
+
+    def _add(self, kind, name, documentation, labelnames=(), buckets=None):
+        family = Family(kind, f"{self.namespace}_{name}", documentation, labelnames, buckets)
+        self._families.append(family)
+        return family
+
+    def track_queue(self, queue):
+        """Report `queue.nbytes` under `voice_router_queue_bytes{queue=<name>}` while it is alive."""
+        self._queues.add(queue)
+
+    def record_queue_drops(self, queue):
+        """Fold a finished call's queue drop count into the process totals."""
+        self.queue_dropped_bytes.labels(queue.name).inc(queue.dropped_bytes)
+
+    def record_jitter(self, jitter):
+        """Fold a finished call's jitter buffer underruns/overruns into the process totals."""
+        self.jitter_events.labels("underrun").inc(jitter.underruns)
+        self.jitter_events.labels("overrun").inc(jitter.overruns)
+
+    def collect(self):
+        for family in self._families:
+            if family.kind == "histogram":
+                metric = HistogramMetricFamily(family.name, family.documentation, labels=family.labelnames)
+                for values, child in family.children():
+                    metric.add_metric(list(values), child.cumulative_buckets(), child.sum)
+            else:
+                cls = CounterMetricFamily if family.kind == "counter" else GaugeMetricFamily
+                metric = cls(family.name, family.documentation, labels=family.labelnames)
+                for values, child in family.children():
+                    metric.add_metric(list(values), child.value)
+            yield metric
+
+        depth = GaugeMetricFamily(f"{self.namespace}_queue_bytes", "Audio bytes waiting in call queues", labels=["queue"])
+        totals = {}
+        for queue in list(self._queues):
+            totals[queue.name] = totals.get(queue.name, 0) + queue.nbytes
+        for name, nbytes in sorted(totals.items()):
+            depth.add_metric([name], nbytes)
+        yield depth
+
+
+# Process-wide instance; pipeline.py registers it with prometheus_client's REGISTRY
+METRICS = VoiceRouterMetrics()
+
+
+def render_latest(registry=REGISTRY):
+    """Body and content type for a /metrics response."""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
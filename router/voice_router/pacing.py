@@ -0,0 +1,106 @@
+"""
+Monotonic-deadline frame pacing for outbound call audio.
+
+`asyncio.sleep(0.02)` after every send lets the time spent resampling, mixing
+and sending accumulate, so the cadence drifts below 50 fps on a loaded box.
+`FrameClock` instead keeps an ideal deadline grid (t0, t0 + 20ms, ...) and
+sleeps only until the next slot, bursting to catch up when a little late and
+skipping slots when too far behind to recover.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class PacingStats:
+    """Per-clock counters, cheap to update once per frame."""
+    frames: int = 0
+    late_frames: int = 0
+    skipped_frames: int = 0
+    jitter_total: float = 0.0
+    jitter_max: float = 0.0
+    last_jitter: float = 0.0
+
+    def record(self, lateness, late_threshold):
+        """Count one frame that went out `lateness` seconds after its slot."""
+        self.frames += 1
+        jitter = abs(lateness)
+        self.last_jitter = jitter
+        self.jitter_total += jitter
+        if jitter > self.jitter_max:
+            self.jitter_max = jitter
+        if lateness > late_threshold:
+            self.late_frames += 1
+
+    @property
+    def jitter_avg_ms(self) -> float:
+        return (self.jitter_total / self.frames) * 1000 if self.frames else 0.0
+
+    @property
+    def jitter_max_ms(self) -> float:
+        return self.jitter_max * 1000
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "late_frames": self.late_frames,
+            "skipped_frames": self.skipped_frames,
+            "jitter_avg_ms": round(self.jitter_avg_ms, 3),
+            "jitter_max_ms": round(self.jitter_max_ms, 3),
+        }
+
+
+class FrameClock:
+    """Paces fixed-duration frames against a monotonic deadline grid.
+
+    Call `await clock.wait()` before emitting each frame. A frame is counted as
+    late when the wakeup misses its deadline by more than `late_threshold_ms`.
+    If the clock falls more than `max_lag_frames` behind, the missed slots are
+    dropped instead of being sent in a burst.
+    """
+
+    def __init__(self, frame_ms=20, max_lag_frames=5, late_threshold_ms=5.0,
+                 clock=time.monotonic, sleep=asyncio.sleep):
+        self.interval = frame_ms / 1000
+        self.max_lag = max_lag_frames * self.interval
+        self.late_threshold = late_threshold_ms / 1000
+        self._clock = clock
+        self._sleep = sleep
+        self._deadline = None
+        self.stats = PacingStats()
+
+    def reset(self, now=None):
+        """Restart the deadline grid at `now` (defaults to the current time)."""
+        self._deadline = self._clock() if now is None else now
+
+    @property
+    def deadline(self):
+        return self._deadline
+
+    def now(self):
+        return self._clock()
+
+    async def wait(self) -> int:
+        """Sleep until the next frame slot; returns the number of slots skipped."""
+        now = self._clock()
+        if self._deadline is None:
+            self._deadline = now
+        delay = self._deadline - now
+        if delay > 0:
+            await self._sleep(delay)
+            now = self._clock()
+        return self._advance(now - self._deadline)
+
+    def _advance(self, lateness) -> int:
+        self.stats.record(lateness, self.late_threshold)
+
+        skipped = 0
+        if lateness > self.max_lag:
+            # Too far behind to catch up without an audible burst: drop the
+            # missed slots and realign the grid with the current slot.
+            skipped = int(lateness // self.interval)
+            self.stats.skipped_frames += skipped
+            self._deadline += skipped * self.interval
+        self._deadline += self.interval
+        return skipped
@@ -0,0 +1,191 @@
+"""
+Process-wide playout engine shared by every active call.
+
+Instead of one 20ms sender loop (timer, wakeup, pacing) per websocket, a single
+`PlayoutEngine` ticks on a `FrameClock`, pulls the next frame from every
+registered call in one synchronous batch, and starts each call's send as its
+own task. A call whose previous send is still in flight is skipped for that
+tick, so a slow carrier connection only ever holds back itself. Each session
+keeps its own pacing stats, measured from the tick's slot to the moment its
+send starts, so a call's late frames and jitter survive the shared clock.
+
+Frames returned as `MixFrame`s are mixed together by the engine's
+`DspExecutor` (inline by default, or on a thread/process pool) before they
+are sent.
+"""
+import asyncio
+import logging
+
+from .dsp_executor import DspExecutor, MixFrame
+from .metrics import METRICS, perf_counter
+from .pacing import FrameClock, PacingStats
+
+logger = logging.getLogger(__name__)
+
+
+class PlayoutSession:
+    """A call registered with the engine.
+
+    `next_frame()` is called once per tick and must not block; it returns the
+    frame to send, a `MixFrame` to be mixed first, or None to send nothing
+    this tick. `send(frame)` is awaited
+    to deliver it.
+    """
+
+    def __init__(self, name, next_frame, send):
+        self.name = name
+        self.next_frame = next_frame
+        self.send = send
+        self.inflight = False
+        self.frames_sent = 0
+        self.busy_ticks = 0
+        self.send_errors = 0
+        self.pacing = PacingStats()
+        self._closed = asyncio.Event()
+
+    def close(self):
+        """Mark the session finished; the engine drops it on its next tick."""
+        self._closed.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    def stats(self) -> dict:
+        return {
+            "frames_sent": self.frames_sent,
+            "busy_ticks": self.busy_ticks,
+            "send_errors": self.send_errors,
+        }
+
+
+class PlayoutEngine:
+    """Single ticker that serves the next frame of every registered call."""
+
+    def __init__(self, frame_ms=20, clock=None, dsp=None):
+        self.clock = clock or FrameClock(frame_ms=frame_ms)
+        self.dsp = dsp or DspExecutor()
+        self.sessions = []
+        self._task = None
+        self._sends = set()
+
+    def register(self, name, next_frame, send) -> PlayoutSession:
+        session = PlayoutSession(name, next_frame, send)
+        self.sessions.append(session)
+        if self._task is None or self._task.done():
+            self.clock.reset()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return session
+
+    def unregister(self, session):
+        session.close()
+        try:
+            self.sessions.remove(session)
+        except ValueError:
+            pass
+
+    async def stop(self):
+        for session in list(self.sessions):
+            self.unregister(session)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        logger.info("🔊 Playout engine started")
+        try:
+            # Stop ticking once the last call leaves; the next register restarts us.
+            while self.sessions:
+                skipped = await self.clock.wait()
+                METRICS.send_jitter_seconds.observe(self.clock.stats.last_jitter)
+                if skipped:
+                    for session in self.sessions:
+                        session.pacing.skipped_frames += skipped
+                self.tick()
+        finally:
+            logger.info(f"🛑 Playout engine stopped, pacing stats: {self.clock.stats.as_dict()}")
+
+    def tick(self):
+        """Collect one frame per ready call and dispatch all sends together."""
+        slot = self.clock.now() if self.clock.deadline is None else self.clock.deadline - self.clock.interval
+        batch = []
+        to_mix = []
+        for session in self.sessions:
+            if session.closed:
+                continue
+            if session.inflight:
+                session.busy_ticks += 1
+                continue
+            try:
+                frame = session.next_frame()
+            except Exception as e:
+                logger.error(f"❌ Playout frame error for {session.name}: {e}")
+                continue
+            if frame is not None:
+                session.inflight = True
+                (to_mix if isinstance(frame, MixFrame) else batch).append((session, frame))
+        if any(s.closed for s in self.sessions):
+            self.sessions = [s for s in self.sessions if not s.closed]
+        if to_mix:
+            if self.dsp.inline:
+                started = perf_counter()
+                batch.extend(self._mixed(to_mix, self.dsp.mix_now([f for _, f in to_mix])))
+                METRICS.mix.observe((perf_counter() - started) / len(to_mix))
+            else:
+                self._spawn(self._mix_and_deliver(to_mix, slot))
+        self._deliver(batch, slot)
+        return len(batch) + len(to_mix)
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    def _mixed(self, to_mix, frames):
+        return [(session, frame) for (session, _), frame in zip(to_mix, frames)]
+
+    async def _mix_and_deliver(self, to_mix, slot):
+        started = perf_counter()
+        try:
+            frames = await self.dsp.mix([f for _, f in to_mix])
+        except Exception as e:
+            logger.error(f"❌ Playout mix failed for {len(to_mix)} frame(s): {e}")
+            for session, _ in to_mix:
+                session.inflight = False
+            return
+        METRICS.mix.observe((perf_counter() - started) / len(to_mix))
+        self._deliver(self._mixed(to_mix, frames), slot)
+
+    def _deliver(self, batch, slot):
+        for session, frame in batch:
+            self._spawn(self._send(session, frame, slot))
+
+    async def _send(self, session, frame, slot):
+        session.pacing.record(self.clock.now() - slot, self.clock.late_threshold)
+        try:
+            await session.send(frame)
+            session.frames_sent += 1
+        except Exception as e:
+            session.send_errors += 1
+            if session.send_errors == 1:
+                logger.error(f"❌ Playout send failed for {session.name}: {e}")
+        finally:
+            session.inflight = False
+
+
+_engine = None
+
+
+def get_playout_engine(dsp=None) -> PlayoutEngine:
+    """Return the process-wide engine, creating it (with `dsp`) on first use."""
+    global _engine
+    if _engine is None:
+        _engine = PlayoutEngine(dsp=dsp)
+    return _engine
@@ -0,0 +1,163 @@
+"""
+Versioned system-prompt registry.
+
+Prompts live as files under `router/prompts/<name>/<version>.md` and are
+loaded and linted once at startup. The lint rejects a prompt that repeats a
+section (same heading or same body) or a long instruction line, which is how
+the inline AstroVoice prompt ended up shipped twice and paid for twice in
+input tokens. Each prompt carries an id like `astrovoice@v1` that is attached
+to per-session token accounting.
+
+Lint every prompt from the command line (from router/):
+    python -m voice_router.prompts
+"""
+import hashlib
+import logging
+import os
+import re
+import sys
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+# Lines shorter than this (e.g. "1.", short headings) may legitimately repeat
+MIN_DUPLICATE_LINE_CHARS = 40
+
+
+class PromptLintError(ValueError):
+    """Raised when a prompt file fails validation."""
+
+
+@dataclass(frozen=True)
+class Prompt:
+    name: str
+    version: str
+    text: str
+    path: str
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}@{self.version}"
+
+    @property
+    def sha(self) -> str:
+        return hashlib.sha256(self.text.encode()).hexdigest()[:12]
+
+    @property
+    def approx_tokens(self) -> int:
+        # ~4 characters per token for English text; good enough to compare versions
+        return len(self.text) // 4
+
+
+def _normalize(line):
+    return re.sub(r"\s+", " ", line).strip().lower()
+
+
+def split_sections(text):
+    """Split on blank lines; returns (heading, body_lines) per block."""
+    sections = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        lines = [line for line in block.splitlines() if line.strip()]
+        if lines:
+            sections.append((lines[0], lines[1:]))
+    return sections
+
+
+def lint_prompt(text):
+    """Return a list of human-readable problems; empty means the prompt is clean."""
+    problems = []
+    if not text.strip():
+        return ["prompt is empty"]
+
+    seen_headings, seen_bodies = {}, {}
+    for i, (heading, body) in enumerate(split_sections(text)):
+        key = _normalize(heading)
+        if key in seen_headings:
+            problems.append(f"section {i + 1} repeats heading {heading.strip()!r} from section {seen_headings[key] + 1}")
+        else:
+            seen_headings[key] = i
+        body_key = "\n".join(_normalize(line) for line in body)
+        if body_key and body_key in seen_bodies:
+            problems.append(f"section {i + 1} repeats the body of section {seen_bodies[body_key] + 1}")
+        elif body_key:
+            seen_bodies[body_key] = i
+
+    seen_lines = {}
+    for n, line in enumerate(text.splitlines(), start=1):
+        key = _normalize(line)
+        if len(key) < MIN_DUPLICATE_LINE_CHARS:
+            continue
+        if key in seen_lines:
+            problems.append(f"line {n} duplicates line {seen_lines[key]}: {line.strip()[:60]!r}")
+        else:
+            seen_lines[key] = n
+    return problems
+
+
+def _version_key(version):
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)]
+
+
+class PromptRegistry:
+    """All prompt versions found under `root`, validated when loaded."""
+
+    def __init__(self, root=DEFAULT_PROMPT_DIR):
+        self.root = root
+        self._prompts = {}
+
+    def load(self):
+        """Read and lint every `<name>/<version>.md`; raises PromptLintError on any problem."""
+        prompts, errors = {}, []
+        for name in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, name)
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                version, ext = os.path.splitext(filename)
+                if ext != ".md":
+                    continue
+                path = os.path.join(directory, filename)
+                with open(path, encoding="utf-8") as f:
+                    prompt = Prompt(name, version, f.read().strip() + "\n", path)
+                errors.extend(f"{prompt.id}: {problem}" for problem in lint_prompt(prompt.text))
+                prompts.setdefault(name, {})[version] = prompt
+        if errors:
+            raise PromptLintError("Prompt lint failed:\n  " + "\n  ".join(errors))
+        self._prompts = prompts
+        return self
+
+    def versions(self, name):
+        return sorted(self._prompts.get(name, {}), key=_version_key)
+
+    def get(self, name, version=None) -> Prompt:
+        """Return `version` of prompt `name`, or its latest version when None."""
+        versions = self._prompts.get(name)
+        if not versions:
+            raise KeyError(f"Unknown prompt {name!r} in {self.root}")
+        version = version or self.versions(name)[-1]
+        if version not in versions:
+            raise KeyError(f"Unknown version {version!r} for prompt {name!r}; have {self.versions(name)}")
+        return versions[version]
+
+    def __iter__(self):
+        for name in sorted(self._prompts):
+            for version in self.versions(name):
+                yield self._prompts[name][version]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    root = argv[0] if argv else DEFAULT_PROMPT_DIR
+    try:
+        registry = PromptRegistry(root).load()
+    except PromptLintError as e:
+        print(f"❌ {e}")
+        return 1
+    for prompt in registry:
+        print(f"✅ {prompt.id:<24} sha={prompt.sha} ~{prompt.approx_tokens} tokens")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
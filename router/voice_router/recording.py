@@ -0,0 +1,154 @@
+"""
+Compact binary call captures for offline replay.
+
+With `RECORD_DIR` set, `/ws/exotel` records each call into
+`<RECORD_DIR>/<stream_sid>_<time>.vrcap`: inbound caller PCM, Gemini reply
+audio, outbound frames and control events, each stamped with seconds since
+the call connected. Records are appended to an in-memory buffer on the loop
+(one struct pack and a copy) and handed to a shared writer thread in
+`flush_bytes` blocks, so recording never does file I/O on the event loop.
+
+File layout: `MAGIC`, then records of `<f8 seconds><u1 kind><u4 length>`
+followed by `length` payload bytes. Event payloads are compact JSON.
+`replay_call.py` feeds a capture back through a running router.
+"""
+import json
+import logging
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VRCAP\x01"
+INBOUND = 1  # caller PCM16 8kHz packet, as received from Exotel
+OUTBOUND = 2  # PCM16 8kHz frame sent to Exotel
+GEMINI_AUDIO = 3  # PCM16 24kHz chunk from Gemini
+EVENT = 4  # JSON control event
+KINDS = {INBOUND: "inbound", OUTBOUND: "outbound", GEMINI_AUDIO: "gemini_audio", EVENT: "event"}
+_HEADER = struct.Struct("<dBI")
+
+
+class CaptureWriter:
+    """One background thread appending capture blocks to their files."""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="capture-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path, data):
+        self._queue.put((path, data))
+
+    def close_file(self, path):
+        self._queue.put((path, None))
+
+    def _write_loop(self):
+        files = {}
+        while True:
+            path, data = self._queue.get()
+            if path is None:
+                break
+            try:
+                if data is None:
+                    f = files.pop(path, None)
+                    if f is not None:
+                        f.close()
+                    continue
+                f = files.get(path)
+                if f is None:
+                    f = files[path] = open(path, "ab")
+                f.write(data)
+            except Exception as e:
+                logger.error(f"❌ Failed to write call capture {path}: {e}")
+        for f in files.values():
+            f.close()
+
+    def stop(self):
+        self._queue.put((None, None))
+        self._thread.join(timeout=5)
+
+
+_writer = None
+
+
+def get_capture_writer() -> CaptureWriter:
+    global _writer
+    if _writer is None:
+        _writer = CaptureWriter()
+    return _writer
+
+
+class CallRecorder:
+    """Records one call; every method is cheap enough for the per-frame path."""
+
+    def __init__(self, path, writer=None, clock=time.monotonic, flush_bytes=64 * 1024):
+        self.path = path
+        self._writer = writer or get_capture_writer()
+        self._clock = clock
+        self._t0 = clock()
+        self.flush_bytes = flush_bytes
+        self._buf = bytearray(MAGIC)
+        self.records = 0
+        self.bytes = len(MAGIC)
+
+    @classmethod
+    def for_call(cls, directory, name="call", **kwargs):
+        # `name` is the caller-supplied stream_sid: keep it to one plain path component
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", name or "call")[:64]
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{os.getpid()}.vrcap")
+        return cls(path, **kwargs)
+
+    def record(self, kind, payload):
+        self._buf += _HEADER.pack(self._clock() - self._t0, kind, len(payload))
+        self._buf += payload
+        self.records += 1
+        self.bytes += _HEADER.size + len(payload)
+        if len(self._buf) >= self.flush_bytes:
+            self.flush()
+
+    def inbound(self, pcm):
+        self.record(INBOUND, pcm)
+
+    def outbound(self, frame):
+        self.record(OUTBOUND, frame)
+
+    def gemini_audio(self, data):
+        self.record(GEMINI_AUDIO, data)
+
+    def event(self, name, **fields):
+        self.record(EVENT, json.dumps({"event": name, **fields}, separators=(",", ":")).encode())
+
+    def flush(self):
+        if self._buf:
+            self._writer.write(self.path, bytes(self._buf))
+            self._buf.clear()
+
+    def close(self):
+        self.flush()
+        self._writer.close_file(self.path)
+
+    def stats(self) -> dict:
+        return {"path": self.path, "records": self.records, "bytes": self.bytes}
+
+
+def read_capture(path):
+    """Yield (seconds, kind, payload) records; event payloads are decoded to dicts."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a call capture")
+    offset = len(MAGIC)
+    while offset + _HEADER.size <= len(data):
+        t, kind, length = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        payload = data[offset:offset + length]
+        if len(payload) < length:
+            break  # truncated by a crash mid-write
+        offset += length
+        yield t, kind, json.loads(payload) if kind == EVENT else payload
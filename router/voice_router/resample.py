@@ -0,0 +1,97 @@
+"""
+Stateful streaming resamplers for 16-bit mono PCM.
+
+Calling `audioop.ratecv(..., None)` per 20ms packet throws the filter state
+away, so every chunk boundary restarts the filter (clicks) and redoes setup.
+Each resampler here is created once per call and direction and carries its
+state across chunks, so feeding a stream chunk-by-chunk produces the same
+samples as resampling it in one shot.
+
+Backends:
+    numpy    - windowed-sinc polyphase FIR for any rational ratio (asr.audio_dsp; default)
+    audioop  - audioop.ratecv with its state threaded through; audioop is
+               imported only when this backend is used (it is gone in Python 3.13)
+    integer  - cheap fixed-ratio path: linear interpolation up / block mean down
+"""
+import numpy as np
+
+from asr.audio_dsp import PolyphaseResampler
+
+BACKENDS = ("numpy", "audioop", "integer")
+
+
+def _to_int16_bytes(samples):
+    return np.clip(np.rint(samples), -32768, 32767).astype(np.int16).tobytes()
+
+
+class AudioopResampler:
+    """audioop.ratecv with the filter state kept between chunks."""
+
+    def __init__(self, in_rate, out_rate):
+        import audioop
+
+        self._ratecv = audioop.ratecv
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self._state = None
+
+    def process(self, pcm_bytes: bytes) -> bytes:
+        out, self._state = self._ratecv(pcm_bytes, 2, 1, self.in_rate, self.out_rate, self._state)
+        return out
+
+    def reset(self):
+        self._state = None
+
+
+class IntegerRatioResampler:
+    """Fixed integer-ratio path (e.g. 8k->16k x2, 24k->8k /3).
+
+    Upsampling linearly interpolates from the previous sample (one sample of
+    delay); downsampling averages each block of `down` samples and carries the
+    remainder into the next chunk.
+    """
+
+    def __init__(self, in_rate, out_rate):
+        if out_rate % in_rate and in_rate % out_rate:
+            raise ValueError(f"integer backend needs an integer ratio, got {in_rate}->{out_rate}")
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = max(1, out_rate // in_rate)
+        self.down = max(1, in_rate // out_rate)
+        self._ramp = np.arange(self.up) / self.up
+        self.reset()
+
+    def reset(self):
+        self._last = 0.0
+        self._carry = np.zeros(0, dtype=np.int16)
+
+    def process(self, pcm_bytes: bytes) -> bytes:
+        x = np.frombuffer(pcm_bytes, dtype=np.int16)
+        if self.up > 1:
+            if not len(x):
+                return b""
+            xf = x.astype(np.float64)
+            prev = np.empty_like(xf)
+            prev[0] = self._last
+            prev[1:] = xf[:-1]
+            self._last = xf[-1]
+            y = prev[:, None] + (xf - prev)[:, None] * self._ramp
+            return _to_int16_bytes(y.ravel())
+        if self.down > 1:
+            if len(self._carry):
+                x = np.concatenate((self._carry, x))
+            whole = len(x) - len(x) % self.down
+            self._carry = x[whole:].copy()
+            return _to_int16_bytes(x[:whole].reshape(-1, self.down).mean(axis=1))
+        return pcm_bytes
+
+
+def create_resampler(in_rate, out_rate, backend="numpy"):
+    """Return a per-stream resampler for the given backend name."""
+    if backend == "audioop":
+        return AudioopResampler(in_rate, out_rate)
+    if backend == "numpy":
+        return PolyphaseResampler(in_rate, out_rate)
+    if backend == "integer":
+        return IntegerRatioResampler(in_rate, out_rate)
+    raise ValueError(f"Unknown resampler backend {backend!r}, expected one of {BACKENDS}")
@@ -0,0 +1,268 @@
+"""
+Per-turn latency tracing across the call pipeline.
+
+A `CallTracer` follows the caller's last loud packet of an utterance and the
+first chunk of Gemini's reply through every stage boundary, stamping
+monotonic times:
+
+    received        Exotel media frame read from the websocket
+    dequeued        taken off audio_in_queue by process_audio_input
+    resampled       8kHz -> 16kHz done
+    uplink_sent     the frame containing it was sent to Gemini
+    response_audio  first audio of Gemini's reply received
+    out_dequeued    that chunk taken off audio_out_queue by the playout engine
+    frame_sent      first frame of it written to the Exotel websocket
+
+Consecutive boundaries define the stages in `STAGES` (in_queue also covers
+JSON and base64 decode). A turn with no new caller speech, e.g. the greeting,
+only has the response-side stages. Finished turns are logged as one
+`🧭 Turn trace` line and, when a `SpanExporter` is attached, written as
+OpenTelemetry (OTLP/JSON) spans, one export request per line.
+
+Summarize a trace file or pipeline log (from router/):
+    python -m voice_router.tracing traces.jsonl logs/pipeline_*.log
+"""
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+BOUNDARIES = ("received", "dequeued", "resampled", "uplink_sent", "response_audio", "out_dequeued", "frame_sent")
+STAGES = ("in_queue", "resample_in", "uplink_send", "gemini", "out_queue", "playout")
+TRACE_LOG_MARKER = "🧭 Turn trace "
+
+
+class TurnTrace:
+    """Boundary stamps for one conversational turn."""
+
+    __slots__ = ("call_id", "turn_id", "stamps")
+
+    def __init__(self, call_id, turn_id, stamps=None):
+        self.call_id = call_id
+        self.turn_id = turn_id
+        self.stamps = dict(stamps or {})
+
+    def mark(self, boundary, t):
+        self.stamps[boundary] = t
+
+    @property
+    def complete(self) -> bool:
+        return "frame_sent" in self.stamps
+
+    def stages(self) -> dict:
+        """Seconds spent in each stage whose two boundaries were stamped."""
+        out = {}
+        for stage, start, end in zip(STAGES, BOUNDARIES, BOUNDARIES[1:]):
+            if start in self.stamps and end in self.stamps:
+                out[stage] = self.stamps[end] - self.stamps[start]
+        return out
+
+    def total(self):
+        present = [self.stamps[b] for b in BOUNDARIES if b in self.stamps]
+        return present[-1] - present[0] if len(present) > 1 else None
+
+    def summary(self) -> dict:
+        total = self.total()
+        return {
+            "call": self.call_id,
+            "turn": self.turn_id,
+            "complete": self.complete,
+            "total_ms": None if total is None else round(total * 1000, 3),
+            "stages_ms": {k: round(v * 1000, 3) for k, v in self.stages().items()},
+        }
+
+
+class CallTracer:
+    """Threads trace stamps through one call's tasks; every hook is O(1)."""
+
+    def __init__(self, call_id=None, exporter=None, clock=time.monotonic):
+        self.call_id = call_id
+        self.exporter = exporter
+        self._clock = clock
+        self._candidate = None  # stamps of the latest loud packet not yet sent upstream
+        self._speech = None  # stamps of the latest loud packet sent upstream
+        self._answered = None
+        self._turn = None
+        self._out_stamp = None
+        self._awaiting_send = False
+        self.turns = 0
+
+    def uplink_packet(self, received, dequeued, resampled, loud):
+        if loud:
+            self._candidate = {"received": received, "dequeued": dequeued, "resampled": resampled}
+
+    def uplink_sent(self):
+        if self._candidate is not None:
+            self._candidate["uplink_sent"] = self._clock()
+            self._speech, self._candidate = self._candidate, None
+
+    def response_audio(self, turn_id, stamp):
+        """First audio of Gemini turn `turn_id`, enqueued on audio_out_queue with `stamp`."""
+        if self._turn is not None:
+            self._finish()
+        stamps = {}
+        if self._speech is not None and self._speech is not self._answered:
+            stamps, self._answered = self._speech, self._speech
+        self._turn = TurnTrace(self.call_id, turn_id, stamps)
+        self._turn.mark("response_audio", stamp)
+        self._out_stamp = stamp
+
+    def response_dequeued(self, stamp):
+        if self._out_stamp is not None and stamp == self._out_stamp:
+            self._out_stamp = None
+            self._turn.mark("out_dequeued", self._clock())
+            self._awaiting_send = True
+
+    def frame_sent(self):
+        if self._awaiting_send:
+            self._awaiting_send = False
+            self._turn.mark("frame_sent", self._clock())
+            self._finish()
+
+    def close(self):
+        """Emit a turn still in flight (e.g. interrupted before playout)."""
+        if self._turn is not None:
+            self._finish()
+
+    def _finish(self):
+        turn, self._turn = self._turn, None
+        self._out_stamp = None
+        self._awaiting_send = False
+        self.turns += 1
+        logger.info(TRACE_LOG_MARKER + json.dumps(turn.summary(), separators=(",", ":")))
+        if self.exporter is not None:
+            self.exporter.export(turn)
+
+
+def _attr(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class SpanExporter:
+    """Writes turns as OTLP/JSON trace export requests, one per line, from a writer thread."""
+
+    def __init__(self, path, service_name="voice-router"):
+        self.path = path
+        self.service_name = service_name
+        # Maps monotonic stamps onto the wall clock OTLP expects
+        self._offset_ns = time.time_ns() - time.monotonic_ns()
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def _ns(self, t):
+        return str(int(t * 1e9) + self._offset_ns)
+
+    def to_otlp(self, turn) -> dict:
+        trace_id = os.urandom(16).hex()
+        root_id = os.urandom(8).hex()
+        present = [b for b in BOUNDARIES if b in turn.stamps]
+        attrs = [_attr("call.id", turn.call_id or ""), _attr("turn.id", turn.turn_id), _attr("turn.complete", turn.complete)]
+        spans = [{
+            "traceId": trace_id, "spanId": root_id, "name": "turn", "kind": 1,
+            "startTimeUnixNano": self._ns(turn.stamps[present[0]]),
+            "endTimeUnixNano": self._ns(turn.stamps[present[-1]]),
+            "attributes": attrs,
+        }]
+        for stage, start, end in zip(STAGES, BOUNDARIES, BOUNDARIES[1:]):
+            if start in turn.stamps and end in turn.stamps:
+                spans.append({
+                    "traceId": trace_id, "spanId": os.urandom(8).hex(), "parentSpanId": root_id,
+                    "name": stage, "kind": 1,
+                    "startTimeUnixNano": self._ns(turn.stamps[start]),
+                    "endTimeUnixNano": self._ns(turn.stamps[end]),
+                    "attributes": attrs[:2],
+                })
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attr("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "voice_router.tracing"}, "spans": spans}],
+        }]}
+
+    def export(self, turn):
+        self._queue.put(turn)
+
+    def _write_loop(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                turn = self._queue.get()
+                if turn is None:
+                    return
+                try:
+                    f.write(json.dumps(self.to_otlp(turn), separators=(",", ":")) + "\n")
+                    f.flush()
+                except Exception as e:
+                    logger.error(f"❌ Failed to export turn trace: {e}")
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def read_stage_durations(lines):
+    """Collect stage -> [ms] from OTLP/JSON lines and/or `🧭 Turn trace` log lines."""
+    durations = {}
+    for line in lines:
+        line = line.strip()
+        if line.startswith("{"):
+            entry = json.loads(line)
+            if "resourceSpans" in entry:
+                for resource in entry["resourceSpans"]:
+                    for scope in resource["scopeSpans"]:
+                        for span in scope["spans"]:
+                            name = "total" if span["name"] == "turn" else span["name"]
+                            ms = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+                            durations.setdefault(name, []).append(ms)
+                continue
+            # LOG_FORMAT=json wraps the message in a JSON object
+            line = entry.get("msg", "")
+        if TRACE_LOG_MARKER not in line:
+            continue
+        summary = json.loads(line.split(TRACE_LOG_MARKER, 1)[1])
+        for stage, ms in summary["stages_ms"].items():
+            durations.setdefault(stage, []).append(ms)
+        if summary["total_ms"] is not None:
+            durations.setdefault("total", []).append(summary["total_ms"])
+    return durations
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python -m voice_router.tracing <trace.jsonl|pipeline.log> [...]")
+        return 2
+    durations = {}
+    for path in argv:
+        with open(path, encoding="utf-8") as f:
+            for stage, values in read_stage_durations(f).items():
+                durations.setdefault(stage, []).extend(values)
+    if not durations:
+        print("❌ No turn traces found")
+        return 1
+    print(f"{'stage':<12} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage in STAGES + ("total",):
+        values = durations.get(stage)
+        if values:
+            print(f"{stage:<12} {len(values):>6} {percentile(values, 50):>9.2f} {percentile(values, 95):>9.2f} "
+                  f"{percentile(values, 99):>9.2f} {max(values):>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Uplink (caller -> Gemini) audio aggregation.
+
+Exotel delivers 20ms packets; sending each one as its own
+`send_realtime_input` costs 50 websocket messages per second per caller,
+each with its own Blob and JSON/base64 encoding. `UplinkBatcher` coalesces
+packets into `frame_ms` frames. In adaptive mode it watches packet energy and
+flushes immediately at speech onset, so the first syllable of a barge-in is
+not held back waiting for a full frame. `last_loud_at` records when the
+caller was last heard, for end-of-speech latency measurements.
+
+`UplinkGate` optionally stops the caller's silence from being sent at all.
+Driven by a local VAD, it passes speech plus `pre_roll_ms` of the audio
+before the onset and `post_roll_ms` after the VAD's end of speech, then
+closes and asks for `audio_stream_end` so Gemini flushes what it has. Pre-
+roll must cover Gemini's `prefix_padding_ms` and the VAD onset delay, and
+post-roll Gemini's `silence_duration_ms`, so the server VAD still sees the
+same speech boundaries it would with continuous audio.
+"""
+import time
+from collections import deque
+
+import numpy as np
+
+
+class UplinkBatcher:
+    """Coalesces PCM16 packets into frames of `frame_ms`, with onset flush."""
+
+    def __init__(self, frame_ms=60, sample_rate=16000, adaptive=True,
+                 onset_rms=600.0, quiet_packets=10, clock=time.monotonic):
+        self.frame_ms = frame_ms
+        self.frame_bytes = sample_rate * 2 * frame_ms // 1000
+        self.adaptive = adaptive
+        self.onset_rms = onset_rms
+        self.quiet_packets = quiet_packets
+        self._buf = bytearray()
+        self._quiet_run = quiet_packets
+        self._clock = clock
+        self.last_loud_at = None
+        self.packets_in = 0
+        self.messages_out = 0
+        self.onset_flushes = 0
+
+    def _is_onset(self, pcm):
+        x = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        loud = len(x) > 0 and float(np.sqrt(np.dot(x, x) / len(x))) >= self.onset_rms
+        onset = loud and self._quiet_run >= self.quiet_packets
+        if loud:
+            self.last_loud_at = self._clock()
+        self._quiet_run = 0 if loud else self._quiet_run + 1
+        return onset
+
+    def push(self, pcm):
+        """Add one packet; returns a frame to send now, or None to keep buffering."""
+        self.packets_in += 1
+        self._buf += pcm
+        if self._is_onset(pcm) and self.adaptive:
+            self.onset_flushes += 1
+            return self.flush()
+        if len(self._buf) >= self.frame_bytes:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """Return and clear whatever is buffered (None if empty)."""
+        if not self._buf:
+            return None
+        frame = bytes(self._buf)
+        self._buf.clear()
+        self.messages_out += 1
+        return frame
+
+    def stats(self) -> dict:
+        return {
+            "frame_ms": self.frame_ms,
+            "packets_in": self.packets_in,
+            "messages_out": self.messages_out,
+            "onset_flushes": self.onset_flushes,
+        }
+
+
+class UplinkGate:
+    """Passes caller packets only around speech; counts what was kept back."""
+
+    def __init__(self, pre_roll_ms=300, post_roll_ms=500, comfort_ms=0, packet_ms=20, sample_rate=8000):
+        self.pre_roll_ms = pre_roll_ms
+        self.post_roll_ms = post_roll_ms
+        self.comfort_ms = comfort_ms
+        self.bytes_per_ms = sample_rate * 2 // 1000
+        self._pre_roll = deque(maxlen=max(1, -(-pre_roll_ms // packet_ms)))
+        self._post_left = 0
+        self._since_sent = 0
+        self.open = False
+        self.opens = 0
+        self.bytes_in = 0
+        self.bytes_sent = 0
+
+    def push(self, pcm, speaking):
+        """Add one packet with the VAD state after it.
+
+        Returns (packets to send, oldest first; True when the gate just closed
+        and Gemini should get `audio_stream_end` after them).
+        """
+        self.bytes_in += len(pcm)
+        if speaking:
+            self._post_left = self.post_roll_ms * self.bytes_per_ms
+            if not self.open:
+                self.open = True
+                self.opens += 1
+                self._pre_roll.append(pcm)
+                packets = list(self._pre_roll)
+                self._pre_roll.clear()
+                return self._sent(packets), False
+            return self._sent([pcm]), False
+        if self.open:
+            self._post_left -= len(pcm)
+            if self._post_left > 0:
+                return self._sent([pcm]), False
+            self.open = False
+            return self._sent([pcm]), True
+        self._pre_roll.append(pcm)
+        self._since_sent += len(pcm)
+        if self.comfort_ms and self._since_sent >= self.comfort_ms * self.bytes_per_ms:
+            # Sparse digital silence keeps the stream visibly alive without carrying line noise
+            return self._sent([bytes(len(pcm))]), False
+        return [], False
+
+    def _sent(self, packets):
+        self._since_sent = 0
+        self.bytes_sent += sum(len(p) for p in packets)
+        return packets
+
+    @property
+    def seconds_saved(self) -> float:
+        return max(0, self.bytes_in - self.bytes_sent) / self.bytes_per_ms / 1000
+
+    def stats(self) -> dict:
+        return {
+            "opens": self.opens,
+            "seconds_in": round(self.bytes_in / self.bytes_per_ms / 1000, 2),
+            "seconds_sent": round(self.bytes_sent / self.bytes_per_ms / 1000, 2),
+            "seconds_saved": round(self.seconds_saved, 2),
+        }
@@ -0,0 +1,38 @@
+"""
+Per-session Gemini token accounting, tagged with the system prompt version.
+
+Live API `usage_metadata` arrives per response; `SessionUsage` sums it for the
+call so each session ends with one line that attributes its token cost (and
+first-response latency) to a prompt id such as `astrovoice@v1`.
+"""
+from dataclasses import dataclass
+
+
+@dataclass
+class SessionUsage:
+    prompt_id: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_use_tokens: int = 0
+    total_tokens: int = 0
+    reports: int = 0
+    first_audio_ms: float = None
+
+    def add(self, usage):
+        """Accumulate one `usage_metadata` object; missing counts are treated as zero."""
+        self.input_tokens += getattr(usage, "prompt_token_count", 0) or 0
+        self.output_tokens += getattr(usage, "response_token_count", 0) or 0
+        self.tool_use_tokens += getattr(usage, "tool_use_prompt_token_count", 0) or 0
+        self.total_tokens += getattr(usage, "total_token_count", 0) or 0
+        self.reports += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "prompt": self.prompt_id,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "tool_use_tokens": self.tool_use_tokens,
+            "total_tokens": self.total_tokens,
+            "reports": self.reports,
+            "first_audio_ms": None if self.first_audio_ms is None else round(self.first_audio_ms),
+        }
@@ -0,0 +1,91 @@
+"""
+Streaming voice activity detection for caller audio.
+
+Barge-in used to wait for Gemini's server-side VAD: the caller kept hearing
+queued reply audio for a full network round trip after they started
+talking. `StreamingVad` runs locally on the 20ms Exotel packets: a frame is
+voiced when its energy clears both an absolute floor and an adaptive noise
+floor by `snr_db`, and its zero-crossing rate is speech-like (broadband hiss
+crosses zero far more often than voiced speech). `onset_frames` voiced
+frames in a row start speech; `hangover_frames` unvoiced frames end it.
+
+Energy and ZCR for any number of whole frames are computed in one vectorized
+pass (`classify`), so feeding a packet, a batch or a whole file costs the same
+per frame.
+"""
+import numpy as np
+
+SPEECH_START = "speech_start"
+SPEECH_END = "speech_end"
+
+
+class StreamingVad:
+    """Energy + zero-crossing VAD with onset and hangover, fed PCM16 bytes."""
+
+    def __init__(self, sample_rate=8000, frame_ms=20, threshold_db=-40.0, snr_db=12.0,
+                 zcr_max=0.35, onset_frames=3, hangover_frames=12, noise_adapt=0.05):
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.snr_db = snr_db
+        self.zcr_max = zcr_max
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.noise_adapt = noise_adapt
+        self.noise_db = threshold_db - snr_db
+        self.speaking = False
+        self._run = 0  # consecutive frames disagreeing with the current state
+        self._tail = np.zeros(0, dtype=np.int16)
+        self.frames = 0
+        self.speech_frames = 0
+
+    def classify(self, samples):
+        """Per-frame (energy_db, zcr, voiced) for a whole number of frames of int16 samples."""
+        frames = samples.reshape(-1, self.frame_samples).astype(np.float32)
+        power = np.einsum("ij,ij->i", frames, frames) / self.frame_samples
+        energy_db = 10 * np.log10(power / (32768.0 ** 2) + 1e-12)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_samples - 1)
+        floor = np.maximum(self.threshold_db, self.noise_db + self.snr_db)
+        voiced = (energy_db >= floor) & (zcr <= self.zcr_max)
+        return energy_db, zcr, voiced
+
+    def process(self, pcm):
+        """Feed PCM16 bytes (any length); returns the state-change events, oldest first."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if len(self._tail):
+            samples = np.concatenate((self._tail, samples))
+        whole = len(samples) - len(samples) % self.frame_samples
+        self._tail = samples[whole:].copy()
+        if not whole:
+            return []
+        energy_db, _, voiced = self.classify(samples[:whole])
+        events = []
+        for i, is_voiced in enumerate(voiced.tolist()):
+            self.frames += 1
+            if not is_voiced:
+                # Track the background level from frames that are not speech
+                self.noise_db += self.noise_adapt * (float(energy_db[i]) - self.noise_db)
+            if is_voiced != self.speaking:
+                self._run += 1
+                if self._run >= (self.hangover_frames if self.speaking else self.onset_frames):
+                    self.speaking = is_voiced
+                    self._run = 0
+                    events.append(SPEECH_START if is_voiced else SPEECH_END)
+            else:
+                self._run = 0
+            if self.speaking:
+                self.speech_frames += 1
+        return events
+
+    def reset(self):
+        self.speaking = False
+        self._run = 0
+        self._tail = np.zeros(0, dtype=np.int16)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "speech_frames": self.speech_frames,
+            "noise_db": round(self.noise_db, 1),
+        }